@@ -0,0 +1,136 @@
+"""
+Check: an incremental update gives the same outputs as a full build.
+
+For every site in resurety_data, builds the metrics that support incremental
+updates on the combined file cut at --build-end, appends the hours up to
+--update-end (by default in the middle of a month, so the update has a
+trailing partial month) and runs the incremental update. A full build of the
+same file is then compared with it, CSV by CSV, value for value, and a plain
+rerun must skip the site as up to date. Everything runs in a temporary folder.
+
+Run from the repository root:
+    python -m benchmarks.incremental_update
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from simulation.metrics import METRICS
+from simulation.pipeline import BUILT, SKIPPED, discover_sites, run_site
+
+# Slots of at most SKETCH_CAPACITY values give the same bits as a full build,
+# so the written outputs must be identical
+TOLERANCE = 0
+
+
+def write_cut(source, target, end):
+    """Copy the header and the rows of a combined file up to end (inclusive)"""
+    with open(source, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    end = pd.Timestamp(end)
+    kept = [line for line in lines[1:] if pd.Timestamp(line.split(b',', 1)[0].decode()) <= end]
+    with open(target, 'wb') as f:
+        f.write(lines[0])
+        f.writelines(kept)
+    return len(kept)
+
+
+def run(site_name, metrics, data_path, output_path, **kwargs):
+    """run_site for the October-September window, returning (results, captured log)"""
+    log = io.StringIO()
+    with warnings.catch_warnings(), contextlib.redirect_stdout(log):
+        warnings.simplefilter('ignore')
+        results = run_site(site_name, 10, 9, metrics, data_path, output_path, **kwargs)
+    return results, log.getvalue()
+
+
+def compare_outputs(full_path, incremental_path):
+    """(files compared, list of differences) between two site output folders"""
+    differences = []
+    files = sorted(full_path.rglob('*.csv'))
+    for file_path in files:
+        other_path = incremental_path / file_path.relative_to(full_path)
+        if not other_path.exists():
+            differences.append(f"{file_path.name}: missing")
+            continue
+        full, incremental = pd.read_csv(file_path), pd.read_csv(other_path)
+        if full.shape != incremental.shape or list(full.columns) != list(incremental.columns):
+            differences.append(f"{file_path.name}: shape {full.shape} vs {incremental.shape}")
+            continue
+        for col in full.columns:
+            a, b = full[col], incremental[col]
+            if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+                same = np.isclose(a.to_numpy(dtype=float), b.to_numpy(dtype=float),
+                                  rtol=0, atol=TOLERANCE, equal_nan=True)
+            else:
+                same = (a.astype(str) == b.astype(str)).to_numpy()
+            if not same.all():
+                differences.append(f"{file_path.name}: column {col}, {int((~same).sum())} rows")
+    return len(files), differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data-path', default='resurety_data', type=Path)
+    parser.add_argument('--build-end', default='2022-05-31 23:00:00',
+                        help='last hour of the file the first build sees')
+    parser.add_argument('--update-end', default='2022-08-15 12:00:00',
+                        help='last hour of the file after the append')
+    args = parser.parse_args()
+
+    site_files = discover_sites(args.data_path)
+    if not site_files:
+        print(f"❌ No combined files found in {args.data_path}")
+        return
+    metrics = [metric for metric in METRICS.values() if metric.incremental]
+
+    print(f"{'Site':<40} {'Appended':>9} {'Update':>8} {'Files':>6}  Match")
+    print('-' * 75)
+    failures = 0
+    with tempfile.TemporaryDirectory() as temp:
+        temp = Path(temp)
+        for site_name, file_name in site_files.items():
+            folders = {name: temp / site_name / name for name in ('incremental', 'full')}
+            for folder in folders.values():
+                (folder / 'data').mkdir(parents=True)
+            data_file = folders['incremental'] / 'data' / file_name
+
+            built = write_cut(args.data_path / file_name, data_file, args.build_end)
+            run(site_name, metrics, data_file.parent, folders['incremental'] / 'out')
+            total = write_cut(args.data_path / file_name, data_file, args.update_end)
+
+            start = time.perf_counter()
+            updated, update_log = run(site_name, metrics, data_file.parent, folders['incremental'] / 'out', incremental=True)
+            update_time = time.perf_counter() - start
+            rerun, _ = run(site_name, metrics, data_file.parent, folders['incremental'] / 'out')
+
+            full_file = folders['full'] / 'data' / file_name
+            full_file.write_bytes(data_file.read_bytes())
+            run(site_name, metrics, full_file.parent, folders['full'] / 'out')
+
+            n_files, differences = compare_outputs(folders['full'] / 'out' / site_name,
+                                                   folders['incremental'] / 'out' / site_name)
+            if any(status != BUILT for status in updated.values()) or 'Updating:' not in update_log:
+                differences.append(f"not updated incrementally: {updated}")
+            if any(status != SKIPPED for status in rerun.values()):
+                differences.append(f"rerun after the update not skipped: {rerun}")
+
+            print(f"{site_name:<40} {total - built:>9,} {update_time:>7.2f}s {n_files:>6}  "
+                  f"{'✗' if differences else '✓'}")
+            for difference in differences:
+                print(f"   {difference}")
+            failures += bool(differences)
+
+    if failures:
+        raise SystemExit(f"\n❌ {failures} site(s) differ from a full build")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: weather / generation join, per-year loop vs single keyed merge.
+
+Times the original per-year-column loop used by
+WeatherGenerationCorrelation.plot_weather_generation_correlation against
+join_weather_generation, checks both give identical rows and prints the
+speedup for every solar site with a weather file and an hourly generation
+timeseries.
+
+Run from the repository root:
+    python -m benchmarks.weather_join
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from simulation.weather import JOINED_COLUMNS, join_weather_generation, load_weather
+
+
+def join_per_year(gen_df, weather_df):
+    """Reference implementation: copy, filter and merge once per year column"""
+    year_cols = [col for col in gen_df.columns if str(col).isdigit()]
+    all_data = []
+
+    for year_col in year_cols:
+        year_val = int(year_col)
+        gen_year = gen_df[['month', 'day', 'hour', year_col]].copy()
+        gen_year['year'] = year_val
+        gen_year['generation_mw'] = pd.to_numeric(gen_year[year_col], errors='coerce')
+
+        weather_year = weather_df[weather_df['year'] == year_val].copy()
+        if len(weather_year) == 0:
+            continue
+
+        merged = pd.merge(
+            gen_year[['year', 'month', 'day', 'hour', 'generation_mw']],
+            weather_year[['year', 'month', 'day', 'hour', 'shortwave_radiation', 'temperature_2m']],
+            on=['year', 'month', 'day', 'hour'],
+            how='inner'
+        )
+        merged['ghi'] = merged['shortwave_radiation']
+        merged['temperature'] = merged['temperature_2m']
+        merged = merged[
+            (merged['generation_mw'] >= 0) &
+            (merged['ghi'] >= 0) &
+            (~merged['generation_mw'].isna()) &
+            (~merged['ghi'].isna()) &
+            (~merged['temperature'].isna())
+        ]
+        if len(merged) > 0:
+            all_data.append(merged)
+
+    if not all_data:
+        return pd.DataFrame(columns=JOINED_COLUMNS)
+    return pd.concat(all_data, ignore_index=True)[JOINED_COLUMNS]
+
+
+def best_time(func, gen_df, weather_df, repeats):
+    """Best wall time over repeats, plus the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(gen_df, weather_df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def same_rows(a, b):
+    if len(a) != len(b):
+        return False
+    a = a.reset_index(drop=True).astype(float)
+    b = b.reset_index(drop=True).astype(float)
+    return a.equals(b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--portfolio-path', default='Renewable Portfolio LLC', type=Path)
+    parser.add_argument('--weather-path', default='weather_data', type=Path)
+    parser.add_argument('--repeats', default=3, type=int,
+                        help='timing runs per implementation (best is reported)')
+    args = parser.parse_args()
+
+    sites = []
+    for weather_file in sorted(args.weather_path.glob('*_weather_hourly.csv')):
+        site_name = weather_file.name.replace('_weather_hourly.csv', '')
+        if 'wind' in site_name.lower():
+            continue
+        gen_files = list((args.portfolio_path / site_name / 'Generation').glob('*_hourly_timeseries.csv'))
+        if gen_files:
+            sites.append((site_name, weather_file, gen_files[0]))
+    if not sites:
+        print(f"❌ No solar sites with both {args.weather_path}/*_weather_hourly.csv "
+              f"and an hourly generation timeseries in {args.portfolio_path}")
+        return
+
+    print(f"{'Site':<40} {'Rows':>9} {'Per-year':>10} {'Keyed':>9} {'Speedup':>8}  Match")
+    print('-' * 88)
+    total_loop = total_keyed = 0.0
+    for site_name, weather_file, gen_file in sites:
+        weather_df = load_weather(weather_file)
+        gen_df = pd.read_csv(gen_file)
+
+        loop_time, per_year = best_time(join_per_year, gen_df, weather_df, args.repeats)
+        keyed_time, keyed = best_time(join_weather_generation, gen_df, weather_df, args.repeats)
+        total_loop += loop_time
+        total_keyed += keyed_time
+
+        print(f"{site_name:<40} {len(keyed):>9,} {loop_time:>9.3f}s {keyed_time:>8.3f}s "
+              f"{loop_time / keyed_time:>7.1f}x  {'✓' if same_rows(per_year, keyed) else '✗'}")
+
+    print('-' * 88)
+    print(f"{'All sites':<40} {'':>9} {total_loop:>9.3f}s {total_keyed:>8.3f}s "
+          f"{total_loop / total_keyed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import streamlit as st
+import altair as alt
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
@@ -8,8 +9,52 @@ from scipy import stats
 from scipy.stats import gaussian_kde
 import io
 import base64
+import fnmatch
+import json
+import os
+import threading
+from collections import OrderedDict
+from simulation.aggregates import AGGREGATES_SUFFIX, aggregate_view, select_view
+from simulation.columnar import COLUMNAR_AVAILABLE, COLUMNAR_SUFFIX, columnar_path, read_columnar
+from simulation.downsample import lttb_indices
+from simulation.duration_curves import DurationIndex, duration_index_file_name, marker_positions
+from simulation.portfolio import PORTFOLIO_METRICS, PORTFOLIO_VIEWS, PortfolioStack
+from simulation.site_cube import CUBE_SUFFIX, SiteCube, cube_paths
 warnings.filterwarnings('ignore')
 
+# Memory budget for parsed data files shared by all sessions (override with DASHBOARD_CACHE_MB)
+DATA_CACHE_MAX_BYTES = int(float(os.environ.get('DASHBOARD_CACHE_MB', '512')) * 1024 * 1024)
+
+# Memory budget for rendered chart images shared by all sessions (override with DASHBOARD_FIGURE_CACHE_MB)
+FIGURE_CACHE_MAX_BYTES = int(float(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', '64')) * 1024 * 1024)
+
+# Resolution charts are rendered at (the same as st.pyplot)
+FIGURE_DPI = 200
+
+# Most points an interactive chart line is sent with (longer series are reduced with LTTB)
+CHART_MAX_POINTS = 300
+
+# Fixed seed so the portfolio bootstrap gives the same table on every rerun
+PORTFOLIO_BOOTSTRAP_SEED = 0
+
+# Matplotlib method drawing each view in the static chart style
+FORECAST_PLOTS = {
+    'monthly': 'plot_monthly_forecast',
+    'daily': 'plot_daily_forecast',
+    'hourly': 'plot_hourly_forecast',
+}
+
+# Number of rows shown when previewing a file in the Data Explorer
+PREVIEW_ROWS = 100
+
+# Folder of every metric inside a site folder
+METRIC_FOLDERS = {
+    'generation': 'Generation',
+    'price': 'Price',
+    'price_da': 'Price_da',
+    'revenue': 'Revenue',
+}
+
 # Set page config
 st.set_page_config(
     page_title="Renewable Energy Portfolio Dashboard",
@@ -36,6 +81,258 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+class DataFrameCache:
+    """
+    Process-wide LRU cache of parsed data files, shared by every session.
+    Entries are validated against the file's (mtime, size) so a file rewritten
+    by a simulation notebook is parsed again on its next access.
+    """
+    
+    def __init__(self, max_bytes=DATA_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # resolved path -> (signature, df, nbytes)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    def load(self, file_path):
+        """Return a private copy of the parsed file, reading from disk only on a miss"""
+        path = Path(file_path)
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = str(path.resolve())
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[1].copy()
+        
+        if path.suffix == COLUMNAR_SUFFIX:
+            df = read_columnar(path)
+        else:
+            df = pd.read_csv(path)
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        
+        with self._lock:
+            # Drop any stale version of this file before storing the new one
+            self._discard(key)
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (signature, df, nbytes)
+                self._total_bytes += nbytes
+                while self._total_bytes > self.max_bytes:
+                    oldest = next(iter(self._entries))
+                    self._discard(oldest)
+        
+        return df.copy()
+    
+    def invalidate(self, file_path=None):
+        """Forget one file, or everything when no path is given"""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            else:
+                self._discard(str(Path(file_path).resolve()))
+    
+    def stats(self):
+        """Current number of cached files and their memory footprint"""
+        with self._lock:
+            return {'files': len(self._entries), 'bytes': self._total_bytes, 'max_bytes': self.max_bytes}
+    
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+class FigureCache:
+    """
+    Process-wide LRU cache of rendered charts as PNG bytes, shared by every
+    session. Keys hold the chart, its view parameters and the signature of the
+    site files it is drawn from, so a chart is only drawn again after its data
+    changes. Least-recently-used images are evicted beyond max_bytes.
+    """
+    
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> PNG bytes
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """PNG bytes of a cached chart, or None on a miss"""
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+            return png
+    
+    def put(self, key, png):
+        with self._lock:
+            self._discard(key)
+            if len(png) <= self.max_bytes:
+                self._entries[key] = png
+                self._total_bytes += len(png)
+                while self._total_bytes > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+    
+    def invalidate(self):
+        """Forget every rendered chart"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+    
+    def stats(self):
+        """Current number of cached charts and their memory footprint"""
+        with self._lock:
+            return {'figures': len(self._entries), 'bytes': self._total_bytes, 'max_bytes': self.max_bytes}
+    
+    def _discard(self, key):
+        png = self._entries.pop(key, None)
+        if png is not None:
+            self._total_bytes -= len(png)
+
+class SiteCatalog:
+    """
+    Process-wide index of the portfolio folders, shared by every session.
+    Each directory is listed once and its listing is reused until the
+    directory's mtime changes (adding, removing or renaming a file updates it),
+    so a lookup costs one stat call instead of a glob scan. Pattern matches
+    are memoized per listing, and the site list is rebuilt only when the
+    portfolio folder itself changes.
+    """
+    
+    def __init__(self, portfolio_path):
+        self.portfolio_path = Path(portfolio_path)
+        self._listings = {}  # folder path -> {'mtime_ns', 'dirs', 'files', 'matches'}
+        self._sites = None   # (portfolio mtime_ns, site names, other folder names)
+        self._lock = threading.Lock()
+    
+    def _listing(self, folder):
+        """Cached listing of a folder, or None when it does not exist"""
+        key = str(folder)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._listings.pop(key, None)
+            return None
+        
+        with self._lock:
+            entry = self._listings.get(key)
+            if entry is not None and entry['mtime_ns'] == mtime_ns:
+                return entry
+        
+        dirs, files = [], []
+        try:
+            with os.scandir(key) as it:
+                for item in it:
+                    (dirs if item.is_dir() else files).append(item.name)
+        except OSError:
+            return None
+        
+        entry = {'mtime_ns': mtime_ns, 'dirs': sorted(dirs), 'files': sorted(files), 'matches': {}}
+        with self._lock:
+            self._listings[key] = entry
+        return entry
+    
+    def is_site(self, folder):
+        """A site folder holds at least one metric folder"""
+        entry = self._listing(folder)
+        return entry is not None and any(name in entry['dirs'] for name in METRIC_FOLDERS.values())
+    
+    def sites(self):
+        """Names of all site folders"""
+        root = self._listing(self.portfolio_path)
+        if root is None:
+            return []
+        
+        cached = self._sites
+        # Folders without metric folders yet are re-checked, since creating
+        # one inside them does not change the portfolio folder's mtime
+        if (cached is None or cached[0] != root['mtime_ns'] or
+                any(self.is_site(self.portfolio_path / name) for name in cached[2])):
+            names = root['dirs']
+            is_site = {name: self.is_site(self.portfolio_path / name) for name in names}
+            cached = (root['mtime_ns'],
+                      [name for name in names if is_site[name]],
+                      [name for name in names if not is_site[name]])
+            self._sites = cached
+        return list(cached[1])
+    
+    def is_dir(self, folder):
+        return self._listing(folder) is not None
+    
+    def exists(self, file_path):
+        """True when the file is in its folder's listing"""
+        file_path = Path(file_path)
+        entry = self._listing(file_path.parent)
+        return entry is not None and file_path.name in entry['files']
+    
+    def glob(self, folder, pattern):
+        """Files of a folder matching a glob pattern, in name order"""
+        entry = self._listing(folder)
+        if entry is None:
+            return []
+        matches = entry['matches']
+        if pattern not in matches:
+            matches[pattern] = [name for name in entry['files'] if fnmatch.fnmatchcase(name, pattern)]
+        return [Path(folder) / name for name in matches[pattern]]
+    
+    def find(self, folder, patterns):
+        """First file matching the first pattern that matches anything, or None"""
+        for pattern in patterns:
+            files = self.glob(folder, pattern)
+            if files:
+                return files[0]
+        return None
+
+@st.cache_resource
+def get_data_cache():
+    """Single DataFrameCache instance for the whole Streamlit process"""
+    return DataFrameCache()
+
+@st.cache_resource
+def get_figure_cache():
+    """Single FigureCache instance for the whole Streamlit process"""
+    return FigureCache()
+
+@st.cache_resource
+def get_site_catalog(portfolio_path):
+    """Single SiteCatalog per portfolio folder for the whole Streamlit process"""
+    return SiteCatalog(portfolio_path)
+
+@st.cache_resource(max_entries=64)
+def load_duration_index(index_path, mtime_ns):
+    """Duration-curve index file, parsed once per version of the file"""
+    return DurationIndex.load(index_path)
+
+@st.cache_resource(max_entries=64)
+def load_site_cube(site_folder, mtime_ns):
+    """A site's memory-mapped hourly cube, mapped once per version of the file"""
+    return SiteCube.open(site_folder)
+
+@st.cache_resource(max_entries=16)
+def load_portfolio_stack(files, metric_type, view):
+    """
+    Portfolio stack of one metric and view, built once per version of the site
+    files. Sites whose file cannot be read are listed in the stack's skipped.
+    """
+    data_cache = get_data_cache()
+    frames, skipped = {}, {}
+    for site_name, file_path, mtime_ns, _ in files:
+        try:
+            if file_path.endswith(CUBE_SUFFIX):
+                cube = load_site_cube(str(Path(file_path).parent), mtime_ns)
+                if cube is None or metric_type not in cube:
+                    skipped[site_name] = f"no {metric_type} in {Path(file_path).name}"
+                    continue
+                frames[site_name] = cube.timeseries_frame(metric_type)
+            else:
+                frames[site_name] = data_cache.load(file_path)
+        except (OSError, ValueError) as e:
+            skipped[site_name] = f"cannot read {Path(file_path).name}: {e}"
+    return PortfolioStack.from_frames(frames, metric_type, view, skipped)
+
 class StreamlitEnergyDashboard:
     """
     Streamlit dashboard for renewable energy portfolio visualization
@@ -46,6 +343,11 @@ class StreamlitEnergyDashboard:
         self.base_path = Path('.')
         self.portfolio_path = self.base_path / 'Renewable Portfolio LLC'
         
+        # Parsed data files and the folder index are shared across reruns and sessions
+        self.data_cache = get_data_cache()
+        self.figure_cache = get_figure_cache()
+        self.catalog = get_site_catalog(str(self.portfolio_path))
+        
         # Modern color palette
         self.colors = {
             'generation': '#70AD47',  # Green
@@ -54,22 +356,19 @@ class StreamlitEnergyDashboard:
             'revenue': '#ED7D31',     # Orange
         }
         
+        # Duration curve percentile marker colors
+        self.percentile_colors = {
+            99: 'green', 95: 'green', 75: 'green',
+            50: 'blue', 25: 'orange', 5: 'red', 1: 'red'
+        }
+        
         # Month names
         self.month_names = ['January', 'February', 'March', 'April', 'May', 'June',
                            'July', 'August', 'September', 'October', 'November', 'December']
     
     def get_project_folders(self):
         """Get all project folders"""
-        project_folders = []
-        if not self.portfolio_path.exists():
-            return project_folders
-            
-        for item in self.portfolio_path.iterdir():
-            if item.is_dir():
-                if ((item / 'Generation').exists() or (item / 'Price').exists() or 
-                    (item / 'Price_da').exists() or (item / 'Revenue').exists()):
-                    project_folders.append(item)
-        return project_folders
+        return [self.portfolio_path / site for site in self.catalog.sites()]
     
     def clean_site_name(self, site_name):
         """Clean up site name for display"""
@@ -106,29 +405,18 @@ class StreamlitEnergyDashboard:
         """Find the appropriate stats file in the project folder"""
         metric_folder = project_folder / metric_type.capitalize()
         
-        if not metric_folder.exists():
-            return None
-        
         patterns = [
             f'*_{metric_type}_{temporal}_stats.csv',
             f'*_{temporal}_stats.csv',
             f'*{temporal}stats.csv'
         ]
         
-        for pattern in patterns:
-            files = list(metric_folder.glob(pattern))
-            if files:
-                return files[0]
-        
-        return None
+        return self.catalog.find(metric_folder, patterns)
     
     def find_timeseries_file(self, project_folder, metric_type, temporal):
         """Find the appropriate timeseries file in the project folder"""
         metric_folder = project_folder / metric_type.capitalize()
         
-        if not metric_folder.exists():
-            return None
-        
         patterns = [
             f'*_{metric_type}_{temporal}_timeseries.csv',
             f'*_{temporal}_timeseries.csv',
@@ -136,27 +424,113 @@ class StreamlitEnergyDashboard:
             f'*_{metric_type}_{temporal}_timeseries_compressed.csv'
         ]
         
-        for pattern in patterns:
-            files = list(metric_folder.glob(pattern))
-            if files:
-                return files[0]
+        return self.prefer_columnar(self.catalog.find(metric_folder, patterns))
+    
+    def prefer_columnar(self, file_path):
+        """Use the typed columnar copy of a CSV export when the simulations wrote one"""
+        if file_path is None or not COLUMNAR_AVAILABLE:
+            return file_path
+        parquet_file = columnar_path(file_path)
+        return parquet_file if self.catalog.exists(parquet_file) else file_path
+    
+    def find_aggregates_file(self, project_folder, metric_type):
+        """Find the precomputed aggregates written by the simulations"""
+        metric_folder = project_folder / metric_type.capitalize()
+        return self.catalog.find(metric_folder, [f'*_{metric_type}{AGGREGATES_SUFFIX}'])
+    
+    def get_aggregate_view(self, project_folder, metric_type, view):
+        """
+        Mean and P5/P25/P75/P95 bands of one view ('monthly', 'daily' smoothed or
+        the 'hourly' profile). Read from the precomputed aggregates file when it is
+        at least as new as the timeseries, otherwise computed from the timeseries
+        (or, for daily and hourly, from the stats file).
+        """
+        timeseries_file = self.find_timeseries_file(project_folder, metric_type, view)
+        aggregates_file = self.find_aggregates_file(project_folder, metric_type)
+        
+        if aggregates_file and (timeseries_file is None or
+                                aggregates_file.stat().st_mtime >= timeseries_file.stat().st_mtime):
+            df = select_view(self.read_data_file(aggregates_file), view)
+            if not df.empty:
+                return df
+        
+        if view == 'hourly':
+            cube = self.get_site_cube(project_folder, metric_type, timeseries_file)
+            if cube is not None:
+                return aggregate_view(cube.timeseries_frame(metric_type), view)
+        
+        if timeseries_file:
+            return aggregate_view(self.read_data_file(timeseries_file), view)
+        
+        if view != 'monthly':
+            stats_file = self.find_stats_file(project_folder, metric_type, view)
+            if stats_file:
+                return aggregate_view(self.read_data_file(stats_file), view)
         
         return None
     
+    def get_site_cube(self, project_folder, cube_metric, timeseries_file=None):
+        """
+        The site's memory-mapped hourly cube when it holds the cube metric and is
+        at least as new as the metric's hourly timeseries file, otherwise None
+        """
+        cube_path, _ = cube_paths(project_folder)
+        if not self.catalog.exists(cube_path):
+            return None
+        cube_mtime_ns = cube_path.stat().st_mtime_ns
+        if (timeseries_file is not None and self.catalog.exists(timeseries_file) and
+                timeseries_file.stat().st_mtime_ns > cube_mtime_ns):
+            return None
+        cube = load_site_cube(str(project_folder), cube_mtime_ns)
+        return cube if cube is not None and cube_metric in cube else None
+    
+    def get_duration_index(self, index_file, timeseries_file):
+        """
+        Duration-curve index of a site: the one saved by the price simulation when
+        it is at least as new as the compressed timeseries, otherwise built from
+        the site cube or the compressed timeseries
+        """
+        timeseries_file = self.prefer_columnar(timeseries_file)
+        index_exists = self.catalog.exists(index_file)
+        timeseries_exists = self.catalog.exists(timeseries_file)
+        if index_exists and (not timeseries_exists or
+                             index_file.stat().st_mtime >= timeseries_file.stat().st_mtime):
+            return load_duration_index(str(index_file), index_file.stat().st_mtime_ns)
+        
+        cube = self.get_site_cube(index_file.parent.parent, 'price_compressed', timeseries_file)
+        if cube is not None:
+            return DurationIndex.from_timeseries(cube.timeseries_frame('price_compressed'))
+        
+        if timeseries_exists:
+            return DurationIndex.from_timeseries(self.read_data_file(timeseries_file))
+        
+        return None
+    
+    def month_tick_labels(self, df):
+        """Month names for the x axis of a monthly view"""
+        if df['label'].notna().all():
+            return list(df['label'])
+        return [self.month_names[i] for i in range(len(df))]
+    
+    def day_tick_labels(self, df):
+        """Date of every row of a daily view, for the x axis"""
+        if df['label'].notna().all():
+            return list(df['label'])
+        return [f"{self.month_names[int(month)-1][:3]} {int(day)}" for month, day in zip(df['month'], df['day'])]
+    
     def get_all_files_for_site(self, site_name):
         """Get all CSV files for a specific site organized by metric and type"""
         project_folder = self.portfolio_path / site_name
-        if not project_folder.exists():
+        if not self.catalog.is_dir(project_folder):
             return {}
         
         files_dict = {}
         
         # Check each metric folder
-        for metric in ['generation', 'price', 'price_da', 'revenue']:
-            metric_folder_name = metric.capitalize() if metric != 'price_da' else 'Price_da'
+        for metric, metric_folder_name in METRIC_FOLDERS.items():
             metric_folder = project_folder / metric_folder_name
             
-            if metric_folder.exists():
+            if self.catalog.is_dir(metric_folder):
                 files_dict[metric] = {
                     'timeseries': {},
                     'stats': {},
@@ -164,7 +538,7 @@ class StreamlitEnergyDashboard:
                 }
                 
                 # Get all CSV files in the metric folder
-                csv_files = list(metric_folder.glob('*.csv'))
+                csv_files = self.catalog.glob(metric_folder, '*.csv')
                 
                 for file in csv_files:
                     file_name = file.name.lower()
@@ -196,6 +570,29 @@ class StreamlitEnergyDashboard:
         
         return files_dict
     
+    def read_data_file(self, file_path):
+        """Load a data file through the shared cache"""
+        return self.data_cache.load(file_path)
+    
+    def preview_data_file(self, file_path, nrows=PREVIEW_ROWS):
+        """Read only the first rows of a file for display"""
+        return pd.read_csv(file_path, nrows=nrows)
+    
+    def file_download_source(self, file_path):
+        """Return a callable that streams the original file bytes when a download is requested"""
+        file_path = Path(file_path)
+        return lambda: file_path.read_bytes()
+    
+    def format_file_size(self, file_path):
+        """Human readable size of a file on disk"""
+        size = Path(file_path).stat().st_size
+        if size < 1024:
+            return f"{size} B"
+        for unit in ['KB', 'MB', 'GB']:
+            size /= 1024
+            if size < 1024 or unit == 'GB':
+                return f"{size:,.1f} {unit}"
+    
     def get_download_link(self, df, filename):
         """Generate a download link for a dataframe"""
         csv = df.to_csv(index=False)
@@ -203,31 +600,297 @@ class StreamlitEnergyDashboard:
         href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download {filename}</a>'
         return href
     
+    def source_signature(self, site_name, metric_folders):
+        """(folder, name, mtime, size) of every file in the given metric folders of a site"""
+        project_folder = self.portfolio_path / site_name
+        signature = []
+        for folder_name in metric_folders:
+            for file_path in self.catalog.glob(project_folder / folder_name, '*'):
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    continue
+                signature.append((folder_name, file_path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+    
+    def render_figure(self, plot_method, *args, signature):
+        """
+        PNG bytes of the chart drawn by plot_method(*args), drawn only when no
+        chart for the same arguments and source signature is cached. signature
+        identifies the version of the files the chart reads (see
+        source_signature). None when there is no data to plot.
+        """
+        key = (plot_method, args, signature)
+        png = self.figure_cache.get(key)
+        if png is None:
+            fig = getattr(self, plot_method)(*args)
+            if fig is None:
+                return None
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=FIGURE_DPI, bbox_inches='tight')
+            plt.close(fig)
+            png = buffer.getvalue()
+            self.figure_cache.put(key, png)
+        return png
+    
+    def forecast_sources(self, metric_type):
+        """Metric folders a monthly, daily or hourly chart of the metric reads"""
+        if metric_type == 'price':
+            return [METRIC_FOLDERS['price'], METRIC_FOLDERS['price_da']]
+        return [METRIC_FOLDERS[metric_type]]
+    
+    def show_forecast(self, site_name, metric_type, view, interactive=False):
+        """
+        Draw the monthly, daily or hourly chart of a metric: the interactive
+        chart when asked for and available, otherwise the static image.
+        True when there was data to plot.
+        """
+        if interactive:
+            chart = self.interactive_forecast_chart(site_name, metric_type, view)
+            if chart is not None:
+                st.altair_chart(chart, width='stretch')
+                return True
+        
+        png = self.render_figure(FORECAST_PLOTS[view], site_name, metric_type,
+                                 signature=self.source_signature(site_name, self.forecast_sources(metric_type)))
+        if png:
+            st.image(png, width='stretch')
+            return True
+        return False
+    
+    def show_duration_curve(self, site_name, month_idx, interactive=False):
+        """Draw a month's price duration curve; True when there was data to plot"""
+        if interactive:
+            chart = self.interactive_duration_chart(site_name, month_idx)
+            if chart is not None:
+                st.altair_chart(chart, width='stretch')
+                return True
+        
+        png = self.render_figure('plot_monthly_duration_curve', site_name, month_idx,
+                                 signature=self.source_signature(site_name, [METRIC_FOLDERS['price']]))
+        if png:
+            st.image(png, width='stretch')
+            return True
+        return False
+    
+    def chart_y_axis(self, metric_type, temporal):
+        """Y axis of an interactive chart, labelled like format_y_axis"""
+        if metric_type == 'generation':
+            unit = 'MWh' if temporal in ['daily', 'monthly'] else 'MW'
+            return alt.Axis(title=f'Generation ({unit})', format=',.0f')
+        if metric_type == 'price' or metric_type == 'price_da':
+            return alt.Axis(title='Price ($/MWh)', format='$,.0f')
+        return alt.Axis(title='Revenue ($)', format='$,.0f')
+    
+    def chart_x_axis(self, labels, step):
+        """X axis over row positions with a tick every step rows, labelled like the static charts"""
+        positions = list(range(0, len(labels), step))
+        tick_labels = json.dumps([str(labels[i]) for i in positions])
+        return alt.Axis(title=None, values=positions, labelAngle=-45,
+                        labelExpr=f"{tick_labels}[round(datum.value / {step})]")
+    
+    def interactive_forecast_chart(self, site_name, metric_type, view):
+        """
+        Vega-Lite version of a monthly, daily or hourly chart, drawn in the
+        browser from the same aggregates as the static one so zooming and
+        panning need no rerun. Lines longer than CHART_MAX_POINTS are reduced
+        with LTTB, and the confidence band keeps the rows of the mean line.
+        None when the site has no aggregates or timeseries for the view.
+        """
+        if view == 'hourly' and metric_type == 'revenue':
+            return None
+        
+        project_folder = self.portfolio_path / site_name
+        if not self.catalog.is_dir(project_folder):
+            return None
+        
+        try:
+            df = self.get_aggregate_view(project_folder, metric_type, view)
+            if df is None:
+                return None
+            
+            df_dt = None
+            if metric_type == 'price':
+                try:
+                    df_dt = self.get_aggregate_view(project_folder, 'price_da', view)
+                except:
+                    pass
+            
+            clean_name = self.clean_site_name(site_name)
+            name = metric_type.capitalize()
+            if view == 'monthly':
+                title = f'Monthly {name} Forecast - {clean_name}'
+                view_labels = self.month_tick_labels
+                x_axis = self.chart_x_axis(view_labels(df), 1)
+                series_names = ('Mean', 'Real-Time Price', 'Day-Ahead Price')
+                band = ('p5', 'p95', 'P5-P95 Confidence Band')
+            elif view == 'daily':
+                title = f'Daily {name} Forecast (7-day Rolling Average) - {clean_name}'
+                view_labels = self.day_tick_labels
+                x_axis = self.chart_x_axis(view_labels(df), 30)
+                series_names = ('Mean (7-day avg)', 'Real-Time Price (7-day avg)', 'Day-Ahead Price (7-day avg)')
+                band = ('p25', 'p75', 'P25-P75 Confidence Band (7-day avg)')
+                if df_dt is not None and len(df_dt) != len(df):
+                    df_dt = None
+            else:
+                title = f'Average Hourly {name} Profile - {clean_name}'
+                view_labels = lambda frame: list(frame['label'])
+                x_axis = alt.Axis(title='Hour of Day', values=list(range(0, 24, 2)))
+                series_names = ('Mean', 'Real-Time Price Mean', 'Day-Ahead Price Mean')
+                band = ('p5', 'p95', 'P5-P95 RT Price' if metric_type == 'price' else 'P5-P95 Confidence Band')
+            
+            # Static charts only draw a band for prices in the hourly profile
+            if metric_type == 'price' and view != 'hourly':
+                band = None
+            
+            if metric_type == 'price':
+                lines = [(series_names[1], self.colors['price'], df)]
+                if df_dt is not None:
+                    lines.append((series_names[2], self.colors['price_da'], df_dt))
+            else:
+                lines = [(series_names[0], self.colors[metric_type], df)]
+            
+            line_frames = []
+            band_frame = None
+            for series, color, frame in lines:
+                x = frame['hour'].to_numpy(dtype=float) if view == 'hourly' else np.arange(len(frame), dtype=float)
+                mean = frame['mean'].to_numpy(dtype=float)
+                kept = lttb_indices(x, mean, CHART_MAX_POINTS)
+                labels = np.asarray(view_labels(frame), dtype=object)
+                line_frames.append(pd.DataFrame({
+                    'x': x[kept], 'label': labels[kept], 'series': series, 'value': mean[kept]
+                }))
+                
+                if band is not None and frame is df and df[band[0]].notna().any() and df[band[1]].notna().any():
+                    band_frame = pd.DataFrame({
+                        'x': x[kept], 'label': labels[kept], 'series': band[2],
+                        'low': df[band[0]].to_numpy(dtype=float)[kept],
+                        'high': df[band[1]].to_numpy(dtype=float)[kept]
+                    }).dropna(subset=['low', 'high'])
+            
+            line_domain = [series for series, _, _ in lines]
+            domain = list(line_domain)
+            color_range = [color for _, color, _ in lines]
+            if band_frame is not None:
+                domain.insert(0, band[2])
+                color_range.insert(0, self.colors[metric_type])
+            
+            x_encoding = alt.X('x:Q', axis=x_axis, scale=alt.Scale(nice=False, zero=False))
+            color = alt.Color('series:N', scale=alt.Scale(domain=domain, range=color_range),
+                              legend=alt.Legend(title=None, orient='bottom'))
+            
+            layers = []
+            if band_frame is not None:
+                layers.append(alt.Chart(band_frame).mark_area(opacity=0.3).encode(
+                    x=x_encoding,
+                    y='low:Q',
+                    y2='high:Q',
+                    color=color,
+                    tooltip=[alt.Tooltip('label:N', title='Date' if view != 'hourly' else 'Hour'),
+                             alt.Tooltip('low:Q', format=',.2f'),
+                             alt.Tooltip('high:Q', format=',.2f')]
+                ))
+            
+            layers.append(alt.Chart(pd.concat(line_frames, ignore_index=True)).mark_line(
+                point=view != 'daily', strokeWidth=2.5
+            ).encode(
+                x=x_encoding,
+                y=alt.Y('value:Q', axis=self.chart_y_axis(metric_type, view), scale=alt.Scale(zero=False)),
+                color=color,
+                strokeDash=alt.StrokeDash('series:N', scale=alt.Scale(domain=line_domain, range=[[1, 0], [6, 4]]),
+                                          legend=None),
+                tooltip=[alt.Tooltip('label:N', title='Date' if view != 'hourly' else 'Hour'),
+                         alt.Tooltip('series:N', title='Series'),
+                         alt.Tooltip('value:Q', title='Value', format=',.2f')]
+            ))
+            
+            return alt.layer(*layers).properties(title=title, height=420).interactive()
+            
+        except Exception as e:
+            st.error(f"Error in interactive {view} {metric_type}: {str(e)}")
+            return None
+    
+    def interactive_duration_chart(self, site_name, month_idx):
+        """
+        Vega-Lite version of a month's price duration curve: the sorted prices
+        reduced to CHART_MAX_POINTS with LTTB, the mean and the P1-P99 markers
+        """
+        try:
+            curve = self.get_month_duration_curve(site_name, month_idx)
+            if curve is None:
+                return None
+            
+            sorted_values, markers, mean_value = curve
+            n_values = len(sorted_values)
+            duration_pct = np.linspace(0, 100, n_values)
+            kept = lttb_indices(duration_pct, sorted_values, CHART_MAX_POINTS)
+            curve_frame = pd.DataFrame({'duration': duration_pct[kept],
+                                        'price': sorted_values[kept].astype(float)})
+            
+            percentiles_to_mark = [1, 5, 25, 50, 75, 95, 99]
+            marker_frame = pd.DataFrame({
+                'duration': duration_pct[marker_positions(n_values, percentiles_to_mark)],
+                'price': [float(markers[p]) for p in percentiles_to_mark],
+                'percentile': [f'P{p}' for p in percentiles_to_mark],
+                'color': [self.percentile_colors.get(p, 'gray') for p in percentiles_to_mark]
+            })
+            mean_frame = pd.DataFrame({'price': [float(mean_value)], 'label': [f'Mean: ${mean_value:.2f}']})
+            
+            clean_name = self.clean_site_name(site_name)
+            title = [f'Price Duration Curve - {self.month_names[month_idx - 1]} - {clean_name}']
+            if float(sorted_values[-1]) < 0:
+                title.append('(includes negative prices)')
+            
+            x_encoding = alt.X('duration:Q', title='Duration (% of time)',
+                               scale=alt.Scale(domain=[0, 100], nice=False))
+            y_encoding = alt.Y('price:Q', axis=alt.Axis(title='Price ($ per MWh)', format='$,.0f'))
+            
+            line = alt.Chart(curve_frame).mark_line(color='red', strokeWidth=2).encode(
+                x=x_encoding,
+                y=y_encoding,
+                tooltip=[alt.Tooltip('duration:Q', title='Duration (%)', format='.1f'),
+                         alt.Tooltip('price:Q', title='Price', format='$,.2f')]
+            )
+            mean_rule = alt.Chart(mean_frame).mark_rule(color='black', strokeDash=[6, 4]).encode(
+                y='price:Q',
+                tooltip=[alt.Tooltip('label:N', title='Mean')]
+            )
+            points = alt.Chart(marker_frame).mark_point(filled=True, size=60).encode(
+                x=x_encoding,
+                y=y_encoding,
+                color=alt.Color('color:N', scale=None),
+                tooltip=[alt.Tooltip('percentile:N', title='Percentile'),
+                         alt.Tooltip('price:Q', title='Price', format='$,.2f')]
+            )
+            point_labels = points.mark_text(dy=-12, fontWeight='bold', fontSize=10).encode(text='percentile:N')
+            
+            return alt.layer(line, mean_rule, points, point_labels).properties(
+                title=alt.TitleParams(title), height=420
+            ).interactive()
+            
+        except Exception as e:
+            st.error(f"Error in interactive duration curve: {str(e)}")
+            return None
+    
     def plot_monthly_forecast(self, site_name, metric_type):
         """Create monthly forecast plot"""
         project_folder = self.portfolio_path / site_name
-        if not project_folder.exists():
+        if not self.catalog.is_dir(project_folder):
             return None
             
-        timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'monthly')
+        try:
+            df = self.get_aggregate_view(project_folder, metric_type, 'monthly')
+        except Exception as e:
+            st.error(f"Error in monthly {metric_type} for {site_name}: {str(e)}")
+            return None
         
-        if not timeseries_file:
+        if df is None:
             stats_file = self.find_stats_file(project_folder, metric_type, 'monthly')
             if stats_file:
                 return self.plot_monthly_forecast_from_stats(site_name, metric_type, stats_file)
             return None
         
         try:
-            df = pd.read_csv(timeseries_file)
-            year_cols = [col for col in df.columns if str(col).isdigit()]
-            
-            if not year_cols:
-                return None
-            
-            df['mean'] = df[year_cols].mean(axis=1)
-            df['p5'] = df[year_cols].quantile(0.05, axis=1)
-            df['p95'] = df[year_cols].quantile(0.95, axis=1)
-            
             fig, ax = plt.subplots(figsize=(12, 7))
             ax.set_facecolor('white')
             fig.patch.set_facecolor('white')
@@ -244,38 +907,20 @@ class StreamlitEnergyDashboard:
                        markersize=6)
                 
                 # Try to load day-ahead price data
-                price_da_folder = project_folder / 'Price_da'
-                if price_da_folder.exists():
-                    dt_patterns = [
-                        '*_monthly_timeseries.csv',
-                        '*monthly_timeseries.csv',
-                        '*_price_da_monthly_timeseries.csv'
-                    ]
-                    
-                    dt_file = None
-                    for pattern in dt_patterns:
-                        files = list(price_da_folder.glob(pattern))
-                        if files:
-                            dt_file = files[0]
-                            break
+                try:
+                    df_dt = self.get_aggregate_view(project_folder, 'price_da', 'monthly')
                     
-                    if dt_file:
-                        try:
-                            df_dt = pd.read_csv(dt_file)
-                            year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
-                            
-                            if year_cols_dt:
-                                df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
-                                ax.plot(x, df_dt['mean'], 
-                                       color=self.colors['price_da'],
-                                       linewidth=3,
-                                       label='Day-Ahead Price',
-                                       zorder=5,
-                                       marker='s',
-                                       markersize=6,
-                                       linestyle='--')
-                        except:
-                            pass
+                    if df_dt is not None:
+                        ax.plot(x, df_dt['mean'], 
+                               color=self.colors['price_da'],
+                               linewidth=3,
+                               label='Day-Ahead Price',
+                               zorder=5,
+                               marker='s',
+                               markersize=6,
+                               linestyle='--')
+                except:
+                    pass
             else:
                 ax.fill_between(x, df['p5'], df['p95'],
                               alpha=0.3,
@@ -296,10 +941,7 @@ class StreamlitEnergyDashboard:
             ax.set_title(title, fontsize=14, fontweight='normal', pad=15)
             
             ax.set_xticks(x)
-            if 'month_name' in df.columns:
-                ax.set_xticklabels(df['month_name'], rotation=45, ha='right')
-            else:
-                ax.set_xticklabels([self.month_names[i] for i in range(12)], rotation=45, ha='right')
+            ax.set_xticklabels(self.month_tick_labels(df), rotation=45, ha='right')
             ax.set_xlabel('')
             
             self.format_y_axis(ax, metric_type, 'monthly')
@@ -327,7 +969,7 @@ class StreamlitEnergyDashboard:
     def plot_monthly_forecast_from_stats(self, site_name, metric_type, stats_file):
         """Create monthly forecast plot using stats file"""
         try:
-            df = pd.read_csv(stats_file)
+            df = self.read_data_file(stats_file)
             
             fig, ax = plt.subplots(figsize=(12, 7))
             ax.set_facecolor('white')
@@ -347,23 +989,18 @@ class StreamlitEnergyDashboard:
                 # Try to load day-ahead price data
                 project_folder = self.portfolio_path / site_name
                 price_da_folder = project_folder / 'Price_da'
-                if price_da_folder.exists():
+                if self.catalog.is_dir(price_da_folder):
                     dt_patterns = [
                         '*_monthly_stats.csv',
                         '*monthly_stats.csv',
                         '*_price_da_monthly_stats.csv'
                     ]
                     
-                    dt_file = None
-                    for pattern in dt_patterns:
-                        files = list(price_da_folder.glob(pattern))
-                        if files:
-                            dt_file = files[0]
-                            break
+                    dt_file = self.prefer_columnar(self.catalog.find(price_da_folder, dt_patterns))
                     
                     if dt_file:
                         try:
-                            df_dt = pd.read_csv(dt_file)
+                            df_dt = self.read_data_file(dt_file)
                             if 'mean' in df_dt.columns:
                                 ax.plot(x, df_dt['mean'], 
                                        color=self.colors['price_da'],
@@ -427,33 +1064,15 @@ class StreamlitEnergyDashboard:
     def plot_daily_forecast(self, site_name, metric_type):
         """Create daily forecast plot with 7-day rolling average"""
         project_folder = self.portfolio_path / site_name
-        if not project_folder.exists():
+        if not self.catalog.is_dir(project_folder):
             return None
             
-        timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'daily')
-        stats_file = self.find_stats_file(project_folder, metric_type, 'daily')
-        
-        if not timeseries_file and not stats_file:
-            return None
-        
         try:
-            if timeseries_file:
-                df = pd.read_csv(timeseries_file)
-                year_cols = [col for col in df.columns if str(col).isdigit()]
-                
-                if year_cols:
-                    df['mean'] = df[year_cols].mean(axis=1)
-                    df['p25'] = df[year_cols].quantile(0.25, axis=1)
-                    df['p75'] = df[year_cols].quantile(0.75, axis=1)
-            else:
-                df = pd.read_csv(stats_file)
-            
-            df['mean_smooth'] = df['mean'].rolling(window=7, center=True, min_periods=4).mean()
-            if 'p25' in df.columns and 'p75' in df.columns:
-                df['p25_smooth'] = df['p25'].rolling(window=7, center=True, min_periods=4).mean()
-                df['p75_smooth'] = df['p75'].rolling(window=7, center=True, min_periods=4).mean()
+            # Bands are already smoothed with the 7-day rolling average
+            df_smooth = self.get_aggregate_view(project_folder, metric_type, 'daily')
             
-            df_smooth = df.dropna(subset=['mean_smooth'])
+            if df_smooth is None:
+                return None
             
             fig, ax = plt.subplots(figsize=(16, 8))
             ax.set_facecolor('white')
@@ -462,58 +1081,36 @@ class StreamlitEnergyDashboard:
             x = range(len(df_smooth))
             
             if metric_type == 'price':
-                ax.plot(x, df_smooth['mean_smooth'], 
+                ax.plot(x, df_smooth['mean'], 
                        color=self.colors['price'],
                        linewidth=2.5,
                        label='Real-Time Price (7-day avg)',
                        zorder=5)
                 
                 # Try to load day-ahead price data
-                price_da_folder = project_folder / 'Price_da'
-                if price_da_folder.exists():
-                    dt_patterns = [
-                        '*_daily_timeseries.csv',
-                        '*daily_timeseries.csv',
-                        '*_price_da_daily_timeseries.csv'
-                    ]
-                    
-                    dt_file = None
-                    for pattern in dt_patterns:
-                        files = list(price_da_folder.glob(pattern))
-                        if files:
-                            dt_file = files[0]
-                            break
+                try:
+                    df_dt_smooth = self.get_aggregate_view(project_folder, 'price_da', 'daily')
                     
-                    if dt_file:
-                        try:
-                            df_dt = pd.read_csv(dt_file)
-                            year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
-                            
-                            if year_cols_dt:
-                                df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
-                                df_dt['mean_smooth'] = df_dt['mean'].rolling(window=7, center=True, min_periods=4).mean()
-                                df_dt_smooth = df_dt.dropna(subset=['mean_smooth'])
-                                
-                                if len(df_dt_smooth) == len(df_smooth):
-                                    ax.plot(x, df_dt_smooth['mean_smooth'], 
-                                           color=self.colors['price_da'],
-                                           linewidth=2.5,
-                                           label='Day-Ahead Price (7-day avg)',
-                                           zorder=5,
-                                           linestyle='--')
-                        except:
-                            pass
+                    if df_dt_smooth is not None and len(df_dt_smooth) == len(df_smooth):
+                        ax.plot(x, df_dt_smooth['mean'], 
+                               color=self.colors['price_da'],
+                               linewidth=2.5,
+                               label='Day-Ahead Price (7-day avg)',
+                               zorder=5,
+                               linestyle='--')
+                except:
+                    pass
             else:
-                if 'p25_smooth' in df_smooth.columns and 'p75_smooth' in df_smooth.columns:
+                if df_smooth['p25'].notna().any() and df_smooth['p75'].notna().any():
                     ax.fill_between(x, 
-                                  df_smooth['p25_smooth'], 
-                                  df_smooth['p75_smooth'],
+                                  df_smooth['p25'], 
+                                  df_smooth['p75'],
                                   alpha=0.3,
                                   color=self.colors[metric_type],
                                   label='P25-P75 Confidence Band (7-day avg)',
                                   edgecolor='none')
                 
-                ax.plot(x, df_smooth['mean_smooth'], 
+                ax.plot(x, df_smooth['mean'], 
                        color=self.colors[metric_type],
                        linewidth=2.5,
                        label='Mean (7-day avg)',
@@ -523,15 +1120,9 @@ class StreamlitEnergyDashboard:
             title = f'Daily {metric_type.capitalize()} Forecast (7-day Rolling Average) - {clean_name}'
             ax.set_title(title, fontsize=14, fontweight='normal', pad=15)
             
+            day_labels = self.day_tick_labels(df_smooth)
             tick_positions = list(range(0, len(df_smooth), 30))
-            if 'date_label' in df_smooth.columns:
-                tick_labels = [df_smooth.iloc[i]['date_label'] for i in tick_positions]
-            else:
-                tick_labels = []
-                for i in tick_positions:
-                    month = int(df_smooth.iloc[i]['month'])
-                    day = int(df_smooth.iloc[i]['day'])
-                    tick_labels.append(f"{self.month_names[month-1][:3]} {day}")
+            tick_labels = [day_labels[i] for i in tick_positions]
             
             ax.set_xticks(tick_positions)
             ax.set_xticklabels(tick_labels, rotation=45, ha='right')
@@ -565,55 +1156,22 @@ class StreamlitEnergyDashboard:
             return None
         
         project_folder = self.portfolio_path / site_name
-        if not project_folder.exists():
+        if not self.catalog.is_dir(project_folder):
             return None
             
-        timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'hourly')
-        stats_file = self.find_stats_file(project_folder, metric_type, 'hourly')
-        
-        if not timeseries_file and not stats_file:
-            return None
-        
         try:
-            if timeseries_file:
-                df = pd.read_csv(timeseries_file)
-                year_cols = [col for col in df.columns if str(col).isdigit()]
-                
-                if year_cols:
-                    df['mean'] = df[year_cols].mean(axis=1)
-                    df['p5'] = df[year_cols].quantile(0.05, axis=1)
-                    df['p95'] = df[year_cols].quantile(0.95, axis=1)
-                
-                if 'hour' not in df.columns:
-                    if 'datetime' in df.columns or 'timestamp' in df.columns:
-                        time_col = 'datetime' if 'datetime' in df.columns else 'timestamp'
-                        df[time_col] = pd.to_datetime(df[time_col])
-                        df['hour'] = df[time_col].dt.hour
-                    else:
-                        df['hour'] = df.index % 24
-                
-                hourly_profile = df.groupby('hour').agg({
-                    'mean': 'mean',
-                    'p5': 'mean',
-                    'p95': 'mean'
-                }).reset_index()
-            else:
-                df = pd.read_csv(stats_file)
-                if 'hour' in df.columns:
-                    hourly_profile = df.groupby('hour').agg({
-                        'mean': 'mean',
-                        'p5': 'mean',
-                        'p95': 'mean'
-                    }).reset_index()
-                else:
-                    return None
+            # 24-hour profile: the hourly mean and bands averaged by hour of day
+            hourly_profile = self.get_aggregate_view(project_folder, metric_type, 'hourly')
+            
+            if hourly_profile is None:
+                return None
             
             fig, ax = plt.subplots(figsize=(10, 6))
             ax.set_facecolor('white')
             fig.patch.set_facecolor('white')
             
             if metric_type == 'price':
-                if 'p5' in hourly_profile.columns and 'p95' in hourly_profile.columns:
+                if hourly_profile['p5'].notna().any() and hourly_profile['p95'].notna().any():
                     ax.fill_between(hourly_profile['hour'], 
                                   hourly_profile['p5'], 
                                   hourly_profile['p95'],
@@ -631,54 +1189,22 @@ class StreamlitEnergyDashboard:
                        zorder=5)
                 
                 # Try to load day-ahead price data
-                price_da_folder = project_folder / 'Price_da'
-                if price_da_folder.exists():
-                    dt_patterns = [
-                        '*_hourly_timeseries.csv',
-                        '*hourly_timeseries.csv',
-                        '*_hourly_stats.csv',
-                        '*hourly_stats.csv'
-                    ]
-                    
-                    dt_file = None
-                    for pattern in dt_patterns:
-                        files = list(price_da_folder.glob(pattern))
-                        if files:
-                            dt_file = files[0]
-                            break
+                try:
+                    hourly_profile_dt = self.get_aggregate_view(project_folder, 'price_da', 'hourly')
                     
-                    if dt_file:
-                        try:
-                            df_dt = pd.read_csv(dt_file)
-                            
-                            if 'timeseries' in dt_file.name:
-                                year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
-                                if year_cols_dt:
-                                    df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
-                                    
-                                    if 'hour' not in df_dt.columns:
-                                        df_dt['hour'] = df_dt.index % 24
-                                    
-                                    hourly_profile_dt = df_dt.groupby('hour')['mean'].mean().reset_index()
-                            else:
-                                if 'hour' in df_dt.columns:
-                                    hourly_profile_dt = df_dt.groupby('hour')['mean'].mean().reset_index()
-                                else:
-                                    hourly_profile_dt = None
-                            
-                            if hourly_profile_dt is not None:
-                                ax.plot(hourly_profile_dt['hour'], hourly_profile_dt['mean'], 
-                                       color=self.colors['price_da'],
-                                       linewidth=3,
-                                       marker='s',
-                                       markersize=6,
-                                       label='Day-Ahead Price Mean',
-                                       zorder=5,
-                                       linestyle='--')
-                        except:
-                            pass
+                    if hourly_profile_dt is not None:
+                        ax.plot(hourly_profile_dt['hour'], hourly_profile_dt['mean'], 
+                               color=self.colors['price_da'],
+                               linewidth=3,
+                               marker='s',
+                               markersize=6,
+                               label='Day-Ahead Price Mean',
+                               zorder=5,
+                               linestyle='--')
+                except:
+                    pass
             else:
-                if 'p5' in hourly_profile.columns and 'p95' in hourly_profile.columns:
+                if hourly_profile['p5'].notna().any() and hourly_profile['p95'].notna().any():
                     ax.fill_between(hourly_profile['hour'], 
                                   hourly_profile['p5'], 
                                   hourly_profile['p95'],
@@ -725,57 +1251,43 @@ class StreamlitEnergyDashboard:
             st.error(f"Error in hourly {metric_type}: {str(e)}")
             return None
     
-    def plot_monthly_duration_curve(self, site_name, month_idx):
-        """Create monthly duration curve for price"""
+    def get_month_duration_curve(self, site_name, month_idx):
+        """(sorted prices, P1-P99 markers, mean) of a month's price duration curve, or None"""
         project_folder = self.portfolio_path / site_name
-        if not project_folder.exists():
+        if not self.catalog.is_dir(project_folder):
             return None
             
         price_folder = project_folder / 'Price'
-        if not price_folder.exists():
+        if not self.catalog.is_dir(price_folder):
             return None
             
         timeseries_file = price_folder / f"{site_name}_price_hourly_timeseries_compressed.csv"
+        index_file = price_folder / duration_index_file_name(site_name)
         
-        if not timeseries_file.exists():
+        if (not self.catalog.exists(timeseries_file) and not self.catalog.exists(index_file)
+                and self.get_site_cube(project_folder, 'price_compressed') is None):
             return None
         
+        duration_index = self.get_duration_index(index_file, timeseries_file)
+        return duration_index.curve(month_idx) if duration_index is not None else None
+    
+    def plot_monthly_duration_curve(self, site_name, month_idx):
+        """Create monthly duration curve for price"""
         try:
-            df = pd.read_csv(timeseries_file)
-            
-            year_cols = [col for col in df.columns if str(col).isdigit()]
+            # Pre-sorted curve, P1-P99 markers and mean of the month
+            curve = self.get_month_duration_curve(site_name, month_idx)
             
-            if not year_cols:
-                return None
-            
-            month_data = df[df['month'] == month_idx].copy()
-            
-            if len(month_data) == 0:
+            if curve is None:
                 return None
             
-            month_values = []
-            for year in year_cols:
-                year_values = pd.to_numeric(month_data[year], errors='coerce').dropna()
-                month_values.extend(year_values.tolist())
-            
-            if not month_values:
-                return None
-            
-            sorted_values = np.sort(month_values)[::-1]
+            sorted_values, markers, mean_value = curve
             n_values = len(sorted_values)
             duration_pct = np.linspace(0, 100, n_values)
+            max_value, min_value = float(sorted_values[0]), float(sorted_values[-1])
             
             percentiles_to_mark = [1, 5, 25, 50, 75, 95, 99]
-            percentile_values = {}
-            percentile_indices = {}
-            
-            for p in percentiles_to_mark:
-                idx = int((100 - p) / 100 * n_values)
-                idx = min(idx, n_values - 1)
-                percentile_values[p] = sorted_values[idx]
-                percentile_indices[p] = idx
-            
-            mean_value = np.mean(month_values)
+            percentile_values = {p: markers[p] for p in percentiles_to_mark}
+            percentile_indices = dict(zip(percentiles_to_mark, marker_positions(n_values, percentiles_to_mark)))
             
             fig, ax = plt.subplots(figsize=(10, 6))
             ax.set_facecolor('white')
@@ -787,10 +1299,10 @@ class StreamlitEnergyDashboard:
             ax.axhline(y=mean_value, color='black', linestyle='--', 
                       linewidth=1.2, alpha=0.8)
             
-            y_range = max(sorted_values) - min(sorted_values)
+            y_range = max_value - min_value
             mean_label_y = mean_value + y_range * 0.02
             
-            if mean_label_y > max(sorted_values) * 0.95:
+            if mean_label_y > max_value * 0.95:
                 mean_label_y = mean_value - y_range * 0.02
             
             mean_label = f'Mean: ${mean_value:.2f}'
@@ -799,10 +1311,7 @@ class StreamlitEnergyDashboard:
                    ha='center', va='bottom' if mean_label_y > mean_value else 'top', 
                    fontsize=10, fontweight='bold')
             
-            percentile_colors = {
-                99: 'green', 95: 'green', 75: 'green',
-                50: 'blue', 25: 'orange', 5: 'red', 1: 'red'
-            }
+            percentile_colors = self.percentile_colors
             
             for p in percentiles_to_mark:
                 idx = percentile_indices[p]
@@ -816,7 +1325,7 @@ class StreamlitEnergyDashboard:
                 label = f'P{p}'
                 value_text = f'${value:.1f}'
                 
-                y_range = max(sorted_values) - min(sorted_values)
+                y_range = max_value - min_value
                 if p >= 50:
                     va = 'bottom'
                     y_offset = value + y_range * 0.015
@@ -841,7 +1350,7 @@ class StreamlitEnergyDashboard:
             month_name = self.month_names[month_idx - 1]
             
             title = f'Price Duration Curve - {month_name} - {clean_name}'
-            if min(sorted_values) < 0:
+            if min_value < 0:
                 title += '\n(includes negative prices)'
             
             ax.set_title(title, fontsize=12, fontweight='normal', pad=10)
@@ -851,12 +1360,12 @@ class StreamlitEnergyDashboard:
             ax.set_xlim(0, 100)
             ax.set_xticks(range(0, 101, 20))
             
-            y_min = min(sorted_values) * 1.1 if min(sorted_values) < 0 else 0
-            y_max = max(sorted_values) * 1.1
+            y_min = min_value * 1.1 if min_value < 0 else 0
+            y_max = max_value * 1.1
             ax.set_ylim(y_min, y_max)
             ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
             
-            if min(sorted_values) < 0:
+            if min_value < 0:
                 ax.axhline(y=0, color='gray', linestyle='-', linewidth=1, alpha=0.5, zorder=3)
             
             ax.grid(True, axis='both', alpha=0.3, linestyle='-', linewidth=0.5)
@@ -880,7 +1389,7 @@ class StreamlitEnergyDashboard:
             return None
         
         project_folder = self.portfolio_path / site_name
-        if not project_folder.exists():
+        if not self.catalog.is_dir(project_folder):
             return None
             
         timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'monthly')
@@ -889,7 +1398,7 @@ class StreamlitEnergyDashboard:
             return None
         
         try:
-            df = pd.read_csv(timeseries_file)
+            df = self.read_data_file(timeseries_file)
             
             year_cols = [col for col in df.columns if str(col).isdigit()]
             
@@ -1007,19 +1516,179 @@ class StreamlitEnergyDashboard:
             st.error(f"Error in distribution curve: {str(e)}")
             return None
     
+    def portfolio_files(self, metric_type, view):
+        """
+        (site, timeseries file, mtime, size) of every site with a timeseries of
+        the metric's view (the site cube for the hourly view when it is current);
+        also the source signature of the portfolio charts
+        """
+        files = []
+        for site_name in self.get_all_sites():
+            project_folder = self.portfolio_path / site_name
+            file_path = self.find_timeseries_file(project_folder, metric_type, view)
+            # Hourly views slice the site cube instead of parsing the timeseries
+            if view == 'hourly' and self.get_site_cube(project_folder, metric_type, file_path) is not None:
+                file_path = cube_paths(project_folder)[0]
+            if file_path is None:
+                continue
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            files.append((site_name, str(file_path), stat.st_mtime_ns, stat.st_size))
+        return tuple(files)
+    
+    def get_portfolio_stack(self, metric_type, view):
+        """Every site's timeseries of one metric and view stacked, or None when no site has it"""
+        files = self.portfolio_files(metric_type, view)
+        if not files:
+            return None
+        return load_portfolio_stack(files, metric_type, view)
+    
+    def portfolio_contributions(self, metric_type):
+        """Table of every site's forecast-window total and share of the portfolio, or None"""
+        try:
+            stack = self.get_portfolio_stack(metric_type, 'monthly')
+            if stack is None or not stack.sites:
+                return None
+            
+            table = stack.contributions()
+            unit = 'MWh' if metric_type == 'generation' else '$'
+            return pd.DataFrame({
+                'Site': [self.clean_site_name(site) if site != 'Portfolio' else '🌐 Portfolio' for site in table['site']],
+                f'Mean ({unit})': table['mean'].round(0),
+                f'P5 ({unit})': table['p5'].round(0),
+                f'P95 ({unit})': table['p95'].round(0),
+                'Share (%)': (table['share'] * 100).round(1),
+                'Complete years': table['years']
+            })
+        
+        except Exception as e:
+            st.error(f"Error in portfolio {metric_type} contributions: {str(e)}")
+            return None
+    
+    def portfolio_risk(self, metric_type):
+        """
+        Table of portfolio P-values of the forecast-window total from the
+        year-by-year sum of the sites, next to the sum of the site P-values
+        and a bootstrap interval, or None
+        """
+        try:
+            stack = self.get_portfolio_stack(metric_type, 'monthly')
+            if stack is None:
+                return None
+            
+            risk = stack.risk(seed=PORTFOLIO_BOOTSTRAP_SEED)
+            if risk.empty:
+                return None
+            
+            unit = 'MWh' if metric_type == 'generation' else '$'
+            return pd.DataFrame({
+                'P-value': [f"P{p}" for p in risk['percentile']],
+                f'Portfolio ({unit})': risk['portfolio'].round(0),
+                f'Sum of sites ({unit})': risk['sum_of_sites'].round(0),
+                f'Diversification ({unit})': risk['diversification'].round(0),
+                f'Bootstrap 95% low ({unit})': risk['ci_low'].round(0),
+                f'Bootstrap 95% high ({unit})': risk['ci_high'].round(0)
+            })
+        
+        except Exception as e:
+            st.error(f"Error in portfolio {metric_type} risk: {str(e)}")
+            return None
+    
+    def portfolio_skipped(self, metric_type, view):
+        """{site: reason} of the sites left out of the portfolio stack"""
+        try:
+            stack = self.get_portfolio_stack(metric_type, view)
+        except Exception:
+            return {}
+        return stack.skipped if stack is not None else {}
+    
+    def plot_portfolio_forecast(self, metric_type, view):
+        """Create the portfolio total forecast with P5-P95 bands across years"""
+        try:
+            stack = self.get_portfolio_stack(metric_type, view)
+            if stack is None or not stack.sites:
+                return None
+            
+            df = aggregate_view(stack.total_frame(), view)
+            if df.empty or not df['mean'].notna().any():
+                return None
+            
+            fig, ax = plt.subplots(figsize=(16, 8) if view == 'daily' else (12, 7))
+            ax.set_facecolor('white')
+            fig.patch.set_facecolor('white')
+            
+            x = df['hour'] if view == 'hourly' else range(len(df))
+            
+            if df['p5'].notna().any() and df['p95'].notna().any():
+                ax.fill_between(x, df['p5'], df['p95'],
+                              alpha=0.3,
+                              color=self.colors[metric_type],
+                              label='P5-P95 Confidence Band',
+                              edgecolor='none')
+            
+            ax.plot(x, df['mean'], 
+                   color=self.colors[metric_type],
+                   linewidth=2.5 if view == 'daily' else 3,
+                   label='Mean',
+                   zorder=5,
+                   marker=None if view == 'daily' else 'o',
+                   markersize=6)
+            
+            site_count = f"{len(stack.sites)} site{'s' if len(stack.sites) != 1 else ''}"
+            if view == 'monthly':
+                title = f'Portfolio Monthly {metric_type.capitalize()} Forecast - {site_count}'
+                ax.set_xticks(x)
+                ax.set_xticklabels(self.month_tick_labels(df), rotation=45, ha='right')
+            elif view == 'daily':
+                title = f'Portfolio Daily {metric_type.capitalize()} Forecast (7-day Rolling Average) - {site_count}'
+                day_labels = self.day_tick_labels(df)
+                tick_positions = list(range(0, len(df), 30))
+                ax.set_xticks(tick_positions)
+                ax.set_xticklabels([day_labels[i] for i in tick_positions], rotation=45, ha='right')
+            else:
+                title = f'Portfolio Average Hourly {metric_type.capitalize()} Profile - {site_count}'
+                ax.set_xlabel('Hour of Day', fontsize=11)
+                ax.set_xticks(range(0, 24, 2))
+                ax.set_xlim(-0.5, 23.5)
+            ax.set_title(title, fontsize=14, fontweight='normal', pad=15)
+            if view != 'hourly':
+                ax.set_xlabel('')
+            
+            self.format_y_axis(ax, metric_type, view)
+            
+            ax.grid(True, axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
+            ax.grid(False, axis='x')
+            
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['left'].set_color('lightgray')
+            ax.spines['bottom'].set_color('lightgray')
+            
+            ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15),
+                     ncol=2, frameon=False, fontsize=10)
+            
+            plt.tight_layout()
+            plt.subplots_adjust(bottom=0.15)
+            
+            return fig
+            
+        except Exception as e:
+            st.error(f"Error in portfolio {metric_type}: {str(e)}")
+            return None
+    
     def create_combined_forecast(self, site_name):
         """Create a combined plot showing all three metrics"""
         project_folder = self.portfolio_path / site_name
-        if not project_folder.exists():
+        if not self.catalog.is_dir(project_folder):
             return None
         
         metrics_available = []
         for metric in ['generation', 'price', 'revenue']:
             metric_folder = project_folder / metric.capitalize()
-            if metric_folder.exists():
-                monthly_files = list(metric_folder.glob('*monthly*.csv'))
-                if monthly_files:
-                    metrics_available.append(metric)
+            if self.catalog.glob(metric_folder, '*monthly*.csv'):
+                metrics_available.append(metric)
         
         if len(metrics_available) < 2:
             return None
@@ -1037,20 +1706,11 @@ class StreamlitEnergyDashboard:
                 ax = axes[idx]
                 ax.set_facecolor('white')
                 
-                timeseries_file = self.find_timeseries_file(project_folder, metric, 'monthly')
+                df = self.get_aggregate_view(project_folder, metric, 'monthly')
                 
-                if not timeseries_file:
+                if df is None:
                     continue
                 
-                df = pd.read_csv(timeseries_file)
-                
-                year_cols = [col for col in df.columns if str(col).isdigit()]
-                
-                if year_cols:
-                    df['mean'] = df[year_cols].mean(axis=1)
-                    df['p5'] = df[year_cols].quantile(0.05, axis=1)
-                    df['p95'] = df[year_cols].quantile(0.95, axis=1)
-                
                 x = range(len(df))
                 
                 if metric == 'price':
@@ -1061,39 +1721,21 @@ class StreamlitEnergyDashboard:
                            marker='o',
                            markersize=5)
                     
-                    price_da_folder = project_folder / 'Price_da'
-                    if price_da_folder.exists():
-                        dt_patterns = [
-                            '*_monthly_timeseries.csv',
-                            '*monthly_timeseries.csv',
-                            '*_price_da_monthly_timeseries.csv'
-                        ]
+                    try:
+                        df_dt = self.get_aggregate_view(project_folder, 'price_da', 'monthly')
                         
-                        dt_file = None
-                        for pattern in dt_patterns:
-                            files = list(price_da_folder.glob(pattern))
-                            if files:
-                                dt_file = files[0]
-                                break
-                        
-                        if dt_file:
-                            try:
-                                df_dt = pd.read_csv(dt_file)
-                                year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
-                                
-                                if year_cols_dt:
-                                    df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
-                                    ax.plot(x, df_dt['mean'], 
-                                           color=self.colors['price_da'],
-                                           linewidth=3,
-                                           label='Day-Ahead Price',
-                                           marker='s',
-                                           markersize=5,
-                                           linestyle='--')
-                            except:
-                                pass
+                        if df_dt is not None:
+                            ax.plot(x, df_dt['mean'], 
+                                   color=self.colors['price_da'],
+                                   linewidth=3,
+                                   label='Day-Ahead Price',
+                                   marker='s',
+                                   markersize=5,
+                                   linestyle='--')
+                    except:
+                        pass
                 else:
-                    if 'p5' in df.columns and 'p95' in df.columns:
+                    if df['p5'].notna().any() and df['p95'].notna().any():
                         ax.fill_between(x, df['p5'], df['p95'],
                                       alpha=0.3,
                                       color=self.colors[metric],
@@ -1128,10 +1770,7 @@ class StreamlitEnergyDashboard:
                 
                 if idx == len(metrics_available) - 1:
                     ax.set_xticks(x)
-                    if 'month_name' in df.columns:
-                        ax.set_xticklabels(df['month_name'], rotation=45, ha='right')
-                    else:
-                        ax.set_xticklabels([self.month_names[i] for i in range(12)], rotation=45, ha='right')
+                    ax.set_xticklabels(self.month_tick_labels(df), rotation=45, ha='right')
             
             clean_name = self.clean_site_name(site_name)
             fig.suptitle(f'Combined Monthly Forecasts - {clean_name}', 
@@ -1155,7 +1794,7 @@ def main():
     dashboard = StreamlitEnergyDashboard()
     
     # Check if portfolio path exists
-    if not dashboard.portfolio_path.exists():
+    if not dashboard.catalog.is_dir(dashboard.portfolio_path):
         st.error(f"❌ Portfolio path '{dashboard.portfolio_path}' not found!")
         st.info("Please ensure the 'Renewable Portfolio LLC' folder exists in the current directory.")
         return
@@ -1186,12 +1825,8 @@ def main():
         st.subheader("📊 Site Information")
         project_folder = dashboard.portfolio_path / selected_site
         
-        metrics_available = []
-        for metric in ['generation', 'price', 'price_da', 'revenue']:
-            metric_folder_name = metric.capitalize() if metric != 'price_da' else 'Price_da'
-            metric_folder = project_folder / metric_folder_name
-            if metric_folder.exists():
-                metrics_available.append(metric)
+        metrics_available = [metric for metric, metric_folder_name in METRIC_FOLDERS.items()
+                             if dashboard.catalog.is_dir(project_folder / metric_folder_name)]
         
         st.write(f"**Available metrics:** {len(metrics_available)}")
         for metric in metrics_available:
@@ -1202,18 +1837,39 @@ def main():
                 'revenue': '💵 Revenue'
             }
             st.write(display_name.get(metric, metric))
+        
+        st.markdown("---")
+        
+        # Chart style for the monthly, daily, hourly and duration curve charts
+        st.subheader("🖼️ Chart Style")
+        chart_style = st.radio(
+            "Draw charts as:",
+            options=['static', 'interactive'],
+            format_func=lambda x: {'static': 'Static images', 'interactive': 'Interactive (zoom & pan)'}[x],
+            key="chart_style"
+        )
+        interactive = chart_style == 'interactive'
+    
+    # Main content area: only the selected view is loaded and drawn on each rerun
+    views = {
+        'monthly': "📈 Monthly Forecasts",
+        'daily': "📊 Daily Trends",
+        'hourly': "🕐 Hourly Profiles",
+        'special': "📉 Special Analysis",
+        'combined': "🎯 Combined View",
+        'portfolio': "🌐 Portfolio",
+        'explorer': "📁 Data Explorer"
+    }
+    selected_view = st.radio(
+        "View:",
+        options=list(views),
+        format_func=lambda x: views[x],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="view"
+    )
     
-    # Main content area
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "📈 Monthly Forecasts", 
-        "📊 Daily Trends", 
-        "🕐 Hourly Profiles", 
-        "📉 Special Analysis",
-        "🎯 Combined View",
-        "📁 Data Explorer"
-    ])
-    
-    with tab1:
+    if selected_view == 'monthly':
         st.header("Monthly Forecasts")
         
         col1, col2 = st.columns(2)
@@ -1222,31 +1878,22 @@ def main():
             # Generation
             if 'generation' in metrics_available:
                 with st.spinner('Loading generation data...'):
-                    fig = dashboard.plot_monthly_forecast(selected_site, 'generation')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    dashboard.show_forecast(selected_site, 'generation', 'monthly', interactive)
             
             # Revenue
             if 'revenue' in metrics_available:
                 with st.spinner('Loading revenue data...'):
-                    fig = dashboard.plot_monthly_forecast(selected_site, 'revenue')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    dashboard.show_forecast(selected_site, 'revenue', 'monthly', interactive)
         
         with col2:
             # Price (includes both RT and DA if available)
             if 'price' in metrics_available:
                 with st.spinner('Loading price data...'):
-                    fig = dashboard.plot_monthly_forecast(selected_site, 'price')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    if dashboard.show_forecast(selected_site, 'price', 'monthly', interactive):
                         if 'price_da' in metrics_available:
                             st.info("ℹ️ Chart includes both real-time and day-ahead prices")
     
-    with tab2:
+    elif selected_view == 'daily':
         st.header("Daily Trends (7-day Rolling Average)")
         
         col1, col2 = st.columns(2)
@@ -1255,29 +1902,20 @@ def main():
             # Generation
             if 'generation' in metrics_available:
                 with st.spinner('Loading daily generation data...'):
-                    fig = dashboard.plot_daily_forecast(selected_site, 'generation')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    dashboard.show_forecast(selected_site, 'generation', 'daily', interactive)
             
             # Revenue
             if 'revenue' in metrics_available:
                 with st.spinner('Loading daily revenue data...'):
-                    fig = dashboard.plot_daily_forecast(selected_site, 'revenue')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    dashboard.show_forecast(selected_site, 'revenue', 'daily', interactive)
         
         with col2:
             # Price
             if 'price' in metrics_available:
                 with st.spinner('Loading daily price data...'):
-                    fig = dashboard.plot_daily_forecast(selected_site, 'price')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    dashboard.show_forecast(selected_site, 'price', 'daily', interactive)
     
-    with tab3:
+    elif selected_view == 'hourly':
         st.header("Average Hourly Profiles")
         
         col1, col2 = st.columns(2)
@@ -1286,29 +1924,34 @@ def main():
             # Generation
             if 'generation' in metrics_available:
                 with st.spinner('Loading hourly generation profile...'):
-                    fig = dashboard.plot_hourly_forecast(selected_site, 'generation')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    dashboard.show_forecast(selected_site, 'generation', 'hourly', interactive)
         
         with col2:
             # Price
             if 'price' in metrics_available:
                 with st.spinner('Loading hourly price profile...'):
-                    fig = dashboard.plot_hourly_forecast(selected_site, 'price')
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    dashboard.show_forecast(selected_site, 'price', 'hourly', interactive)
         
         st.info("ℹ️ Revenue hourly profiles are not available as revenue is calculated from generation × price")
     
-    with tab4:
+    elif selected_view == 'special':
         st.header("Special Analysis")
         
-        # Create sub-tabs for different analysis types
-        analysis_tab1, analysis_tab2 = st.tabs(["💰 Price Duration Curves", "📊 Distribution Analysis"])
+        # Analysis selector; only the selected analysis is drawn
+        analyses = {
+            'duration': "💰 Price Duration Curves",
+            'distribution': "📊 Distribution Analysis"
+        }
+        selected_analysis = st.radio(
+            "Analysis:",
+            options=list(analyses),
+            format_func=lambda x: analyses[x],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="analysis"
+        )
         
-        with analysis_tab1:
+        if selected_analysis == 'duration':
             if 'price' in metrics_available:
                 st.subheader("Monthly Price Duration Curves")
                 
@@ -1321,16 +1964,12 @@ def main():
                 )
                 
                 with st.spinner(f'Loading duration curve for {month_names[selected_month-1]}...'):
-                    fig = dashboard.plot_monthly_duration_curve(selected_site, selected_month)
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
-                    else:
+                    if not dashboard.show_duration_curve(selected_site, selected_month, interactive):
                         st.warning("Duration curve data not available for this month")
             else:
                 st.info("Price data not available for this site")
         
-        with analysis_tab2:
+        else:
             st.subheader("Monthly Distribution Analysis")
             
             # Metric selector for distribution
@@ -1356,31 +1995,85 @@ def main():
                 )
                 
                 with st.spinner(f'Loading {selected_dist_metric} distribution...'):
-                    fig = dashboard.plot_monthly_distribution_curve(
+                    png = dashboard.render_figure(
+                        'plot_monthly_distribution_curve',
                         selected_site, 
                         selected_dist_metric, 
-                        selected_dist_month
+                        selected_dist_month,
+                        signature=dashboard.source_signature(selected_site, [METRIC_FOLDERS[selected_dist_metric]])
                     )
-                    if fig:
-                        st.pyplot(fig)
-                        plt.close()
+                    if png:
+                        st.image(png, width='stretch')
                     else:
                         st.warning("Distribution data not available for this selection")
             else:
                 st.info("No generation or revenue data available for distribution analysis")
     
-    with tab5:
+    elif selected_view == 'combined':
         st.header("Combined Monthly View")
         
         with st.spinner('Creating combined forecast...'):
-            fig = dashboard.create_combined_forecast(selected_site)
-            if fig:
-                st.pyplot(fig)
-                plt.close()
+            png = dashboard.render_figure('create_combined_forecast', selected_site,
+                                          signature=dashboard.source_signature(selected_site, METRIC_FOLDERS.values()))
+            if png:
+                st.image(png, width='stretch')
             else:
                 st.warning("Not enough metrics available for combined view (need at least 2)")
     
-    with tab6:
+    elif selected_view == 'portfolio':
+        st.header("Portfolio Totals")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            portfolio_metric = st.selectbox(
+                "Select metric:",
+                options=list(PORTFOLIO_METRICS),
+                format_func=lambda x: x.capitalize(),
+                key="portfolio_metric"
+            )
+        
+        with col2:
+            portfolio_view = st.selectbox(
+                "Select resolution:",
+                options=list(PORTFOLIO_VIEWS),
+                format_func=lambda x: x.capitalize(),
+                key="portfolio_view"
+            )
+        
+        with st.spinner(f'Adding up {portfolio_metric} across {len(sites)} sites...'):
+            png = dashboard.render_figure('plot_portfolio_forecast', portfolio_metric, portfolio_view,
+                                          signature=dashboard.portfolio_files(portfolio_metric, portfolio_view))
+            if png:
+                st.image(png, width='stretch')
+            else:
+                st.warning(f"No site has a {portfolio_view} {portfolio_metric} timeseries")
+        
+        # The tables below are built from the monthly view
+        skipped = {**dashboard.portfolio_skipped(portfolio_metric, 'monthly'),
+                   **dashboard.portfolio_skipped(portfolio_metric, portfolio_view)}
+        if skipped:
+            st.warning("Left out of the portfolio: " +
+                       "; ".join(f"{dashboard.clean_site_name(site)} ({reason})" for site, reason in skipped.items()))
+        
+        st.subheader("Site Contributions")
+        contributions = dashboard.portfolio_contributions(portfolio_metric)
+        if contributions is not None:
+            st.dataframe(contributions, width='stretch', hide_index=True)
+            st.caption("Forecast-window totals across the simulation years each site covers in full; "
+                       "the portfolio row uses the years every site covers.")
+        
+        st.subheader("Portfolio Risk")
+        risk = dashboard.portfolio_risk(portfolio_metric)
+        if risk is not None:
+            st.dataframe(risk, width='stretch', hide_index=True)
+            st.caption("Portfolio P-values come from adding the sites up year by year, so years that were "
+                       "bad for every site count once. Summing each site's own P-value assumes all sites "
+                       "have their bad years together. The bootstrap interval resamples whole years.")
+        else:
+            st.info("No simulation year is complete for every site")
+    
+    elif selected_view == 'explorer':
         st.header("📁 Data Explorer & Downloads")
         
         # Get all files for the selected site
@@ -1423,21 +2116,20 @@ def main():
                                 with col2:
                                     if st.button(f"View", key=f"view_{metric}_{temporal}_ts"):
                                         try:
-                                            df = pd.read_csv(file_path)
-                                            st.write(f"**{file_path.name}** - Shape: {df.shape}")
-                                            st.dataframe(df.head(100), use_container_width=True)
+                                            df = dashboard.preview_data_file(file_path)
+                                            st.write(f"**{file_path.name}** - First {len(df)} rows ({dashboard.format_file_size(file_path)})")
+                                            st.dataframe(df, use_container_width=True)
                                         except Exception as e:
                                             st.error(f"Error reading file: {e}")
                                 
                                 with col3:
                                     try:
-                                        df = pd.read_csv(file_path)
-                                        csv = df.to_csv(index=False)
                                         st.download_button(
                                             label="Download",
-                                            data=csv,
+                                            data=dashboard.file_download_source(file_path),
                                             file_name=file_path.name,
                                             mime='text/csv',
+                                            on_click='ignore',
                                             key=f"dl_{metric}_{temporal}_ts"
                                         )
                                     except:
@@ -1455,21 +2147,20 @@ def main():
                                 with col2:
                                     if st.button(f"View", key=f"view_{metric}_{temporal}_stats"):
                                         try:
-                                            df = pd.read_csv(file_path)
-                                            st.write(f"**{file_path.name}** - Shape: {df.shape}")
-                                            st.dataframe(df.head(100), use_container_width=True)
+                                            df = dashboard.preview_data_file(file_path)
+                                            st.write(f"**{file_path.name}** - First {len(df)} rows ({dashboard.format_file_size(file_path)})")
+                                            st.dataframe(df, use_container_width=True)
                                         except Exception as e:
                                             st.error(f"Error reading file: {e}")
                                 
                                 with col3:
                                     try:
-                                        df = pd.read_csv(file_path)
-                                        csv = df.to_csv(index=False)
                                         st.download_button(
                                             label="Download",
-                                            data=csv,
+                                            data=dashboard.file_download_source(file_path),
                                             file_name=file_path.name,
                                             mime='text/csv',
+                                            on_click='ignore',
                                             key=f"dl_{metric}_{temporal}_stats"
                                         )
                                     except:
@@ -1487,21 +2178,20 @@ def main():
                                 with col2:
                                     if st.button(f"View", key=f"view_{metric}_{file_path.name}"):
                                         try:
-                                            df = pd.read_csv(file_path)
-                                            st.write(f"**{file_path.name}** - Shape: {df.shape}")
-                                            st.dataframe(df.head(100), use_container_width=True)
+                                            df = dashboard.preview_data_file(file_path)
+                                            st.write(f"**{file_path.name}** - First {len(df)} rows ({dashboard.format_file_size(file_path)})")
+                                            st.dataframe(df, use_container_width=True)
                                         except Exception as e:
                                             st.error(f"Error reading file: {e}")
                                 
                                 with col3:
                                     try:
-                                        df = pd.read_csv(file_path)
-                                        csv = df.to_csv(index=False)
                                         st.download_button(
                                             label="Download",
-                                            data=csv,
+                                            data=dashboard.file_download_source(file_path),
                                             file_name=file_path.name,
                                             mime='text/csv',
+                                            on_click='ignore',
                                             key=f"dl_{metric}_{file_path.name}"
                                         )
                                     except:
@@ -1515,7 +2205,7 @@ def main():
                             # Try to load monthly timeseries for summary
                             if 'monthly' in files_dict[metric]['timeseries']:
                                 try:
-                                    df = pd.read_csv(files_dict[metric]['timeseries']['monthly'])
+                                    df = dashboard.read_data_file(files_dict[metric]['timeseries']['monthly'])
                                     year_cols = [col for col in df.columns if str(col).isdigit()]
                                     
                                     if year_cols:
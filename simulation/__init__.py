@@ -0,0 +1,41 @@
+"""
+Shared building blocks for the generation, price and revenue simulations.
+"""
+from simulation.columnar import (
+    COLUMNAR_AVAILABLE,
+    COLUMNAR_SUFFIX,
+    columnar_path,
+    read_columnar,
+    to_columnar_frame,
+    write_columnar,
+)
+from simulation.slot_stats import (
+    SlotLayout,
+    compress_slot_values,
+    slot_percentiles,
+    slot_statistics,
+)
+from simulation.time_keys import (
+    DAY_KEY,
+    HOUR_KEY,
+    date_labels,
+    datetime_labels,
+    day_of_year,
+    hour_of_year,
+)
+from simulation.combined_schema import (
+    COMBINED_SCHEMA,
+    CombinedSchemaError,
+    read_combined,
+)
+from simulation.incremental import (
+    IncrementalState,
+    RunningSlotStats,
+    SlotSketch,
+)
+from simulation.pipeline import (
+    SimulationPipeline,
+    discover_sites,
+    load_combined_frame,
+    run_site,
+)
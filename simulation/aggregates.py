@@ -0,0 +1,125 @@
+"""
+Precomputed per-site aggregates for the dashboard.
+
+The dashboard's monthly, daily and hourly charts only need a mean and a few
+percentile bands across years. Each metric writes them next to its
+timeseries as {site}_{metric}_aggregates.csv, a few hundred rows in long
+format:
+
+    view     label / month / day / hour    mean  p5  p25  p75  p95
+    monthly  one row per month of the window
+    daily    one row per day, bands smoothed with a centred 7-day mean
+    hourly   24 rows, the average profile over the hour of day
+
+aggregate_view computes a view from a timeseries (or statistics) frame, so
+the dashboard can fall back to it for outputs written without aggregates.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from simulation.columnar import is_year_column
+from simulation.time_keys import frame_labels
+
+AGGREGATES_SUFFIX = '_aggregates.csv'
+VIEWS = ('monthly', 'daily', 'hourly')
+BAND_PERCENTILES = [5, 25, 75, 95]
+BAND_COLUMNS = ['mean'] + [f'p{p}' for p in BAND_PERCENTILES]
+AGGREGATE_COLUMNS = ['view', 'label', 'month', 'day', 'hour'] + BAND_COLUMNS
+
+# Centred rolling mean used for the daily bands
+SMOOTHING_WINDOW = 7
+SMOOTHING_MIN_PERIODS = 4
+
+
+def aggregates_file_name(site_name, metric):
+    return f"{site_name}_{metric}{AGGREGATES_SUFFIX}"
+
+
+def row_bands(df):
+    """
+    Mean and P5/P25/P75/P95 across the year columns of every row (NaN skipped).
+    Frames without year columns (statistics files) keep whichever band
+    columns they already have.
+    """
+    year_cols = [col for col in df.columns if is_year_column(col)]
+    if not year_cols:
+        return df[[col for col in BAND_COLUMNS if col in df.columns]].reset_index(drop=True)
+
+    values = df[year_cols].to_numpy(dtype=float)
+    with warnings.catch_warnings():
+        # Rows without any year give NaN bands
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(values, axis=1)
+        percentiles = np.nanpercentile(values, BAND_PERCENTILES, axis=1)
+
+    bands = {'mean': mean}
+    for i, p in enumerate(BAND_PERCENTILES):
+        bands[f'p{p}'] = percentiles[i]
+    return pd.DataFrame(bands)
+
+
+def aggregate_view(df, view):
+    """
+    One view of the aggregates from a monthly, daily or hourly timeseries frame
+    """
+    bands = row_bands(df)
+    keys = df.reset_index(drop=True)
+
+    if view == 'monthly':
+        result = bands
+        result['label'] = keys['month_name'] if 'month_name' in keys.columns else None
+        if 'month' in keys.columns:
+            result['month'] = keys['month']
+
+    elif view == 'daily':
+        result = bands.rolling(window=SMOOTHING_WINDOW, center=True, min_periods=SMOOTHING_MIN_PERIODS).mean()
+        result['label'] = frame_labels(keys)
+        for col in ('month', 'day'):
+            if col in keys.columns:
+                result[col] = keys[col]
+        result = result.dropna(subset=['mean']).reset_index(drop=True)
+
+    elif view == 'hourly':
+        hours = keys['hour'] if 'hour' in keys.columns else pd.Series(np.arange(len(keys)) % 24)
+        result = bands.groupby(hours.to_numpy()).mean()
+        result['hour'] = result.index
+        result['label'] = [f"{int(hour):02d}:00" for hour in result.index]
+        result = result.reset_index(drop=True)
+
+    else:
+        raise ValueError(f"Unknown aggregate view: {view}")
+
+    result = result.reindex(columns=AGGREGATE_COLUMNS)
+    result['view'] = view
+    for col in ('month', 'day', 'hour'):
+        result[col] = result[col].astype('Int64')
+    return result
+
+
+def build_aggregates(timeseries, decimals=None):
+    """
+    All views of a metric from its timeseries, keyed 'monthly' / 'daily' / 'hourly'.
+    decimals rounds the year columns like the saved timeseries first, so the
+    aggregates describe exactly what the timeseries files hold.
+    """
+    views = []
+    for view in VIEWS:
+        df = timeseries.get(view)
+        if df is None or df.empty:
+            continue
+        if decimals is not None:
+            year_cols = [col for col in df.columns if is_year_column(col)]
+            df = df.copy()
+            df[year_cols] = df[year_cols].astype(float).round(decimals)
+        views.append(aggregate_view(df, view))
+
+    if not views:
+        return pd.DataFrame(columns=AGGREGATE_COLUMNS)
+    return pd.concat(views, ignore_index=True)
+
+
+def select_view(aggregates, view):
+    """Rows of one view from a loaded aggregates file"""
+    return aggregates[aggregates['view'] == view].reset_index(drop=True)
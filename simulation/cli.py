@@ -0,0 +1,142 @@
+"""
+Headless batch runner for the simulations.
+
+Runs any set of metrics for any set of sites without prompts. Sites are
+fanned out over a process pool (one worker per available core by default);
+each worker loads a site's combined file once and runs every requested
+metric on it. Metrics whose input file and parameters are unchanged since
+the last build (see simulation_manifest.json in each site folder) are
+skipped unless --force is given. With --incremental, metrics that support it
+fold only the hours appended to the combined file since their last build.
+Wall time is reported per site.
+
+    python -m simulation                                   # all sites, all metrics
+    python -m simulation --sites Misae_Solar --metrics price revenue
+    python -m simulation --start-month 1 --end-month 12 --workers 4
+    python -m simulation --force                           # rebuild everything
+    python -m simulation --incremental                     # fold in newly appended hours
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from simulation.metrics import METRICS
+from simulation.pipeline import (
+    DATA_PATH,
+    FAILED,
+    MONTH_NAMES,
+    OUTPUT_PATH,
+    SKIPPED,
+    automatic_month_range,
+    discover_sites,
+    run_site,
+)
+
+
+def available_cores():
+    """Cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def simulate_site(site_name, metrics, start_month, end_month, data_path, output_path,
+                  force=False, incremental=False, verbose=False):
+    """
+    Worker: run the metrics for one site.
+    Returns (site_name, {metric: status}, wall seconds, captured log).
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    with warnings.catch_warnings(), contextlib.redirect_stdout(sys.stdout if verbose else log):
+        warnings.simplefilter('ignore')
+        results = run_site(site_name, start_month, end_month,
+                           [METRICS[m] for m in metrics], data_path, output_path,
+                           force=force, incremental=incremental)
+    return site_name, results, time.perf_counter() - start, log.getvalue()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m simulation',
+        description='Run the generation / price / revenue simulations for many sites in parallel.'
+    )
+    parser.add_argument('--sites', nargs='+', metavar='SITE',
+                        help='site names to simulate (default: every combined file in the data path)')
+    parser.add_argument('--metrics', nargs='+', choices=list(METRICS), default=list(METRICS),
+                        help='metrics to simulate (default: all)')
+    parser.add_argument('--start-month', type=int, choices=range(1, 13), metavar='1-12',
+                        help='first month of the window (default: current month)')
+    parser.add_argument('--end-month', type=int, choices=range(1, 13), metavar='1-12',
+                        help='last month of the window, may wrap the year (default: month before start)')
+    parser.add_argument('--workers', type=int, default=available_cores(),
+                        help='worker processes (default: available cores)')
+    parser.add_argument('--data-path', default=str(DATA_PATH),
+                        help='folder with *_generation_price_combined.csv files')
+    parser.add_argument('--output-path', default=str(OUTPUT_PATH),
+                        help='portfolio output folder')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild even when inputs and parameters are unchanged')
+    parser.add_argument('--incremental', action='store_true',
+                        help='update from rows appended since the last build where supported')
+    parser.add_argument('--verbose', action='store_true',
+                        help='stream the full simulation log of every site')
+    return parser.parse_args(argv)
+
+
+def resolve_month_window(start_month, end_month):
+    """Fill in the automatic 12-month window for any month left unset"""
+    if start_month is None:
+        start_month = automatic_month_range()[0]
+    if end_month is None:
+        end_month = 12 if start_month == 1 else start_month - 1
+    return start_month, end_month
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    site_file_map = discover_sites(Path(args.data_path))
+    sites = args.sites or list(site_file_map)
+    if not sites:
+        print(f"❌ No combined generation-price files found in {args.data_path}!")
+        return 1
+
+    start_month, end_month = resolve_month_window(args.start_month, args.end_month)
+    workers = max(1, min(args.workers, len(sites)))
+
+    print(f"🚀 Simulating {len(sites)} site(s) × {len(args.metrics)} metric(s): {', '.join(args.metrics)}")
+    print(f"   Month window: {MONTH_NAMES[start_month]} to {MONTH_NAMES[end_month]}")
+    print(f"   Worker processes: {workers}")
+
+    wall_start = time.perf_counter()
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate_site, site, args.metrics, start_month, end_month,
+                               args.data_path, args.output_path, args.force, args.incremental, args.verbose)
+                   for site in sites]
+
+        for future in as_completed(futures):
+            site_name, results, elapsed, log = future.result()
+            failures = [metric for metric, status in results.items() if status == FAILED]
+            skipped = [metric for metric, status in results.items() if status == SKIPPED]
+            icon = '❌' if failures else '⏭️ ' if len(skipped) == len(results) else '✅'
+            note = f"  ({len(skipped)} unchanged, skipped)" if skipped else ''
+            print(f"{icon} {site_name:<40} {elapsed:7.2f}s{note}")
+            if failures:
+                failed.append(site_name)
+                print(f"   Failed metrics: {', '.join(failures)}")
+                # The simulations print the reason just before giving up
+                for line in log.strip().splitlines()[-5:]:
+                    print(f"   | {line}")
+
+    print(f"\n✨ Done in {time.perf_counter() - wall_start:.2f}s "
+          f"({len(sites) - len(failed)} succeeded, {len(failed)} failed)")
+    print(f"📁 Files saved in: {args.output_path}/[site_name]/")
+    return 1 if failed else 0
@@ -0,0 +1,78 @@
+"""
+Typed columnar storage for simulation outputs.
+
+Wide year-as-column tables are written as Parquet next to their CSV export,
+using compact dtypes: float32 year columns, int8 calendar columns, int16
+slot keys and dictionary-encoded label columns.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from simulation.time_keys import DAY_KEY, HOUR_KEY, KEY_DTYPE
+
+try:
+    import pyarrow  # noqa: F401
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
+COLUMNAR_SUFFIX = '.parquet'
+
+# Columns stored as int8 / int16 / dictionary-encoded strings
+CALENDAR_COLUMNS = ['month', 'day', 'hour']
+KEY_COLUMNS = [HOUR_KEY, DAY_KEY]
+# datetime_label / date_label only appear in files written before the slot keys
+LABEL_COLUMNS = ['datetime_label', 'date_label', 'month_name']
+
+
+def is_year_column(col):
+    """Year columns are named by the year itself (int in memory, str on disk)"""
+    return isinstance(col, (int, np.integer)) or str(col).isdigit()
+
+
+def columnar_path(file_path):
+    """Path of the columnar file that sits next to a CSV export"""
+    return Path(file_path).with_suffix(COLUMNAR_SUFFIX)
+
+
+def to_columnar_frame(df, decimals=None):
+    """
+    Cast a wide timeseries frame to its compact on-disk dtypes
+    """
+    typed = {}
+    for col in df.columns:
+        name = str(col)
+        values = df[col]
+        if is_year_column(col):
+            values = pd.to_numeric(values, errors='coerce')
+            if decimals is not None:
+                values = values.round(decimals)
+            typed[name] = values.astype(np.float32)
+        elif name in CALENDAR_COLUMNS:
+            typed[name] = values.astype(np.int8)
+        elif name in KEY_COLUMNS:
+            typed[name] = values.astype(KEY_DTYPE)
+        elif name in LABEL_COLUMNS:
+            typed[name] = values.astype('category')
+        else:
+            typed[name] = values
+    return pd.DataFrame(typed)
+
+
+def write_columnar(df, csv_path, decimals=None):
+    """
+    Write the columnar copy of a table next to its CSV export.
+    Returns the written path, or None when no Parquet engine is installed.
+    """
+    if not COLUMNAR_AVAILABLE:
+        return None
+    output_path = columnar_path(csv_path)
+    to_columnar_frame(df, decimals).to_parquet(output_path, index=False, compression='zstd')
+    return output_path
+
+
+def read_columnar(file_path):
+    """Read a columnar table written by write_columnar"""
+    return pd.read_parquet(file_path)
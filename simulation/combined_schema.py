@@ -0,0 +1,126 @@
+"""
+Schema of the combined hourly files in resurety_data.
+
+Every {site}_generation_price_combined.csv holds one row per hour:
+
+    datetime       timestamp of the hour, 'YYYY-MM-DD HH:MM:SS'
+    year           calendar year of the timestamp
+    month          1-12
+    hour           0-23, hour beginning
+    generation_mw  generation in the hour
+    price          real-time price
+    price_da       day-ahead price
+    revenue        real-time revenue of the hour
+
+read_combined parses a file against COMBINED_SCHEMA: only the calendar
+columns and the value columns asked for are read, each straight into its
+declared dtype, the datetime column goes through the ISO 8601 fast path and
+the day column is derived from it. Missing columns, cells that do not parse
+and calendar values out of range raise CombinedSchemaError naming the file,
+the column and the first offending row, before any statistics are computed.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Column -> dtype it is read into. The value columns stay float64 so the
+# statistics are computed from exactly the values in the file.
+COMBINED_SCHEMA = {
+    'datetime': 'datetime64',
+    'year': np.int16,
+    'month': np.int8,
+    'hour': np.int8,
+    'generation_mw': np.float64,
+    'price': np.float64,
+    'price_da': np.float64,
+    'revenue': np.float64,
+}
+# Read for every metric: the timestamp and the calendar columns
+CALENDAR_COLUMNS = ['datetime', 'year', 'month', 'hour']
+VALUE_COLUMNS = ['generation_mw', 'price', 'price_da', 'revenue']
+DAY_DTYPE = np.int8
+
+# Valid range of the calendar columns (inclusive)
+CALENDAR_RANGES = {
+    'year': (1900, 2100),
+    'month': (1, 12),
+    'hour': (0, 23),
+}
+
+
+class CombinedSchemaError(ValueError):
+    """A combined hourly file does not match COMBINED_SCHEMA"""
+
+
+def _source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return Path(source).name
+    return 'combined file'
+
+
+def _first_bad_row(mask):
+    """1-based data row of the first True in mask"""
+    return int(np.flatnonzero(mask)[0]) + 1
+
+
+def read_combined(source, value_columns=None):
+    """
+    Typed frame of a combined hourly file (a path or a binary buffer) with the
+    calendar columns, a derived day column and the value columns given
+    (default: every value column in the file)
+    """
+    name = _source_name(source)
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    if value_columns is None:
+        value_columns = [col for col in VALUE_COLUMNS if col in header]
+    columns = CALENDAR_COLUMNS + [col for col in value_columns if col not in CALENDAR_COLUMNS]
+    missing = [col for col in columns if col not in header]
+    if missing:
+        raise CombinedSchemaError(f"{name}: missing column(s) {', '.join(missing)}")
+
+    numeric = {col: COMBINED_SCHEMA[col] for col in columns if col != 'datetime'}
+    # Calendar columns are parsed as int64 and narrowed after the range check,
+    # so an out-of-range value is reported rather than wrapped around
+    parse_dtypes = {col: np.int64 if col in CALENDAR_RANGES else dtype for col, dtype in numeric.items()}
+    try:
+        df = pd.read_csv(source, usecols=columns, dtype={**parse_dtypes, 'datetime': str})
+    except (TypeError, ValueError, OverflowError):
+        # Locate the offending cell for the report
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        df = pd.read_csv(source, usecols=columns, dtype=str)
+        for col, dtype in numeric.items():
+            parsed = pd.to_numeric(df[col], errors='coerce')
+            if np.issubdtype(dtype, np.integer):
+                bad = (parsed.isna() | (parsed % 1 != 0)).to_numpy()
+            else:
+                bad = (parsed.isna() & df[col].notna()).to_numpy()
+            if bad.any():
+                row = _first_bad_row(bad)
+                value = df[col].iloc[row - 1]
+                found = 'empty' if pd.isna(value) else repr(value)
+                raise CombinedSchemaError(f"{name}: column '{col}' row {row} is {found}, expected {np.dtype(dtype).name}")
+        raise
+    df = df[columns]
+
+    df['datetime'] = pd.to_datetime(df['datetime'], format='ISO8601', errors='coerce')
+    if df['datetime'].isna().any():
+        row = _first_bad_row(df['datetime'].isna().to_numpy())
+        raise CombinedSchemaError(f"{name}: column 'datetime' row {row} is not a timestamp")
+
+    for col, (low, high) in CALENDAR_RANGES.items():
+        outside = ~df[col].between(low, high).to_numpy()
+        if outside.any():
+            row = _first_bad_row(outside)
+            raise CombinedSchemaError(
+                f"{name}: column '{col}' row {row} is {df[col].iloc[row - 1]}, expected {low}-{high}")
+        df[col] = df[col].astype(COMBINED_SCHEMA[col])
+
+    # Day of month from the timestamp
+    df['day'] = df['datetime'].dt.day.astype(DAY_DTYPE)
+    return df
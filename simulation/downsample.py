@@ -0,0 +1,50 @@
+"""
+Downsampling of long chart series for the dashboard's interactive charts.
+
+lttb_indices picks the points a Largest-Triangle-Three-Buckets reduction
+keeps: the first and last points, plus, in each of n_out - 2 equal buckets in
+between, the point forming the largest triangle with the point kept in the
+previous bucket and the average of the next bucket. Peaks and troughs survive
+the reduction, so a few hundred points draw the same shape as thousands.
+"""
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Positions of the points kept when reducing the (x, y) series to n_out
+    points. Series of at most n_out points (or n_out < 3) are kept whole.
+    NaN values are never selected.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    n = len(valid)
+    if n <= n_out or n_out < 3:
+        return valid
+
+    x = x[valid]
+    y = y[valid]
+    # n_out - 2 buckets between the first and the last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            next_x = x[next_start:next_end].mean()
+            next_y = y[next_start:next_end].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        # Twice the triangle areas; the factor does not change the argmax
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+
+    return valid[kept]
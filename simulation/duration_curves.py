@@ -0,0 +1,94 @@
+"""
+Precomputed price duration curves.
+
+A month's duration curve is every hourly price of that month across all
+years, sorted from highest to lowest. The price simulation builds a
+DurationIndex from its compressed hourly timeseries once and saves it as
+{site}_price_duration_index.npz. For each month the file holds the sorted
+float32 curve, the P1-P99 marker values and the mean, so switching months in
+the dashboard only slices an array.
+"""
+import numpy as np
+
+from simulation.columnar import is_year_column
+
+DURATION_INDEX_SUFFIX = '_duration_index.npz'
+MARKER_PERCENTILES = np.arange(1, 100)
+
+
+def duration_index_file_name(site_name, metric='price'):
+    return f"{site_name}_{metric}{DURATION_INDEX_SUFFIX}"
+
+
+def marker_positions(n_values, percentiles=MARKER_PERCENTILES):
+    """
+    Position on a descending curve of n_values points at which each
+    percentile is marked (P99 near the start, P1 near the end)
+    """
+    positions = ((100 - np.asarray(percentiles, dtype=float)) / 100 * n_values).astype(int)
+    return np.minimum(positions, n_values - 1)
+
+
+class DurationIndex:
+    """
+    Sorted (descending) float32 price curve, P1-P99 markers and mean of every month
+    """
+
+    def __init__(self, months, offsets, values, markers, means):
+        self.months = np.asarray(months, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.markers = np.asarray(markers, dtype=np.float32)
+        self.means = np.asarray(means, dtype=float)
+
+    @classmethod
+    def from_timeseries(cls, df, decimals=None):
+        """
+        Index of an hourly timeseries with a month column and one column per year.
+        decimals rounds like the saved timeseries so the curves match the files.
+        """
+        year_cols = [col for col in df.columns if is_year_column(col)]
+        matrix = df[year_cols].to_numpy(dtype=float)
+        if decimals is not None:
+            matrix = matrix.round(decimals)
+        matrix = matrix.astype(np.float32)
+        month_col = df['month'].to_numpy()
+
+        months, curves, markers, means = [], [], [], []
+        for month in range(1, 13):
+            month_values = matrix[month_col == month].ravel()
+            month_values = month_values[~np.isnan(month_values)]
+            if not len(month_values):
+                continue
+            curve = np.sort(month_values)[::-1]
+            months.append(month)
+            curves.append(curve)
+            markers.append(curve[marker_positions(len(curve))])
+            means.append(np.mean(month_values, dtype=float))
+
+        offsets = np.concatenate(([0], np.cumsum([len(curve) for curve in curves]))).astype(np.int64)
+        values = np.concatenate(curves) if curves else np.empty(0, dtype=np.float32)
+        markers = np.array(markers, dtype=np.float32).reshape(len(months), len(MARKER_PERCENTILES))
+        return cls(months, offsets, values, markers, means)
+
+    def curve(self, month):
+        """
+        (sorted curve, {percentile: marker value}, mean) of a month, or None
+        when the month has no prices
+        """
+        position = np.flatnonzero(self.months == month)
+        if not len(position):
+            return None
+        i = position[0]
+        values = self.values[self.offsets[i]:self.offsets[i + 1]]
+        markers = {int(p): float(value) for p, value in zip(MARKER_PERCENTILES, self.markers[i])}
+        return values, markers, float(self.means[i])
+
+    def save(self, path):
+        np.savez(path, months=self.months, offsets=self.offsets, values=self.values,
+                 markers=self.markers, means=self.means)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['months'], data['offsets'], data['values'], data['markers'], data['means'])
@@ -0,0 +1,489 @@
+"""
+Append-only incremental updates of the simulation statistics.
+
+New hours are appended to the end of a *_generation_price_combined.csv. An
+IncrementalState keeps, for every hourly (month, day, hour), daily
+(month, day) and monthly (month) slot:
+
+- running sufficient statistics (rows, count, mean, M2, min, max), merged
+  with Chan's parallel formula;
+- a mergeable quantile sketch (SlotSketch) for the percentiles;
+- the slot x year cells behind the year-as-column timeseries.
+
+While a slot has at most SKETCH_CAPACITY values and no NaN, its sketch holds
+every value in file order, and mean, std and percentiles are computed from
+those values exactly as a full build computes them, bit for bit. Beyond that
+mean and std come from the running moments, which can differ from a full
+build in the last bits and so, rarely, in the last written decimal. min and
+max are always exact.
+
+It also remembers how far into the combined file it has read and a hash of
+those bytes. An update checks that hash (reading bytes, not parsing rows),
+parses only what was appended since, folds the rows of complete calendar
+months into the state and leaves a trailing partial month out of it until
+the month is complete, since its daily and monthly totals are still growing.
+The outputs of an update still cover that month: its rows are folded into a
+copy of the state that is used for the outputs and never saved.
+"""
+import calendar
+import hashlib
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+SKETCH_CAPACITY = 128
+HASH_CHUNK_SIZE = 1024 * 1024
+STATE_VERSION = 1
+
+LEVELS = ('hourly', 'daily', 'monthly')
+LEVEL_SLOTS = {'hourly': 12 * 31 * 24, 'daily': 12 * 31, 'monthly': 12}
+
+
+def slot_index(level, frame):
+    """Dense slot number of every row: month, day and hour packed into one integer"""
+    month_slot = frame['month'].to_numpy(dtype=np.int64) - 1
+    if level == 'monthly':
+        return month_slot
+    day_slot = month_slot * 31 + frame['day'].to_numpy(dtype=np.int64) - 1
+    if level == 'daily':
+        return day_slot
+    return day_slot * 24 + frame['hour'].to_numpy(dtype=np.int64)
+
+
+def slot_keys(level, slots):
+    """Inverse of slot_index: {key column: values} for an array of slot numbers"""
+    slots = np.asarray(slots, dtype=np.int64)
+    if level == 'hourly':
+        day_slot, hour = np.divmod(slots, 24)
+    else:
+        day_slot, hour = slots, None
+    if level == 'monthly':
+        month_slot, day = day_slot, None
+    else:
+        month_slot, day = np.divmod(day_slot, 31)
+
+    keys = {'month': month_slot + 1}
+    if day is not None:
+        keys['day'] = day + 1
+    if hour is not None:
+        keys['hour'] = hour
+    return keys
+
+
+def _group_by_slot(slot_ids, values):
+    """slot_ids and values sorted by slot, keeping the original order inside each slot"""
+    order = np.argsort(slot_ids, kind='stable')
+    return slot_ids[order], values[order]
+
+
+def _compact(values, times, level):
+    """Halve a sorted sample `times` times, alternating which half is kept"""
+    values = np.sort(values)
+    for i in range(times):
+        values = values[(level + i) % 2::2]
+    return values
+
+
+class SlotSketch:
+    """
+    Mergeable quantile sketch for every slot.
+
+    Each slot holds up to `capacity` equally weighted samples. Until a slot has
+    seen more than `capacity` values the samples are the values themselves, so
+    its percentiles are exact (identical to np.percentile). Beyond that the slot
+    compacts: sort, keep every other sample and double their weight. Merging
+    brings both sides to the same weight first, so sketches built from separate
+    batches merge into one that answers for the union.
+    """
+
+    def __init__(self, n_slots, capacity=SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.samples = np.full((n_slots, capacity), np.nan)
+        self.sizes = np.zeros(n_slots, dtype=np.int64)
+        # Every sample of a slot stands for 2**level values
+        self.levels = np.zeros(n_slots, dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, n_slots, slot_ids, values, capacity=SKETCH_CAPACITY):
+        """Sketch of a batch of values (NaN ignored)"""
+        sketch = cls(n_slots, capacity)
+        keep = ~np.isnan(values)
+        slot_ids, values = _group_by_slot(slot_ids[keep], values[keep])
+        counts = np.bincount(slot_ids, minlength=n_slots)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.arange(len(slot_ids)) - starts[slot_ids]
+
+        fits = counts[slot_ids] <= capacity
+        sketch.samples[slot_ids[fits], rank[fits]] = values[fits]
+        sketch.sizes = np.where(counts <= capacity, counts, 0)
+
+        for slot in np.flatnonzero(counts > capacity):
+            slot_values = values[starts[slot]:starts[slot] + counts[slot]]
+            sketch._set_slot(slot, slot_values, 0)
+        return sketch
+
+    def _set_slot(self, slot, values, level):
+        """Store values of weight 2**level in a slot, compacting until they fit"""
+        values = np.sort(values)
+        while len(values) > self.capacity:
+            values = values[level % 2::2]
+            level += 1
+        self.samples[slot] = np.nan
+        self.samples[slot, :len(values)] = values
+        self.sizes[slot] = len(values)
+        self.levels[slot] = level
+
+    def merge(self, other):
+        """Fold another sketch over the same slots into this one"""
+        incoming = other.sizes > 0
+        fits = incoming & (self.levels == 0) & (other.levels == 0) & (self.sizes + other.sizes <= self.capacity)
+
+        # Common case: both sides still exact and the union fits, a plain copy
+        rows, cols = np.nonzero(fits[:, None] & (np.arange(other.capacity) < other.sizes[:, None]))
+        self.samples[rows, self.sizes[rows] + cols] = other.samples[rows, cols]
+        self.sizes[fits] += other.sizes[fits]
+
+        for slot in np.flatnonzero(incoming & ~fits):
+            level = max(self.levels[slot], other.levels[slot])
+            own = _compact(self.samples[slot, :self.sizes[slot]], level - self.levels[slot], self.levels[slot])
+            new = _compact(other.samples[slot, :other.sizes[slot]], level - other.levels[slot], other.levels[slot])
+            self._set_slot(slot, np.concatenate((own, new)), level)
+
+    def percentiles(self, percentiles, slots=None):
+        """Percentiles of every slot (or of `slots`), shape (n, len(percentiles))"""
+        slots = np.arange(len(self.sizes)) if slots is None else np.asarray(slots)
+        result = np.full((len(slots), len(percentiles)), np.nan)
+        sizes = self.sizes[slots]
+        for size in np.unique(sizes[sizes > 0]):
+            rows = np.flatnonzero(sizes == size)
+            result[rows] = np.percentile(self.samples[slots[rows], :size], percentiles, axis=1).T
+        return result
+
+
+class RunningSlotStats:
+    """
+    Running sufficient statistics of every slot plus its quantile sketch.
+    rows counts every row seen (NaN included), count only the non-NaN values.
+    """
+
+    def __init__(self, n_slots, capacity=SKETCH_CAPACITY):
+        self.rows = np.zeros(n_slots, dtype=np.int64)
+        self.count = np.zeros(n_slots, dtype=np.int64)
+        self.mean = np.zeros(n_slots)
+        self.m2 = np.zeros(n_slots)
+        self.min = np.full(n_slots, np.inf)
+        self.max = np.full(n_slots, -np.inf)
+        self.sketch = SlotSketch(n_slots, capacity)
+
+    @classmethod
+    def from_values(cls, n_slots, slot_ids, values, capacity=SKETCH_CAPACITY):
+        """Statistics of a batch of values"""
+        stats = cls(n_slots, capacity)
+        valid = ~np.isnan(values)
+        stats.rows = np.bincount(slot_ids, minlength=n_slots)
+        stats.count = np.bincount(slot_ids[valid], minlength=n_slots)
+
+        total = np.bincount(slot_ids[valid], weights=values[valid], minlength=n_slots)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats.mean = np.where(stats.count > 0, total / stats.count, 0.0)
+        deviation = values[valid] - stats.mean[slot_ids[valid]]
+        stats.m2 = np.bincount(slot_ids[valid], weights=deviation ** 2, minlength=n_slots)
+
+        np.minimum.at(stats.min, slot_ids[valid], values[valid])
+        np.maximum.at(stats.max, slot_ids[valid], values[valid])
+        stats.sketch = SlotSketch.from_values(n_slots, slot_ids, values, capacity)
+        return stats
+
+    def merge(self, other):
+        """Fold another set of statistics over the same slots into this one"""
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(count > 0, other.count / count, 0.0)
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * share
+        self.count = count
+        self.rows = self.rows + other.rows
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def describe(self, slots, percentiles, ddof):
+        """count / mean / std_dev / min / max / p{p} of the given slots"""
+        slots = np.asarray(slots)
+        count = self.count[slots]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.where(count - ddof > 0, self.m2[slots] / (count - ddof), np.nan)
+        empty = count == 0
+        mean = np.where(empty, np.nan, self.mean[slots])
+        std = np.sqrt(variance)
+
+        # Slots whose sketch still holds every value: the same per-row
+        # reductions as slot_statistics, so the result matches a full build
+        sketch = self.sketch
+        exact = ((sketch.levels[slots] == 0) & (sketch.sizes[slots] == count)
+                 & (self.rows[slots] == count) & (count > ddof))
+        for size in np.unique(count[exact]):
+            rows = np.flatnonzero(exact & (count == size))
+            matrix = sketch.samples[slots[rows], :size]
+            mean[rows] = np.mean(matrix, axis=1)
+            std[rows] = np.std(matrix, axis=1, ddof=ddof)
+
+        result = {
+            'count': self.rows[slots],
+            'mean': mean,
+            'std_dev': std,
+            'min': np.where(empty, np.nan, self.min[slots]),
+            'max': np.where(empty, np.nan, self.max[slots]),
+        }
+        pct = self.sketch.percentiles(percentiles, slots)
+        for i, p in enumerate(percentiles):
+            result[f'p{p}'] = pct[:, i]
+        return result
+
+
+class YearCells:
+    """
+    Slot x year cells behind the year-as-column timeseries: the mean of the
+    values that fell into each cell
+    """
+
+    def __init__(self, n_slots, years=()):
+        self.years = np.asarray(years, dtype=np.int64)
+        self.rows = np.zeros((n_slots, len(self.years)), dtype=np.int64)
+        self.count = np.zeros((n_slots, len(self.years)), dtype=np.int64)
+        self.total = np.zeros((n_slots, len(self.years)))
+
+    def _add_years(self, years):
+        new_years = np.setdiff1d(years, self.years)
+        if not len(new_years):
+            return
+        all_years = np.union1d(self.years, new_years)
+        position = np.searchsorted(all_years, self.years)
+        for name in ('rows', 'count', 'total'):
+            old = getattr(self, name)
+            grown = np.zeros((old.shape[0], len(all_years)), dtype=old.dtype)
+            grown[:, position] = old
+            setattr(self, name, grown)
+        self.years = all_years
+
+    def fold(self, slot_ids, years, values):
+        self._add_years(np.unique(years))
+        cols = np.searchsorted(self.years, years)
+        valid = ~np.isnan(values)
+        np.add.at(self.rows, (slot_ids, cols), 1)
+        np.add.at(self.count, (slot_ids[valid], cols[valid]), 1)
+        np.add.at(self.total, (slot_ids[valid], cols[valid]), values[valid])
+
+    def long_frame(self, level, slots):
+        """One row per filled cell of the given slots: key columns, year, value"""
+        slot_rows, year_cols = np.nonzero(self.rows[slots] > 0)
+        cell_slots = np.asarray(slots)[slot_rows]
+        count = self.count[cell_slots, year_cols]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            value = np.where(count > 0, self.total[cell_slots, year_cols] / count, np.nan)
+
+        frame = {key: values.astype(int) for key, values in slot_keys(level, cell_slots).items()}
+        frame['year'] = self.years[year_cols].astype(int)
+        frame['value'] = value
+        return pd.DataFrame(frame)
+
+
+def row_end_offsets(buffer):
+    """Byte offset just past every line of a CSV buffer (the header included)"""
+    ends = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8) == ord('\n')) + 1
+    if len(buffer) and not buffer.endswith(b'\n'):
+        ends = np.append(ends, len(buffer))
+    return ends
+
+
+def complete_month_rows(df):
+    """
+    Number of leading rows that belong to complete calendar months, or None
+    when the rows are not in time order. The last month counts as complete
+    once its final hour is present.
+    """
+    if df.empty:
+        return 0
+    year, month = int(df['year'].iloc[-1]), int(df['month'].iloc[-1])
+    if (int(df['day'].iloc[-1]) == calendar.monthrange(year, month)[1]
+            and int(df['hour'].iloc[-1]) == 23):
+        return len(df)
+
+    in_last_month = ((df['year'] == year) & (df['month'] == month)).to_numpy()
+    cut = len(df) - int(in_last_month.sum())
+    if in_last_month[:cut].any():
+        return None
+    return cut
+
+
+class IncrementalState:
+    """
+    Per-site, per-metric state for append-only updates: running statistics
+    and year cells of every level plus the read position in the combined file.
+    """
+
+    def __init__(self, capacity=SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.stats = {level: RunningSlotStats(LEVEL_SLOTS[level], capacity) for level in LEVELS}
+        self.cells = {level: YearCells(LEVEL_SLOTS[level]) for level in LEVELS}
+        # Read position: bytes of the combined file folded so far
+        self.header = b''
+        self.offset = 0
+        self.prefix_sha256 = hashlib.sha256().hexdigest()
+
+    def fold(self, level_frames):
+        """
+        Fold new values into the state. level_frames maps each level to a frame
+        with year, the level's key columns and value.
+        """
+        for level, frame in level_frames.items():
+            slot_ids = slot_index(level, frame)
+            values = frame['value'].to_numpy(dtype=float)
+            self.stats[level].merge(RunningSlotStats.from_values(LEVEL_SLOTS[level], slot_ids, values, self.capacity))
+            self.cells[level].fold(slot_ids, frame['year'].to_numpy(dtype=np.int64), values)
+
+    def slots_for_months(self, level, months):
+        """Slots of the given months that have seen any rows"""
+        slots = np.flatnonzero(self.stats[level].rows > 0)
+        return slots[np.isin(slot_keys(level, slots)['month'], list(months))]
+
+    def statistics(self, level, months, percentiles, ddof=0, min_count=5):
+        """
+        Slot statistics of the given months, in the layout of slot_statistics:
+        key columns, count, mean, std_dev, min, max and p{p}
+        """
+        slots = self.slots_for_months(level, months)
+        slots = slots[self.stats[level].rows[slots] >= min_count]
+        result = {key: values.astype(int) for key, values in slot_keys(level, slots).items()}
+        result.update(self.stats[level].describe(slots, list(percentiles), ddof))
+        return pd.DataFrame(result)
+
+    def timeseries_cells(self, level, months):
+        """Year cells of the given months as a long frame (key columns, year, value)"""
+        return self.cells[level].long_frame(level, self.slots_for_months(level, months))
+
+    # ------------------------------------------------------------------
+    # Read position in the combined file
+    # ------------------------------------------------------------------
+
+    def read_appended(self, file_path, load_frame):
+        """
+        Rows appended to the combined file since the last fold, parsed with
+        load_frame. Returns (frame of the complete-month rows, offset past
+        them, SHA-256 of the file up to that offset, frame of the trailing
+        partial month's rows) or None when the file is not an append-only
+        extension of what was read.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            header = f.readline()
+            if header != self.header:
+                return None
+            f.seek(0)
+            remaining = self.offset
+            while remaining > 0:
+                chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return None
+                digest.update(chunk)
+                remaining -= len(chunk)
+            if digest.hexdigest() != self.prefix_sha256:
+                return None
+            appended = f.read()
+
+        ends = row_end_offsets(appended)
+        frame = load_frame(io.BytesIO(header + appended))
+        if len(ends) != len(frame):
+            return None
+        cut = complete_month_rows(frame)
+        if cut is None:
+            return None
+
+        folded_bytes = int(ends[cut - 1]) if cut else 0
+        digest.update(appended[:folded_bytes])
+        return frame.iloc[:cut], self.offset + folded_bytes, digest.hexdigest(), frame.iloc[cut:]
+
+    @classmethod
+    def from_frame(cls, df, file_path, level_frames_for, capacity=SKETCH_CAPACITY):
+        """
+        State of a fully loaded combined file: folds its complete months.
+        Returns None when the file layout does not allow append-only updates.
+        """
+        with open(file_path, 'rb') as f:
+            buffer = f.read()
+        ends = row_end_offsets(buffer)
+        cut = complete_month_rows(df)
+        if len(ends) != len(df) + 1 or cut is None or not df['hour'].between(0, 23).all():
+            return None
+
+        state = cls(capacity)
+        state.header = buffer[:ends[0]]
+        if cut:
+            state.fold(level_frames_for(df.iloc[:cut]))
+        state.offset = int(ends[cut])
+        state.prefix_sha256 = hashlib.sha256(buffer[:state.offset]).hexdigest()
+        return state
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        arrays = {}
+        for level in LEVELS:
+            stats, cells = self.stats[level], self.cells[level]
+            for name in ('rows', 'count', 'mean', 'm2', 'min', 'max'):
+                arrays[f'{level}.{name}'] = getattr(stats, name)
+            width = max(int(stats.sketch.sizes.max()), 1)
+            arrays[f'{level}.samples'] = stats.sketch.samples[:, :width]
+            arrays[f'{level}.sizes'] = stats.sketch.sizes
+            arrays[f'{level}.levels'] = stats.sketch.levels
+            for name in ('years', 'rows', 'count', 'total'):
+                arrays[f'{level}.cells.{name}'] = getattr(cells, name)
+
+        meta = {
+            'version': STATE_VERSION,
+            'capacity': self.capacity,
+            'header': self.header.decode('utf-8'),
+            'offset': self.offset,
+            'prefix_sha256': self.prefix_sha256,
+        }
+        arrays['meta'] = np.array(json.dumps(meta))
+
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """Saved state, or None when missing, unreadable or from another version"""
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != STATE_VERSION:
+                    return None
+                state = cls(meta['capacity'])
+                state.header = meta['header'].encode('utf-8')
+                state.offset = meta['offset']
+                state.prefix_sha256 = meta['prefix_sha256']
+
+                for level in LEVELS:
+                    stats, cells = state.stats[level], state.cells[level]
+                    for name in ('rows', 'count', 'mean', 'm2', 'min', 'max'):
+                        setattr(stats, name, data[f'{level}.{name}'])
+                    samples = data[f'{level}.samples']
+                    stats.sketch.samples[:, :samples.shape[1]] = samples
+                    stats.sketch.sizes = data[f'{level}.sizes']
+                    stats.sketch.levels = data[f'{level}.levels']
+                    for name in ('years', 'rows', 'count', 'total'):
+                        setattr(cells, name, data[f'{level}.cells.{name}'])
+            return state
+        except (OSError, KeyError, ValueError):
+            # A broken state only costs a full rebuild
+            return None
@@ -0,0 +1,142 @@
+"""
+Build manifest for incremental re-simulation.
+
+Every site folder gets a simulation_manifest.json recording, per metric, the
+content hash of the combined input file, the simulation parameters, a hash of
+the simulation code and the output files produced. A metric is up to date
+when all of these still match and every recorded output still exists, so a
+rerun can skip it.
+
+JsonManifest holds the bookkeeping shared with the plot export's
+plot_manifest.json (visualization/export.py): one JSON file of entries keyed
+by what they build, each with its input hash, parameters, code hash and outputs.
+"""
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_NAME = 'simulation_manifest.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_package_hashes = {}
+
+
+def file_hash(file_path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_parameters(parameters):
+    """Parameters as they read back from JSON (str keys, lists), for comparison"""
+    return json.loads(json.dumps(parameters, sort_keys=True))
+
+
+def package_hash(package_dir):
+    """
+    Hash of the names and contents of every .py file under a package folder,
+    computed once per process
+    """
+    package_dir = Path(package_dir)
+    key = str(package_dir.resolve())
+    if key not in _package_hashes:
+        digest = hashlib.sha256()
+        for source in sorted(package_dir.rglob('*.py')):
+            digest.update(source.relative_to(package_dir).as_posix().encode())
+            digest.update(source.read_bytes())
+        _package_hashes[key] = digest.hexdigest()
+    return _package_hashes[key]
+
+
+def code_hash():
+    """
+    Hash of the simulation package source, so code changes invalidate outputs
+    """
+    return package_hash(Path(__file__).parent)
+
+
+class JsonManifest:
+    """
+    Entries of one folder's manifest file, keyed by what they build.
+    Subclasses set the class attributes below.
+    """
+
+    # File name inside the folder
+    file_name = None
+    # Top-level key the entries are stored under
+    section = None
+    # Package whose source hash is recorded, so code changes invalidate entries
+    package_dir = Path(__file__).parent
+    # Entry field holding the time of the build
+    timestamp_field = 'built_at'
+    # Whether an entry without outputs counts as current
+    allow_no_outputs = True
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.path = self.folder / self.file_name
+        self.entries = self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f).get(self.section, {})
+        except (OSError, ValueError):
+            # A corrupt manifest only costs a rebuild
+            return {}
+
+    def code_hash(self):
+        return package_hash(self.package_dir)
+
+    def is_current(self, key, input_hash, parameters):
+        """True when the entry was built from this input with these parameters"""
+        entry = self.entries.get(key)
+        if not entry or not (entry.get('outputs') or self.allow_no_outputs):
+            return False
+        if (entry.get('input_sha256') != input_hash
+                or entry.get('parameters') != normalize_parameters(parameters)
+                or entry.get('code_sha256') != self.code_hash()):
+            return False
+        return all((self.folder / output).exists() for output in entry.get('outputs', []))
+
+    def record_entry(self, key, input_hash, parameters, outputs, **fields):
+        """Record a successful build (plus any extra fields) and save the manifest"""
+        self.entries[key] = {
+            **fields,
+            'input_sha256': input_hash,
+            'parameters': normalize_parameters(parameters),
+            'code_sha256': self.code_hash(),
+            'outputs': sorted(Path(output).relative_to(self.folder).as_posix() for output in outputs),
+            self.timestamp_field: datetime.now().isoformat(timespec='seconds'),
+        }
+        self.save()
+
+    def save(self):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({self.section: self.entries}, f, indent=2, sort_keys=True)
+        tmp_path.replace(self.path)
+
+
+class SiteManifest(JsonManifest):
+    """
+    Manifest of one site's simulation outputs
+    """
+
+    file_name = MANIFEST_NAME
+    section = 'metrics'
+
+    def __init__(self, base_output_path, site_name):
+        super().__init__(Path(base_output_path) / site_name)
+        self.site_path = self.folder
+
+    def record(self, metric, input_file, input_hash, parameters, outputs):
+        """Record a successful build of a metric and save the manifest"""
+        self.record_entry(metric, input_hash, parameters, outputs, input_file=str(input_file))
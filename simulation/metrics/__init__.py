@@ -0,0 +1,14 @@
+"""
+Metric plug-ins for the simulation pipeline, keyed by their command-line name.
+"""
+from simulation.metrics.generation import GenerationSimulation
+from simulation.metrics.price import PriceSimulation
+from simulation.metrics.price_da import PriceDayAheadSimulation
+from simulation.metrics.revenue import RevenueSimulation
+
+METRICS = {
+    GenerationSimulation.metric: GenerationSimulation,
+    PriceSimulation.metric: PriceSimulation,
+    PriceDayAheadSimulation.metric: PriceDayAheadSimulation,
+    RevenueSimulation.metric: RevenueSimulation,
+}
@@ -0,0 +1,294 @@
+"""
+Generation simulation: statistical generation profiles from the combined
+resurety data at hourly, daily and monthly levels.
+"""
+import pandas as pd
+
+from simulation.pipeline import SimulationPipeline
+from simulation.slot_stats import slot_statistics
+from simulation.time_keys import (
+    DAY_KEY,
+    HOUR_KEY,
+    date_labels,
+    datetime_labels,
+    day_of_year,
+    hour_of_year,
+)
+
+
+class GenerationSimulation(SimulationPipeline):
+    """
+    Create statistical generation profiles from combined resurety data
+    at hourly, daily, and monthly levels
+    """
+
+    metric = 'generation'
+    output_folder = 'Generation'
+    section_label = 'GENERATION'
+    selection_title = 'GENERATION SIMULATION - SITE SELECTION'
+    selection_icon = '📊'
+    run_banner = ("\n🌟 Generation Statistical Simulation", "   (From Resurety Combined Data)")
+    output_descriptions = ("Hourly/Daily/Monthly generation statistics (with year column)",
+                           "Hourly/Daily/Monthly generation timeseries")
+    timeseries_decimals = 3
+    parameter_attributes = ('percentiles',)
+    input_columns = ('generation_mw',)
+    incremental = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Define percentiles to calculate
+        self.percentiles = [1, 5, 10, 15, 25, 50, 75, 85, 90, 95, 99]
+
+    def print_metric_summary(self, df_filtered, months_in_range):
+        print(f"   Months included: {', '.join([self.month_names[m] for m in months_in_range])}")
+
+    def label_statistics(self, results_df, level, month_order_map):
+        """
+        Add the forecast year and slot keys to per-slot statistics and sort
+        them by the custom month order
+        """
+        forecast_years = {month: self.get_forecast_year(month) for month in results_df['month'].unique()}
+        results_df['year'] = results_df['month'].map(forecast_years)
+        if level == 'hourly':
+            results_df[HOUR_KEY] = hour_of_year(results_df['month'], results_df['day'], results_df['hour'])
+            label_cols = [HOUR_KEY, 'year', 'month', 'day', 'hour']
+        elif level == 'daily':
+            results_df[DAY_KEY] = day_of_year(results_df['month'], results_df['day'])
+            label_cols = [DAY_KEY, 'year', 'month', 'day']
+        else:
+            results_df['month_name'] = [self.month_names_full[month] for month in results_df['month']]
+            label_cols = ['month_name', 'year', 'month']
+        results_df['month_order'] = results_df['month'].map(month_order_map)  # Add order for sorting
+
+        # Sort by the custom month order, then day and hour
+        sort_cols = ['month_order'] + [col for col in ('day', 'hour') if col in label_cols]
+        results_df = results_df.sort_values(sort_cols).reset_index(drop=True)
+
+        cols = label_cols + ['mean', 'std_dev', 'count', 'min', 'max'] + [f'p{p}' for p in self.percentiles]
+        return results_df[cols]
+
+    def calculate_hourly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate hourly generation statistics keyed by hour of year
+        """
+        print("\n⚡ Calculating HOURLY generation statistics...")
+
+        # Group by month-day-hour across all years (slots with < 5 data points are skipped)
+        results_df = slot_statistics(
+            df_filtered, ['month', 'day', 'hour'], 'generation_mw', self.percentiles,
+            min_count=5, ddof=1, skipna=True
+        )
+        results_df = self.label_statistics(results_df, 'hourly', month_order_map)
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} hourly slots")
+
+        return results_df
+
+    def calculate_daily_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate daily generation statistics keyed by day of year
+        """
+        print("\n📅 Calculating DAILY generation statistics...")
+
+        # First aggregate hourly to daily for each year
+        df_daily = df_filtered.groupby(['year', 'month', 'day'])['generation_mw'].sum().reset_index()
+        df_daily.rename(columns={'generation_mw': 'daily_generation_mwh'}, inplace=True)
+
+        # Then calculate statistics across years for each day (skipping days with < 5 years)
+        results_df = slot_statistics(
+            df_daily, ['month', 'day'], 'daily_generation_mwh', self.percentiles, min_count=5, ddof=1
+        )
+        results_df = self.label_statistics(results_df, 'daily', month_order_map)
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} daily slots")
+
+        return results_df
+
+    def calculate_monthly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate monthly generation statistics with month names
+        """
+        print("\n📊 Calculating MONTHLY generation statistics...")
+
+        # First aggregate to monthly for each year
+        df_monthly = df_filtered.groupby(['year', 'month'])['generation_mw'].sum().reset_index()
+        df_monthly.rename(columns={'generation_mw': 'monthly_generation_mwh'}, inplace=True)
+
+        # Then calculate statistics across years for each month (skipping months with < 5 years)
+        results_df = slot_statistics(
+            df_monthly, ['month'], 'monthly_generation_mwh', self.percentiles, min_count=5, ddof=1
+        )
+        results_df = self.label_statistics(results_df, 'monthly', month_order_map)
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} months")
+
+        return results_df
+
+    def create_hourly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create hourly generation timeseries with years as columns
+        """
+        print("\n⏰ Creating HOURLY generation timeseries...")
+
+        # Pivot data to have years as columns (all available data - no year skipping)
+        pivot_df = self.pivot_hourly(df_filtered, 'generation_mw', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} hourly slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_daily_timeseries(self, df_filtered, month_order_map):
+        """
+        Create daily generation timeseries with years as columns
+        """
+        print("\n📅 Creating DAILY generation timeseries...")
+
+        # First aggregate to daily
+        df_daily = df_filtered.groupby(['year', 'month', 'day'])['generation_mw'].sum().reset_index()
+        df_daily.rename(columns={'generation_mw': 'daily_generation_mwh'}, inplace=True)
+
+        # Pivot data to have years as columns
+        pivot_df = self.pivot_daily(df_daily, 'daily_generation_mwh', month_order_map, aggfunc='sum')
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} daily slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_monthly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create monthly generation timeseries with years as columns
+        """
+        print("\n📊 Creating MONTHLY generation timeseries...")
+
+        # First aggregate to monthly
+        df_monthly = df_filtered.groupby(['year', 'month'])['generation_mw'].sum().reset_index()
+        df_monthly.rename(columns={'generation_mw': 'monthly_generation_mwh'}, inplace=True)
+
+        # Pivot data to have years as columns
+        pivot_df = self.pivot_monthly(df_monthly, 'monthly_generation_mwh', month_order_map, aggfunc='sum')
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} months")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def incremental_values(self, df):
+        """
+        Hourly generation, daily and monthly totals of complete-month rows
+        """
+        df_daily = df.groupby(['year', 'month', 'day'])['generation_mw'].sum().reset_index()
+        df_monthly = df.groupby(['year', 'month'])['generation_mw'].sum().reset_index()
+        return {
+            'hourly': df[['year', 'month', 'day', 'hour', 'generation_mw']].rename(columns={'generation_mw': 'value'}),
+            'daily': df_daily.rename(columns={'generation_mw': 'value'}),
+            'monthly': df_monthly.rename(columns={'generation_mw': 'value'}),
+        }
+
+    def statistics_from_state(self, state, months_in_range, month_order_map):
+        """
+        Hourly, daily and monthly statistics from the running slot statistics
+        """
+        print("\n⚡ Reading generation statistics from the running slot statistics...")
+        levels = {}
+        for level in ('hourly', 'daily', 'monthly'):
+            results_df = state.statistics(level, months_in_range, self.percentiles, ddof=1, min_count=5)
+            levels[level] = self.label_statistics(results_df, level, month_order_map)
+            print(f"   ✓ {level.capitalize()}: {len(levels[level])} slots")
+        return levels['hourly'], levels['daily'], levels['monthly']
+
+    def timeseries_from_state(self, state, months_in_range, month_order_map):
+        """
+        Hourly, daily and monthly timeseries from the year cells of the state
+        """
+        return {
+            'hourly_timeseries': self.pivot_hourly(
+                state.timeseries_cells('hourly', months_in_range), 'value', month_order_map),
+            'daily_timeseries': self.pivot_daily(
+                state.timeseries_cells('daily', months_in_range), 'value', month_order_map, aggfunc='sum'),
+            'monthly_timeseries': self.pivot_monthly(
+                state.timeseries_cells('monthly', months_in_range), 'value', month_order_map, aggfunc='sum'),
+        }
+
+    def statistics_columns(self):
+        """
+        Columns saved for the hourly, daily and monthly statistics
+        """
+        percentile_cols = [f'p{p}' for p in self.percentiles]
+        return {
+            'hourly': [HOUR_KEY, 'year', 'month', 'day', 'hour', 'mean', 'std_dev'] +
+                      percentile_cols + ['min', 'max', 'count'],
+            'daily': [DAY_KEY, 'year', 'month', 'day', 'mean', 'std_dev'] +
+                     percentile_cols + ['min', 'max', 'count'],
+            'monthly': ['month_name', 'year', 'month', 'mean', 'std_dev'] +
+                       percentile_cols + ['min', 'max', 'count'],
+        }
+
+    def print_sample_results(self, hourly_df, daily_df, monthly_df, timeseries):
+        """
+        Print samples from both statistics and timeseries
+        """
+        hourly_ts = timeseries['hourly_timeseries']
+        daily_ts = timeseries['daily_timeseries']
+
+        print("\n" + "="*60)
+        print("SAMPLE RESULTS")
+        print("="*60)
+
+        # Sample hourly statistics
+        print("\n⚡ HOURLY GENERATION STATISTICS SAMPLE (Mid-month, Noon):")
+        if not hourly_df.empty:
+            mid_month = hourly_df['month'].min()
+            sample = hourly_df[(hourly_df['month'] == mid_month) &
+                              (hourly_df['day'] == 15) &
+                              (hourly_df['hour'] == 12)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+                print(f"   {datetime_labels(row[HOUR_KEY])} (Year: {row['year']}):")
+                print(f"   Mean: {row['mean']:.2f} MW, P10-P90: {row['p10']:.2f}-{row['p90']:.2f} MW")
+
+        # Sample hourly timeseries
+        print("\n⏰ HOURLY GENERATION TIMESERIES SAMPLE (Same time):")
+        if not hourly_ts.empty:
+            mid_month = hourly_ts['month'].min()
+            sample = hourly_ts[(hourly_ts['month'] == mid_month) &
+                              (hourly_ts['day'] == 15) &
+                              (hourly_ts['hour'] == 12)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+                year_cols = [col for col in hourly_ts.columns if isinstance(col, int)][:3]  # First 3 years
+                print(f"   {datetime_labels(row[HOUR_KEY])}:")
+                values = [f"{int(year)}: {row[year]:.2f} MW" for year in year_cols if pd.notna(row[year])]
+                print(f"   {', '.join(values)}, ...")
+
+        # Sample daily statistics
+        print("\n📅 DAILY GENERATION STATISTICS SAMPLE (Mid-month):")
+        if not daily_df.empty:
+            mid_month = daily_df['month'].min()
+            sample = daily_df[(daily_df['month'] == mid_month) & (daily_df['day'] == 15)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+                print(f"   {date_labels(row[DAY_KEY])} (Year: {row['year']}):")
+                print(f"   Mean: {row['mean']:.2f} MWh, P10-P90: {row['p10']:.2f}-{row['p90']:.2f} MWh")
+
+        # Sample daily timeseries
+        print("\n📊 DAILY GENERATION TIMESERIES SAMPLE (Same date):")
+        if not daily_ts.empty:
+            mid_month = daily_ts['month'].min()
+            sample = daily_ts[(daily_ts['month'] == mid_month) & (daily_ts['day'] == 15)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+                year_cols = [col for col in daily_ts.columns if isinstance(col, int)][:3]  # First 3 years
+                print(f"   {date_labels(row[DAY_KEY])}:")
+                values = [f"{int(year)}: {row[year]:.1f} MWh" for year in year_cols if pd.notna(row[year])]
+                print(f"   {', '.join(values)}, ...")
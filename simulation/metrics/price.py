@@ -0,0 +1,335 @@
+"""
+Real-time price simulation: statistical price profiles with logarithmic
+compression of outliers.
+"""
+import numpy as np
+
+from simulation.duration_curves import DurationIndex, duration_index_file_name
+from simulation.pipeline import SimulationPipeline
+from simulation.slot_stats import compress_slot_values
+from simulation.time_keys import (
+    DAY_KEY,
+    HOUR_KEY,
+    date_labels,
+    datetime_labels,
+)
+
+
+class PriceSimulation(SimulationPipeline):
+    """
+    Create statistical price profiles with percentile compression for outliers
+    Handles extreme prices elegantly while preserving their presence in distributions
+    Compresses values outside P10-P90 range for cleaner statistics
+    """
+
+    metric = 'price'
+    output_folder = 'Price'
+    section_label = 'PRICE'
+    init_message = 'Initializing Price Simulation...'
+    selection_title = 'PRICE SIMULATION WITH OUTLIER COMPRESSION'
+    selection_icon = '💰'
+    run_banner = ('\n💰 Price Simulation with Outlier Compression',
+                  '   (Handles extreme prices elegantly)')
+    complete_banner = '✨ PRICE SIMULATION COMPLETE!'
+    output_descriptions = ('Hourly/Daily/Monthly price statistics (with year column)',
+                           'Hourly/Daily/Monthly price timeseries',
+                           'Hourly compressed timeseries for visualization')
+    key_features = ('Outliers compressed logarithmically (P10-P90)',
+                    'Full P1-P99 percentiles available',
+                    'Actual values tracked for reference',
+                    'Daily and Monthly use generation-weighted prices')
+    input_columns = ('price', 'generation_mw')
+    cube_timeseries = {'price': 'hourly_timeseries', 'price_compressed': 'hourly_timeseries_compressed'}
+    parameter_attributes = ('full_percentiles', 'compression_lower', 'compression_upper')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Define percentiles for FULL distribution (including compressed outliers)
+        self.full_percentiles = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+
+        # Define compression thresholds (P10 and P90 for compression)
+        self.compression_lower = 10
+        self.compression_upper = 90
+
+        # Define thresholds for extreme event tracking
+        self.negative_threshold = 0
+        self.spike_threshold = 100
+        self.extreme_spike_threshold = 200
+
+    def print_metric_summary(self, df_filtered, months_in_range):
+        print(f"   Price range: ${df_filtered['price'].min():.2f} to ${df_filtered['price'].max():.2f}")
+        print(f"   Negative price hours: {(df_filtered['price'] < 0).sum()} ({(df_filtered['price'] < 0).sum()/len(df_filtered)*100:.1f}%)")
+
+    def calculate_extreme_statistics(self, prices, generation=None):
+        """
+        Enhanced extreme statistics calculation
+        """
+        extreme_stats = {}
+
+        # Overall distribution info
+        extreme_stats['min'] = np.min(prices)
+        extreme_stats['max'] = np.max(prices)
+        extreme_stats['mean'] = np.mean(prices)
+        extreme_stats['std'] = np.std(prices)
+
+        # Negative price analysis
+        negative_mask = prices < self.negative_threshold
+        extreme_stats['negative_count'] = negative_mask.sum()
+        extreme_stats['negative_pct'] = negative_mask.sum() / len(prices) * 100
+
+        if negative_mask.sum() > 0:
+            neg_prices = prices[negative_mask]
+            extreme_stats['negative_mean'] = np.mean(neg_prices)
+            extreme_stats['negative_worst'] = np.min(neg_prices)
+            if generation is not None:
+                extreme_stats['negative_avg_gen'] = np.mean(generation[negative_mask])
+
+        # Spike analysis
+        spike_mask = prices > self.spike_threshold
+        extreme_stats['spike_count'] = spike_mask.sum()
+        extreme_stats['spike_pct'] = spike_mask.sum() / len(prices) * 100
+
+        if spike_mask.sum() > 0:
+            spike_prices = prices[spike_mask]
+            extreme_stats['spike_mean'] = np.mean(spike_prices)
+            extreme_stats['spike_worst'] = np.max(spike_prices)
+            if generation is not None:
+                extreme_stats['spike_avg_gen'] = np.mean(generation[spike_mask])
+
+        # Extreme spike count
+        extreme_spike_mask = prices > self.extreme_spike_threshold
+        extreme_stats['extreme_spike_count'] = extreme_spike_mask.sum()
+
+        return extreme_stats
+
+    def calculate_hourly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate hourly price statistics with percentile compression
+        """
+        print("\n⚡ Calculating HOURLY price statistics...")
+
+        # One pass over all month-day-hour slots (slots with < 5 data points are skipped):
+        # main statistics on COMPRESSED data for visualization, ACTUAL ones for reference
+        results_df = self.compressed_statistics(
+            df_filtered, ['month', 'day', 'hour'], 'price', month_order_map,
+            actual_percentiles=[5, 10, 90, 95],
+            mean_cols={'avg_generation': 'generation_mw'}
+        )
+
+        cols = ([HOUR_KEY, 'year', 'month', 'day', 'hour', 'mean', 'std_dev', 'count', 'avg_generation']
+                + [f'p{p}' for p in self.full_percentiles]
+                + ['actual_mean', 'actual_min', 'actual_max']
+                + [f'actual_p{p}' for p in [5, 10, 90, 95]])
+        results_df = results_df[cols]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} hourly slots")
+
+        return results_df
+
+    def calculate_daily_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate daily GENERATION-WEIGHTED price statistics with compression
+        """
+        print("\n📅 Calculating DAILY generation-weighted price statistics...")
+
+        # Generation-weighted price of every day of every year (shared with the timeseries)
+        daily_data = self.weighted_prices(df_filtered, 'price', ['year', 'month', 'day'])
+        daily_data = daily_data[daily_data['weighted_price'].notna()]
+
+        # Statistics across years for each day, all days compressed at once
+        results_df = self.compressed_statistics(
+            daily_data, ['month', 'day'], 'weighted_price', month_order_map,
+            actual_percentiles=[5, 10, 90, 95],
+            mean_cols={'avg_generation_mwh': 'total_generation', 'avg_generating_hours': 'generating_hours'}
+        )
+        results_df = results_df[[DAY_KEY, 'year', 'month', 'day'] + self.aggregate_statistics_columns()]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} daily slots")
+
+        return results_df
+
+    def calculate_monthly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate monthly GENERATION-WEIGHTED price statistics with compression
+        """
+        print("\n📊 Calculating MONTHLY generation-weighted price statistics...")
+
+        # Generation-weighted price of every month of every year (shared with the timeseries)
+        monthly_data = self.weighted_prices(df_filtered, 'price', ['year', 'month'])
+        monthly_data = monthly_data[monthly_data['weighted_price'].notna()]
+
+        # Statistics across years for each month, all months compressed at once
+        results_df = self.compressed_statistics(
+            monthly_data, ['month'], 'weighted_price', month_order_map,
+            actual_percentiles=[5, 10, 90, 95],
+            mean_cols={'avg_generation_mwh': 'total_generation', 'avg_generating_hours': 'generating_hours'}
+        )
+        results_df = results_df[['month_name', 'year', 'month'] + self.aggregate_statistics_columns()]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} months")
+
+        return results_df
+
+    def aggregate_statistics_columns(self):
+        """Statistics columns of the daily and monthly files, after their key columns"""
+        return (['mean', 'std_dev', 'count', 'avg_generation_mwh', 'avg_generating_hours']
+                + [f'p{p}' for p in self.full_percentiles]
+                + ['actual_mean', 'actual_min', 'actual_max']
+                + [f'actual_p{p}' for p in [5, 10, 90, 95]])
+
+    def create_hourly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create hourly price timeseries with years as columns
+        """
+        print("\n⏰ Creating HOURLY price timeseries...")
+
+        pivot_df = self.pivot_hourly(df_filtered, 'price', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} hourly slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_hourly_timeseries_compressed(self, df_filtered, month_order_map):
+        """
+        Create hourly price timeseries with COMPRESSED values
+        MODIFIED: Uses P25-P75 compression instead of P10-P90
+        """
+        print("\n🗜️  Creating COMPRESSED hourly price timeseries...")
+
+        # LOCAL VARIABLES - won't affect class-level compression settings
+        local_compression_lower = 25  # P25 instead of P10
+        local_compression_upper = 75  # P75 instead of P90
+
+        df_work = df_filtered.copy()
+
+        # P25/P75 for each hour slot across all years, broadcast back to every row,
+        # then log compression applied to all values outside the band at once
+        # (slots with fewer than 5 data points are left uncompressed)
+        df_work['compressed_price'] = compress_slot_values(
+            df_work, 'price', ['month', 'day', 'hour'],
+            local_compression_lower, local_compression_upper, min_count=5
+        )
+
+        # Pivot for compressed prices
+        pivot_df = self.pivot_hourly(df_work, 'compressed_price', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created compressed timeseries for {len(pivot_df)} hourly slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+        print(f"   📌 Using P25-P75 compression (more aggressive than statistics files)")
+
+        return pivot_df
+
+    def create_daily_timeseries(self, df_filtered, month_order_map):
+        """
+        Create daily GENERATION-WEIGHTED price timeseries
+        """
+        print("\n📅 Creating DAILY generation-weighted price timeseries...")
+
+        # Generation-weighted prices, shared with the daily statistics
+        df_daily = self.weighted_prices(df_filtered, 'price', ['year', 'month', 'day'])
+
+        pivot_df = self.pivot_daily(df_daily, 'weighted_price', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} daily slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_monthly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create monthly GENERATION-WEIGHTED price timeseries
+        """
+        print("\n📊 Creating MONTHLY generation-weighted price timeseries...")
+
+        # Generation-weighted prices, shared with the monthly statistics
+        df_monthly = self.weighted_prices(df_filtered, 'price', ['year', 'month'])
+
+        pivot_df = self.pivot_monthly(df_monthly, 'weighted_price', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} months")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def print_sample_results(self, hourly_stats, daily_stats, monthly_stats, timeseries):
+        """
+        Print formatted sample results showing compression effect
+        """
+        print("\n" + "="*60)
+        print("SAMPLE RESULTS WITH COMPRESSION")
+        print("="*60)
+
+        # Sample hourly statistics
+        print("\n⚡ HOURLY PRICE STATISTICS SAMPLE:")
+        if not hourly_stats.empty:
+            mid_month = hourly_stats['month'].min()
+            sample = hourly_stats[(hourly_stats['month'] == mid_month) &
+                                (hourly_stats['day'] == 15) &
+                                (hourly_stats['hour'] == 12)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+
+                print(f"\n   {datetime_labels(row[HOUR_KEY])} (Year: {row['year']}):")
+                print(f"   Original range: ${row['actual_min']:.2f} to ${row['actual_max']:.2f}")
+                print(f"   Mean: ${row['mean']:.2f}, P10-P90: ${row['p10']:.2f}-${row['p90']:.2f}")
+                print(f"   (Statistics based on compressed values)")
+
+        # Sample daily statistics
+        print("\n📅 DAILY WEIGHTED PRICE STATISTICS SAMPLE:")
+        if not daily_stats.empty:
+            mid_month = daily_stats['month'].min()
+            sample = daily_stats[(daily_stats['month'] == mid_month) & (daily_stats['day'] == 15)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+                print(f"\n   {date_labels(row[DAY_KEY])} (Year: {row['year']}):")
+                print(f"   Weighted avg: ${row['mean']:.2f}, P10-P90: ${row['p10']:.2f}-${row['p90']:.2f}")
+                print(f"   Based on {row['avg_generating_hours']:.1f} generating hours/day")
+
+    def create_timeseries(self, df_filtered, month_order_map):
+        """
+        Price timeseries, including the compressed hourly timeseries for visualization
+        """
+        return {
+            'hourly_timeseries': self.create_hourly_timeseries(df_filtered, month_order_map),
+            'hourly_timeseries_compressed': self.create_hourly_timeseries_compressed(df_filtered, month_order_map),
+            'daily_timeseries': self.create_daily_timeseries(df_filtered, month_order_map),
+            'monthly_timeseries': self.create_monthly_timeseries(df_filtered, month_order_map),
+        }
+
+    def save_all_results(self, hourly_stats, daily_stats, monthly_stats, timeseries, site_name):
+        """
+        Save all files, plus the duration-curve index of the compressed hourly prices
+        """
+        super().save_all_results(hourly_stats, daily_stats, monthly_stats, timeseries, site_name)
+
+        index = DurationIndex.from_timeseries(timeseries['hourly_timeseries_compressed'],
+                                              decimals=self.timeseries_decimals)
+        index_file = duration_index_file_name(site_name, self.metric)
+        index_path = self.get_output_path(site_name) / index_file
+        index.save(index_path)
+        self.written_files.append(index_path)
+        print(f"💾 Saved: {self.base_output_path.name}/{site_name}/{self.output_folder}/{index_file}")
+
+    def statistics_columns(self):
+        """
+        Columns saved for the hourly, daily and monthly statistics
+        """
+        percentile_cols = [f'p{p}' for p in self.full_percentiles]
+        actual_cols = ['actual_mean', 'actual_min', 'actual_max', 'actual_p5', 'actual_p10',
+                       'actual_p90', 'actual_p95', 'count']
+        return {
+            'hourly': [HOUR_KEY, 'year', 'month', 'day', 'hour', 'mean', 'std_dev'] +
+                      percentile_cols + actual_cols + ['avg_generation'],
+            'daily': [DAY_KEY, 'year', 'month', 'day', 'mean', 'std_dev'] +
+                     percentile_cols + actual_cols + ['avg_generation_mwh', 'avg_generating_hours'],
+            'monthly': ['month_name', 'year', 'month', 'mean', 'std_dev'] +
+                       percentile_cols + actual_cols + ['avg_generation_mwh', 'avg_generating_hours'],
+        }
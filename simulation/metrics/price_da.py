@@ -0,0 +1,234 @@
+"""
+Day-ahead price simulation: statistical day-ahead price profiles with
+logarithmic compression of outliers.
+"""
+from simulation.pipeline import SimulationPipeline
+from simulation.time_keys import (
+    DAY_KEY,
+    HOUR_KEY,
+    date_labels,
+    datetime_labels,
+)
+
+
+class PriceDayAheadSimulation(SimulationPipeline):
+    """
+    Create statistical DAY-AHEAD price profiles with percentile compression for outliers
+    Handles extreme prices elegantly while preserving their presence in distributions
+    """
+
+    metric = 'price_da'
+    output_folder = 'Price_da'
+    section_label = 'DAY-AHEAD PRICE'
+    init_message = 'Initializing Day-Ahead Price Simulation...'
+    selection_title = 'DAY-AHEAD PRICE SIMULATION WITH OUTLIER COMPRESSION'
+    selection_icon = '💰'
+    run_banner = ('\n💰 Day-Ahead Price Simulation with Outlier Compression',
+                  '   (Handles extreme day-ahead prices elegantly)')
+    complete_banner = '✨ DAY-AHEAD PRICE SIMULATION COMPLETE!'
+    output_descriptions = ('Hourly/Daily/Monthly day-ahead price statistics (with year column)',
+                           'Hourly/Daily/Monthly day-ahead price timeseries')
+    key_features = ('Outliers compressed logarithmically (P10-P90)',
+                    'Full P1-P99 percentiles available',
+                    'Actual values tracked for reference',
+                    'Daily and Monthly use generation-weighted prices')
+    input_columns = ('price_da', 'generation_mw')
+    parameter_attributes = ('full_percentiles', 'compression_lower', 'compression_upper')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Define percentiles for FULL distribution (including compressed outliers)
+        self.full_percentiles = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+
+        # Define compression thresholds (P10 and P90 for compression)
+        self.compression_lower = 10
+        self.compression_upper = 90
+
+        # Define thresholds for extreme event tracking
+        self.negative_threshold = 0
+        self.spike_threshold = 100
+        self.extreme_spike_threshold = 200
+
+    def print_metric_summary(self, df_filtered, months_in_range):
+        print(f"   Day-ahead price range: ${df_filtered['price_da'].min():.2f} to ${df_filtered['price_da'].max():.2f}")
+        print(f"   Negative day-ahead price hours: {(df_filtered['price_da'] < 0).sum()} ({(df_filtered['price_da'] < 0).sum()/len(df_filtered)*100:.1f}%)")
+
+    def calculate_hourly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate hourly DAY-AHEAD price statistics with percentile compression
+        """
+        print("\n⚡ Calculating HOURLY day-ahead price statistics...")
+
+        # One pass over all month-day-hour slots (slots with < 5 data points are skipped):
+        # main statistics on COMPRESSED data for visualization, ACTUAL ones for reference
+        results_df = self.compressed_statistics(
+            df_filtered, ['month', 'day', 'hour'], 'price_da', month_order_map,
+            actual_percentiles=[5, 10, 90, 95],
+            mean_cols={'avg_generation': 'generation_mw'}
+        )
+
+        cols = ([HOUR_KEY, 'year', 'month', 'day', 'hour', 'mean', 'std_dev', 'count', 'avg_generation']
+                + [f'p{p}' for p in self.full_percentiles]
+                + ['actual_mean', 'actual_min', 'actual_max']
+                + [f'actual_p{p}' for p in [5, 10, 90, 95]])
+        results_df = results_df[cols]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} hourly slots")
+
+        return results_df
+
+    def calculate_daily_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate daily GENERATION-WEIGHTED day-ahead price statistics with compression
+        """
+        print("\n📅 Calculating DAILY generation-weighted day-ahead price statistics...")
+
+        # Generation-weighted price of every day of every year (shared with the timeseries)
+        daily_data = self.weighted_prices(df_filtered, 'price_da', ['year', 'month', 'day'])
+        daily_data = daily_data.rename(columns={'weighted_price': 'weighted_price_da'})
+        daily_data = daily_data[daily_data['weighted_price_da'].notna()]
+
+        # Statistics across years for each day, all days compressed at once
+        results_df = self.compressed_statistics(
+            daily_data, ['month', 'day'], 'weighted_price_da', month_order_map,
+            actual_percentiles=[5, 10, 90, 95],
+            mean_cols={'avg_generation_mwh': 'total_generation', 'avg_generating_hours': 'generating_hours'}
+        )
+        results_df = results_df[[DAY_KEY, 'year', 'month', 'day'] + self.aggregate_statistics_columns()]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} daily slots")
+
+        return results_df
+
+    def calculate_monthly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate monthly GENERATION-WEIGHTED day-ahead price statistics with compression
+        """
+        print("\n📊 Calculating MONTHLY generation-weighted day-ahead price statistics...")
+
+        # Generation-weighted price of every month of every year (shared with the timeseries)
+        monthly_data = self.weighted_prices(df_filtered, 'price_da', ['year', 'month'])
+        monthly_data = monthly_data.rename(columns={'weighted_price': 'weighted_price_da'})
+        monthly_data = monthly_data[monthly_data['weighted_price_da'].notna()]
+
+        # Statistics across years for each month, all months compressed at once
+        results_df = self.compressed_statistics(
+            monthly_data, ['month'], 'weighted_price_da', month_order_map,
+            actual_percentiles=[5, 10, 90, 95],
+            mean_cols={'avg_generation_mwh': 'total_generation', 'avg_generating_hours': 'generating_hours'}
+        )
+        results_df = results_df[['month_name', 'year', 'month'] + self.aggregate_statistics_columns()]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} months")
+
+        return results_df
+
+    def aggregate_statistics_columns(self):
+        """Statistics columns of the daily and monthly files, after their key columns"""
+        return (['mean', 'std_dev', 'count', 'avg_generation_mwh', 'avg_generating_hours']
+                + [f'p{p}' for p in self.full_percentiles]
+                + ['actual_mean', 'actual_min', 'actual_max']
+                + [f'actual_p{p}' for p in [5, 10, 90, 95]])
+
+    def create_hourly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create hourly day-ahead price timeseries with years as columns
+        """
+        print("\n⏰ Creating HOURLY day-ahead price timeseries...")
+
+        pivot_df = self.pivot_hourly(df_filtered, 'price_da', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} hourly slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_daily_timeseries(self, df_filtered, month_order_map):
+        """
+        Create daily GENERATION-WEIGHTED day-ahead price timeseries
+        """
+        print("\n📅 Creating DAILY generation-weighted day-ahead price timeseries...")
+
+        # Generation-weighted prices, shared with the daily statistics
+        df_daily = self.weighted_prices(df_filtered, 'price_da', ['year', 'month', 'day'])
+        df_daily = df_daily.rename(columns={'weighted_price': 'weighted_price_da'})
+
+        pivot_df = self.pivot_daily(df_daily, 'weighted_price_da', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} daily slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_monthly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create monthly GENERATION-WEIGHTED day-ahead price timeseries
+        """
+        print("\n📊 Creating MONTHLY generation-weighted day-ahead price timeseries...")
+
+        # Generation-weighted prices, shared with the monthly statistics
+        df_monthly = self.weighted_prices(df_filtered, 'price_da', ['year', 'month'])
+        df_monthly = df_monthly.rename(columns={'weighted_price': 'weighted_price_da'})
+
+        pivot_df = self.pivot_monthly(df_monthly, 'weighted_price_da', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} months")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def print_sample_results(self, hourly_stats, daily_stats, monthly_stats, timeseries):
+        """
+        Print formatted sample results
+        """
+        print("\n" + "="*60)
+        print("SAMPLE DAY-AHEAD RESULTS WITH COMPRESSION")
+        print("="*60)
+
+        # Sample hourly statistics
+        print("\n⚡ HOURLY DAY-AHEAD PRICE STATISTICS SAMPLE:")
+        if not hourly_stats.empty:
+            mid_month = hourly_stats['month'].min()
+            sample = hourly_stats[(hourly_stats['month'] == mid_month) &
+                                (hourly_stats['day'] == 15) &
+                                (hourly_stats['hour'] == 12)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+
+                print(f"\n   {datetime_labels(row[HOUR_KEY])} (Year: {row['year']}):")
+                print(f"   Original range: ${row['actual_min']:.2f} to ${row['actual_max']:.2f}")
+                print(f"   Mean: ${row['mean']:.2f}, P10-P90: ${row['p10']:.2f}-${row['p90']:.2f}")
+                print(f"   (Statistics based on compressed values)")
+
+        # Sample daily statistics
+        print("\n📅 DAILY WEIGHTED DAY-AHEAD PRICE STATISTICS SAMPLE:")
+        if not daily_stats.empty:
+            mid_month = daily_stats['month'].min()
+            sample = daily_stats[(daily_stats['month'] == mid_month) & (daily_stats['day'] == 15)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+                print(f"\n   {date_labels(row[DAY_KEY])} (Year: {row['year']}):")
+                print(f"   Weighted avg: ${row['mean']:.2f}, P10-P90: ${row['p10']:.2f}-${row['p90']:.2f}")
+                print(f"   Based on {row['avg_generating_hours']:.1f} generating hours/day")
+
+    def statistics_columns(self):
+        """
+        Columns saved for the hourly, daily and monthly statistics
+        """
+        percentile_cols = [f'p{p}' for p in self.full_percentiles]
+        actual_cols = ['actual_mean', 'actual_min', 'actual_max', 'actual_p5', 'actual_p10',
+                       'actual_p90', 'actual_p95', 'count']
+        return {
+            'hourly': [HOUR_KEY, 'year', 'month', 'day', 'hour', 'mean', 'std_dev'] +
+                      percentile_cols + actual_cols + ['avg_generation'],
+            'daily': [DAY_KEY, 'year', 'month', 'day', 'mean', 'std_dev'] +
+                     percentile_cols + actual_cols + ['avg_generation_mwh', 'avg_generating_hours'],
+            'monthly': ['month_name', 'year', 'month', 'mean', 'std_dev'] +
+                       percentile_cols + actual_cols + ['avg_generation_mwh', 'avg_generating_hours'],
+        }
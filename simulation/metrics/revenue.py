@@ -0,0 +1,253 @@
+"""
+Revenue simulation: statistical revenue profiles with logarithmic compression
+of outliers. Daily and monthly values are sums of the hourly revenue.
+"""
+from simulation.pipeline import SimulationPipeline
+from simulation.time_keys import (
+    DAY_KEY,
+    HOUR_KEY,
+    date_labels,
+    datetime_labels,
+)
+
+
+class RevenueSimulation(SimulationPipeline):
+    """
+    Create statistical revenue profiles with percentile compression for outliers
+    Revenue = Generation × Price, so can have extreme values
+    Daily/Monthly use SUMS (not averages) since revenue is already 0 when generation is 0
+    """
+
+    metric = 'revenue'
+    output_folder = 'Revenue'
+    section_label = 'REVENUE'
+    init_message = 'Initializing Revenue Simulation...'
+    selection_title = 'REVENUE SIMULATION WITH OUTLIER COMPRESSION'
+    selection_icon = '💵'
+    run_banner = ('\n💵 Revenue Simulation with Outlier Compression',
+                  '   (Daily/Monthly use SUMS not averages)')
+    complete_banner = '✨ REVENUE SIMULATION COMPLETE!'
+    output_descriptions = ('Hourly/Daily/Monthly revenue statistics (with year column)',
+                           'Hourly/Daily/Monthly revenue timeseries')
+    key_features = ('Outliers compressed logarithmically (P5-P95)',
+                    'Full P1-P99 percentiles available',
+                    'Actual values tracked for reference',
+                    'Daily and Monthly use SUMS (not averages)')
+    input_columns = ('revenue', 'generation_mw', 'price')
+    parameter_attributes = ('full_percentiles', 'compression_lower', 'compression_upper')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Define percentiles for FULL distribution (including compressed outliers)
+        self.full_percentiles = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+
+        # Define compression thresholds (P5 and P95 for compression)
+        self.compression_lower = 5
+        self.compression_upper = 95
+
+        # Define thresholds for extreme event tracking (adjusted for revenue)
+        self.negative_threshold = 0
+        self.high_revenue_threshold = 200  # $200/hour revenue
+        self.extreme_revenue_threshold = 500  # $500/hour revenue
+
+    def print_metric_summary(self, df_filtered, months_in_range):
+        print(f"   Revenue range: ${df_filtered['revenue'].min():.2f} to ${df_filtered['revenue'].max():.2f}")
+        print(f"   Zero revenue hours: {(df_filtered['revenue'] == 0).sum()} ({(df_filtered['revenue'] == 0).sum()/len(df_filtered)*100:.1f}%)")
+        print(f"   Negative revenue hours: {(df_filtered['revenue'] < 0).sum()} ({(df_filtered['revenue'] < 0).sum()/len(df_filtered)*100:.1f}%)")
+
+    def calculate_hourly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate hourly revenue statistics with percentile compression
+        """
+        print("\n⚡ Calculating HOURLY revenue statistics...")
+
+        # One pass over all month-day-hour slots (slots with < 5 data points are skipped):
+        # main statistics on COMPRESSED data for visualization, ACTUAL ones for reference
+        results_df = self.compressed_statistics(
+            df_filtered, ['month', 'day', 'hour'], 'revenue', month_order_map,
+            actual_percentiles=[5, 95],
+            mean_cols={'avg_generation': 'generation_mw', 'avg_price': 'price'}
+        )
+
+        cols = ([HOUR_KEY, 'year', 'month', 'day', 'hour', 'mean', 'std_dev', 'count', 'avg_generation', 'avg_price']
+                + [f'p{p}' for p in self.full_percentiles]
+                + ['actual_mean', 'actual_min', 'actual_max']
+                + [f'actual_p{p}' for p in [5, 95]])
+        results_df = results_df[cols]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} hourly slots")
+
+        return results_df
+
+    def calculate_daily_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate daily revenue statistics - SUMS not averages
+        """
+        print("\n📅 Calculating DAILY revenue statistics (sum of hourly revenues)...")
+
+        # Calculate daily revenue sums for each year
+        daily_data = df_filtered.groupby(['year', 'month', 'day']).agg({
+            'revenue': 'sum',
+            'generation_mw': 'sum',
+            'price': 'mean'  # Average price for the day
+        }).reset_index()
+
+        daily_data.rename(columns={
+            'revenue': 'daily_revenue',
+            'generation_mw': 'daily_generation',
+            'price': 'avg_price'
+        }, inplace=True)
+
+        # Statistics across years for each day, all days compressed at once
+        results_df = self.compressed_statistics(
+            daily_data, ['month', 'day'], 'daily_revenue', month_order_map,
+            mean_cols={'avg_daily_generation': 'daily_generation', 'avg_daily_price': 'avg_price'}
+        )
+        results_df = results_df[[DAY_KEY, 'year', 'month', 'day']
+                                + ['mean', 'std_dev', 'count', 'avg_daily_generation', 'avg_daily_price']
+                                + [f'p{p}' for p in self.full_percentiles]
+                                + ['actual_mean', 'actual_min', 'actual_max']]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} daily slots")
+
+        return results_df
+
+    def calculate_monthly_statistics(self, df_filtered, month_order_map):
+        """
+        Calculate monthly revenue statistics - SUMS not averages
+        """
+        print("\n📊 Calculating MONTHLY revenue statistics (sum of hourly revenues)...")
+
+        # Calculate monthly revenue sums for each year
+        monthly_data = df_filtered.groupby(['year', 'month']).agg({
+            'revenue': 'sum',
+            'generation_mw': 'sum',
+            'price': 'mean'  # Average price for the month
+        }).reset_index()
+
+        monthly_data.rename(columns={
+            'revenue': 'monthly_revenue',
+            'generation_mw': 'monthly_generation',
+            'price': 'avg_price'
+        }, inplace=True)
+
+        # Statistics across years for each month, all months compressed at once
+        results_df = self.compressed_statistics(
+            monthly_data, ['month'], 'monthly_revenue', month_order_map,
+            mean_cols={'avg_monthly_generation': 'monthly_generation', 'avg_monthly_price': 'avg_price'}
+        )
+        results_df = results_df[['month_name', 'year', 'month']
+                                + ['mean', 'std_dev', 'count', 'avg_monthly_generation', 'avg_monthly_price']
+                                + [f'p{p}' for p in self.full_percentiles]
+                                + ['actual_mean', 'actual_min', 'actual_max']]
+
+        print(f"   ✓ Calculated statistics for {len(results_df)} months")
+
+        return results_df
+
+    def create_hourly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create hourly revenue timeseries with years as columns
+        """
+        print("\n⏰ Creating HOURLY revenue timeseries...")
+
+        pivot_df = self.pivot_hourly(df_filtered, 'revenue', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} hourly slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_daily_timeseries(self, df_filtered, month_order_map):
+        """
+        Create daily revenue timeseries - sum of hourly revenues
+        """
+        print("\n📅 Creating DAILY revenue timeseries (sum of hourly)...")
+
+        # Calculate daily revenue sums
+        df_daily = df_filtered.groupby(['year', 'month', 'day'])['revenue'].sum().reset_index()
+        df_daily.columns = ['year', 'month', 'day', 'daily_revenue']
+
+        pivot_df = self.pivot_daily(df_daily, 'daily_revenue', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} daily slots")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def create_monthly_timeseries(self, df_filtered, month_order_map):
+        """
+        Create monthly revenue timeseries - sum of hourly revenues
+        """
+        print("\n📊 Creating MONTHLY revenue timeseries (sum of hourly)...")
+
+        # Calculate monthly revenue sums
+        df_monthly = df_filtered.groupby(['year', 'month'])['revenue'].sum().reset_index()
+        df_monthly.columns = ['year', 'month', 'monthly_revenue']
+
+        pivot_df = self.pivot_monthly(df_monthly, 'monthly_revenue', month_order_map)
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+
+        print(f"   ✓ Created timeseries for {len(pivot_df)} months")
+        print(f"   ✓ Including data from all {len(year_cols)} years")
+
+        return pivot_df
+
+    def print_sample_results(self, hourly_stats, daily_stats, monthly_stats, timeseries):
+        """
+        Print formatted sample results
+        """
+        print("\n" + "="*60)
+        print("SAMPLE REVENUE RESULTS WITH COMPRESSION")
+        print("="*60)
+
+        # Sample hourly statistics
+        print("\n⚡ HOURLY REVENUE STATISTICS SAMPLE:")
+        if not hourly_stats.empty:
+            mid_month = hourly_stats['month'].min()
+            sample = hourly_stats[(hourly_stats['month'] == mid_month) &
+                                (hourly_stats['day'] == 15) &
+                                (hourly_stats['hour'] == 12)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+
+                print(f"\n   {datetime_labels(row[HOUR_KEY])} (Year: {row['year']}):")
+                print(f"   Original range: ${row['actual_min']:.2f} to ${row['actual_max']:.2f}")
+                print(f"   Mean: ${row['mean']:.2f}, P10-P90: ${row['p10']:.2f}-${row['p90']:.2f}")
+                print(f"   (Statistics based on compressed values)")
+
+        # Sample daily statistics
+        print("\n📅 DAILY REVENUE STATISTICS SAMPLE:")
+        if not daily_stats.empty:
+            mid_month = daily_stats['month'].min()
+            sample = daily_stats[(daily_stats['month'] == mid_month) & (daily_stats['day'] == 15)]
+
+            if not sample.empty:
+                row = sample.iloc[0]
+                print(f"\n   {date_labels(row[DAY_KEY])} (Year: {row['year']}):")
+                print(f"   Daily revenue sum: ${row['mean']:.2f}, P10-P90: ${row['p10']:.2f}-${row['p90']:.2f}")
+                print(f"   Based on {row['avg_daily_generation']:.1f} MWh generation")
+
+    def statistics_columns(self):
+        """
+        Columns saved for the hourly, daily and monthly statistics
+        """
+        percentile_cols = [f'p{p}' for p in self.full_percentiles]
+        return {
+            'hourly': [HOUR_KEY, 'year', 'month', 'day', 'hour', 'mean', 'std_dev'] +
+                      percentile_cols +
+                      ['actual_mean', 'actual_min', 'actual_max', 'actual_p5', 'actual_p95',
+                       'count', 'avg_generation', 'avg_price'],
+            'daily': [DAY_KEY, 'year', 'month', 'day', 'mean', 'std_dev'] +
+                     percentile_cols +
+                     ['actual_mean', 'actual_min', 'actual_max',
+                      'count', 'avg_daily_generation', 'avg_daily_price'],
+            'monthly': ['month_name', 'year', 'month', 'mean', 'std_dev'] +
+                       percentile_cols +
+                       ['actual_mean', 'actual_min', 'actual_max',
+                        'count', 'avg_monthly_generation', 'avg_monthly_price'],
+        }
@@ -0,0 +1,848 @@
+"""
+Shared simulation pipeline for the generation, price, day-ahead price and
+revenue simulations.
+
+Every metric is a SimulationPipeline subclass that implements only its own
+statistics, timeseries, sample output and file layout. Site discovery, month
+windows, loading the combined hourly file, the year-as-column pivots, saving
+and the interactive run loop live here. run_site loads a site's combined file
+once and runs any number of metrics on that single in-memory frame.
+
+Metrics that set incremental = True also keep an IncrementalState per site, so
+rows appended to the combined file can be folded in without rereading it.
+"""
+import copy
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from simulation.aggregates import VIEWS, aggregates_file_name, build_aggregates
+from simulation.columnar import write_columnar
+from simulation.combined_schema import read_combined
+from simulation.incremental import IncrementalState
+from simulation.manifest import SiteManifest, file_hash
+from simulation.site_cube import write_site_cube
+from simulation.slot_stats import compress_matrix, slot_statistics
+from simulation.time_keys import (
+    DAY_KEY,
+    HOUR_KEY,
+    MONTH_NAMES,
+    MONTH_NAMES_FULL,
+    day_of_year,
+    hour_of_year,
+)
+
+DATA_PATH = Path('resurety_data')
+OUTPUT_PATH = Path('Renewable Portfolio LLC')
+COMBINED_SUFFIX = '_generation_price_combined.csv'
+
+# Per-metric outcome reported by run_site
+BUILT = 'built'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+def discover_sites(data_path=DATA_PATH):
+    """
+    Map clean site names to their combined generation-price files
+    """
+    site_file_map = {}
+    for f in data_path.glob('*' + COMBINED_SUFFIX):
+        # Extract site name by removing '_generation_price_combined.csv'
+        site_name = f.stem.replace(COMBINED_SUFFIX[:-len('.csv')], '')
+        # Clean up the site name by removing '_hourly' to avoid redundancy in output files
+        site_file_map[site_name.replace('_hourly', '')] = f.name
+    return site_file_map
+
+
+def combined_file_path(site_name, data_path=DATA_PATH, site_file_map=None):
+    """Combined file for a site, falling back to the standard naming convention"""
+    actual_filename = (site_file_map or {}).get(site_name)
+    return data_path / (actual_filename or f"{site_name}{COMBINED_SUFFIX}")
+
+
+def automatic_month_range():
+    """
+    12-month window starting at the current month: (start_month, end_month)
+    """
+    # Use current month as start
+    start_month = datetime.now().month
+
+    # End month is one month before start month (12 month cycle)
+    end_month = 12 if start_month == 1 else start_month - 1
+    return start_month, end_month
+
+
+def load_combined_frame(file_path, columns=None):
+    """
+    Load a combined hourly file (a path or a binary buffer) through
+    COMBINED_SCHEMA: typed calendar columns, a day column and the given value
+    columns (default: all of them). Raises CombinedSchemaError when the file
+    does not match the schema.
+    """
+    return read_combined(file_path, columns)
+
+
+class SimulationPipeline:
+    """
+    Base class for one simulated metric (generation, price, ...).
+    Subclasses set the class attributes below and implement the
+    calculate_*_statistics / create_*_timeseries methods.
+    """
+
+    # Key used on the command line and in file names, e.g. 'price_da'
+    metric = None
+    # Output folder under each site, e.g. 'Price_da'
+    output_folder = None
+    # Upper-case label for section headers, e.g. 'DAY-AHEAD PRICE'
+    section_label = None
+    # Printed when the simulation is created (None = silent)
+    init_message = None
+    # Interactive menu
+    selection_title = None
+    selection_icon = '📊'
+    run_banner = ()
+    complete_banner = '✨ SIMULATION COMPLETE!'
+    output_descriptions = ()
+    key_features = ()
+    # Decimals written for the year columns of the timeseries CSVs
+    timeseries_decimals = 2
+    # Value columns of the combined file the metric reads (None = all of them)
+    input_columns = None
+    # Hourly timeseries written to the site cube: cube metric -> timeseries key
+    # (None = the metric's own hourly_timeseries)
+    cube_timeseries = None
+    # Attributes that change the outputs, recorded in the build manifest
+    parameter_attributes = ()
+    # Whether the statistics and timeseries can be rebuilt from an IncrementalState
+    # (requires incremental_values, statistics_from_state and timeseries_from_state)
+    incremental = False
+
+    def __init__(self, data_path=DATA_PATH, base_output_path=OUTPUT_PATH):
+        if self.init_message:
+            print(f"\n🔧 {self.init_message}")
+
+        # Define paths - reading from resurety_data folder
+        self.data_path = Path(data_path)
+        self.base_output_path = Path(base_output_path)
+
+        # Get available combined files and map clean site names to actual filenames
+        self.site_file_map = discover_sites(self.data_path)
+        self.available_files = [self.data_path / name for name in self.site_file_map.values()]
+        self.available_sites = list(self.site_file_map)
+
+        if self.init_message:
+            print(f"   Found {len(self.available_files)} combined files")
+
+        self.month_names = MONTH_NAMES
+        self.month_names_full = MONTH_NAMES_FULL
+
+        # Also write typed Parquet copies of the timeseries (CSV stays as the export)
+        self.save_columnar_outputs = True
+
+        # Files written by the current process_single_site run
+        self.written_files = []
+
+        # Generation-weighted prices of the frame being processed, shared by the
+        # statistics and timeseries: (price column, keys) -> (frame, result)
+        self._weighted_prices = {}
+
+    # ------------------------------------------------------------------
+    # Site and month selection
+    # ------------------------------------------------------------------
+
+    def get_site_selection(self):
+        """
+        Interactive site selection with option for all sites
+        """
+        print("\n" + "="*60)
+        print(self.selection_title)
+        print("="*60)
+
+        if not self.available_sites:
+            print("❌ No combined generation-price files found in resurety_data!")
+            return None
+
+        print("\nAvailable options:")
+        print("0. ALL SITES (Process all sites at once)")
+        for i, site in enumerate(self.available_sites):
+            print(f"{i+1}. {site}")
+
+        print("="*60)
+
+        while True:
+            try:
+                selection = input(f"\n{self.selection_icon} Select option number (0 for all sites): ").strip()
+                if selection == '0':
+                    return 'ALL_SITES'
+                else:
+                    idx = int(selection) - 1
+                    if 0 <= idx < len(self.available_sites):
+                        return self.available_sites[idx]
+                    else:
+                        print("❌ Invalid selection!")
+            except:
+                print("❌ Please enter a valid number!")
+
+    def get_automatic_month_range(self):
+        """
+        Automatically determine month range: current month to 11 months later
+        """
+        current_month = datetime.now().month
+        start_month, end_month = automatic_month_range()
+
+        print(f"\n📅 Auto-detected period: {self.month_names[start_month]} to {self.month_names[end_month]} (12 months)")
+        print(f"   Starting from current month: {self.month_names[current_month]}")
+
+        return start_month, end_month
+
+    def get_months_in_range(self, start_month, end_month):
+        """
+        Get list of months in range, handling year-wrapping
+        """
+        if start_month <= end_month:
+            return list(range(start_month, end_month + 1))
+        else:
+            return list(range(start_month, 13)) + list(range(1, end_month + 1))
+
+    def filter_data_for_months(self, df, start_month, end_month):
+        """
+        Filter dataframe for month range, handling year-wrapping
+        """
+        months_in_range = self.get_months_in_range(start_month, end_month)
+        return df[df['month'].isin(months_in_range)].copy()
+
+    def create_month_order_map(self, start_month, end_month):
+        """
+        Create a mapping for sorting months in the specified order
+        """
+        months_in_range = self.get_months_in_range(start_month, end_month)
+        return {month: idx for idx, month in enumerate(months_in_range)}
+
+    def get_forecast_year(self, month):
+        """
+        Determine the forecast year for a given month based on current date
+        """
+        current_date = datetime.now()
+        current_year = current_date.year
+        current_month = current_date.month
+
+        # If the forecast month is >= current month, it's this year
+        # Otherwise it's next year (handling year wrap)
+        if month >= current_month:
+            return current_year
+        else:
+            return current_year + 1
+
+    # ------------------------------------------------------------------
+    # Shared computations
+    # ------------------------------------------------------------------
+
+    def compress_outliers(self, values, lower_pct=None, upper_pct=None):
+        """
+        Compress outliers using logarithmic compression
+        This keeps outliers in the distribution but makes them manageable for visualization
+
+        values is one slot's values, or a slot x year matrix whose rows are
+        compressed at once, each within its own percentile band; the matrix
+        form returns compression_info as arrays with one entry per row.
+        """
+        lower_pct = self.compression_lower if lower_pct is None else lower_pct
+        upper_pct = self.compression_upper if upper_pct is None else upper_pct
+
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 2:
+            return compress_matrix(values, lower_pct, upper_pct, return_info=True)
+
+        compressed, compression_info = compress_matrix(values[None, :], lower_pct, upper_pct, return_info=True)
+        return compressed[0], {key: value[0] for key, value in compression_info.items()}
+
+    def compressed_statistics(self, df, keys, value_col, month_order_map,
+                              actual_percentiles=(), mean_cols=None):
+        """
+        Per-slot statistics of value_col across years for the month/day/hour
+        keys: main statistics on values log-compressed within each slot, actual
+        ones for reference (see slot_statistics), with the forecast year and
+        slot key added and sorted by the custom month order. Slots with fewer
+        than 5 values are skipped.
+        """
+        results_df = slot_statistics(
+            df, keys, value_col, self.full_percentiles,
+            min_count=5,
+            compress=(self.compression_lower, self.compression_upper),
+            actual_percentiles=actual_percentiles,
+            mean_cols=mean_cols
+        )
+
+        forecast_years = {month: self.get_forecast_year(month) for month in results_df['month'].unique()}
+        results_df['year'] = results_df['month'].map(forecast_years)
+        if 'hour' in keys:
+            results_df[HOUR_KEY] = hour_of_year(results_df['month'], results_df['day'], results_df['hour'])
+        elif 'day' in keys:
+            results_df[DAY_KEY] = day_of_year(results_df['month'], results_df['day'])
+        else:
+            results_df['month_name'] = [self.month_names_full[month] for month in results_df['month']]
+        results_df['month_order'] = results_df['month'].map(month_order_map)
+
+        sort_cols = ['month_order'] + [col for col in ('day', 'hour') if col in keys]
+        return results_df.sort_values(sort_cols).reset_index(drop=True)
+
+    def weighted_prices(self, df_filtered, price_col, keys):
+        """
+        Generation-weighted price of every keys group, e.g. (year, month, day):
+        sum(price x generation) / sum(generation) over the hours with positive
+        generation, as grouped sums rather than a Python function per group.
+        Columns keys + weighted_price (NaN without generating hours),
+        total_generation and generating_hours. The result is reused for the
+        same frame, so the statistics and timeseries compute it once.
+        """
+        memo_key = (price_col, tuple(keys))
+        cached = self._weighted_prices.get(memo_key)
+        if cached is not None and cached[0] is df_filtered:
+            return cached[1]
+
+        generation = df_filtered['generation_mw'].to_numpy(dtype=float)
+        generating = generation > 0
+        prices = df_filtered[price_col].to_numpy(dtype=float)
+
+        work = df_filtered[list(keys)].copy()
+        # Hours without generation add nothing; NaN prices are skipped by the sum
+        work['price_x_generation'] = np.where(generating, prices * generation, 0.0)
+        work['weight'] = np.where(generating, generation, 0.0)
+        work['total_generation'] = generation
+        work['generating_hours'] = generating.astype(np.int64)
+        sums = work.groupby(list(keys)).sum()
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weighted = sums['price_x_generation'].to_numpy() / sums['weight'].to_numpy()
+        result = sums[['total_generation', 'generating_hours']].reset_index()
+        result.insert(len(keys), 'weighted_price', np.where(sums['generating_hours'].to_numpy() > 0, weighted, np.nan))
+
+        self._weighted_prices = {key: value for key, value in self._weighted_prices.items()
+                                 if value[0] is df_filtered}
+        self._weighted_prices[memo_key] = (df_filtered, result)
+        return result
+
+    def pivot_hourly(self, df, value_col, month_order_map, aggfunc='mean'):
+        """
+        Pivot hourly values to one row per month-day-hour slot with years as columns
+        """
+        df_work = df.copy()
+        df_work['month_order'] = df_work['month'].map(month_order_map)
+
+        pivot_df = df_work.pivot_table(
+            index=['month', 'day', 'hour', 'month_order'],
+            columns='year',
+            values=value_col,
+            aggfunc=aggfunc
+        ).reset_index()
+
+        # Sort by custom month order
+        pivot_df = pivot_df.sort_values(['month_order', 'day', 'hour']).reset_index(drop=True)
+
+        # Compact slot key; labels are formatted from it when displayed
+        pivot_df[HOUR_KEY] = hour_of_year(pivot_df['month'], pivot_df['day'], pivot_df['hour'])
+
+        pivot_df = pivot_df.drop('month_order', axis=1)
+
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+        cols = [HOUR_KEY, 'month', 'day', 'hour'] + sorted(year_cols)
+        return pivot_df[cols]
+
+    def pivot_daily(self, df_daily, value_col, month_order_map, aggfunc='first'):
+        """
+        Pivot daily values to one row per month-day slot with years as columns
+        """
+        df_daily = df_daily.copy()
+        df_daily['month_order'] = df_daily['month'].map(month_order_map)
+
+        pivot_df = df_daily.pivot_table(
+            index=['month', 'day', 'month_order'],
+            columns='year',
+            values=value_col,
+            aggfunc=aggfunc
+        ).reset_index()
+
+        pivot_df = pivot_df.sort_values(['month_order', 'day']).reset_index(drop=True)
+
+        pivot_df[DAY_KEY] = day_of_year(pivot_df['month'], pivot_df['day'])
+
+        pivot_df = pivot_df.drop('month_order', axis=1)
+
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+        cols = [DAY_KEY, 'month', 'day'] + sorted(year_cols)
+        return pivot_df[cols]
+
+    def pivot_monthly(self, df_monthly, value_col, month_order_map, aggfunc='first'):
+        """
+        Pivot monthly values to one row per month with years as columns
+        """
+        df_monthly = df_monthly.copy()
+        df_monthly['month_order'] = df_monthly['month'].map(month_order_map)
+
+        pivot_df = df_monthly.pivot_table(
+            index=['month', 'month_order'],
+            columns='year',
+            values=value_col,
+            aggfunc=aggfunc
+        ).reset_index()
+
+        pivot_df = pivot_df.sort_values(['month_order']).reset_index(drop=True)
+
+        pivot_df['month_name'] = pivot_df['month'].apply(lambda x: self.month_names_full[int(x)])
+
+        pivot_df = pivot_df.drop('month_order', axis=1)
+
+        year_cols = [col for col in pivot_df.columns if isinstance(col, int)]
+        cols = ['month_name', 'month'] + sorted(year_cols)
+        return pivot_df[cols]
+
+    # ------------------------------------------------------------------
+    # Metric hooks
+    # ------------------------------------------------------------------
+
+    def print_metric_summary(self, df_filtered, months_in_range):
+        """Metric-specific lines of the data summary"""
+
+    def create_timeseries(self, df_filtered, month_order_map):
+        """
+        All timeseries of the metric, keyed by the file name suffix
+        """
+        return {
+            'hourly_timeseries': self.create_hourly_timeseries(df_filtered, month_order_map),
+            'daily_timeseries': self.create_daily_timeseries(df_filtered, month_order_map),
+            'monthly_timeseries': self.create_monthly_timeseries(df_filtered, month_order_map),
+        }
+
+    def statistics_columns(self):
+        """Columns saved for the hourly, daily and monthly statistics"""
+        raise NotImplementedError
+
+    def print_sample_results(self, hourly_stats, daily_stats, monthly_stats, timeseries):
+        """Print formatted sample results"""
+
+    def incremental_values(self, df):
+        """
+        Values folded into the incremental state from complete-month rows:
+        {'hourly' | 'daily' | 'monthly': frame with year, the level's keys and value}
+        """
+        raise NotImplementedError
+
+    def statistics_from_state(self, state, months_in_range, month_order_map):
+        """(hourly, daily, monthly) statistics of the month window from an IncrementalState"""
+        raise NotImplementedError
+
+    def timeseries_from_state(self, state, months_in_range, month_order_map):
+        """Timeseries of the month window from an IncrementalState, keyed like create_timeseries"""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Saving
+    # ------------------------------------------------------------------
+
+    def get_output_path(self, site_name):
+        """
+        Create Renewable Portfolio LLC/{site_name}/{output_folder}/ and the site's plots folder
+        """
+        output_path = self.base_output_path / site_name / self.output_folder
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        # Create plots folder for the site (if not already created by other scripts)
+        plots_path = self.base_output_path / site_name / 'plots'
+        plots_path.mkdir(exist_ok=True)
+
+        return output_path
+
+    def save_all_results(self, hourly_stats, daily_stats, monthly_stats, timeseries, site_name):
+        """
+        Save all files in the structure: Renewable Portfolio LLC/{site_name}/{output_folder}/
+        """
+        output_path = self.get_output_path(site_name)
+        columns = self.statistics_columns()
+        print()
+
+        # Statistics (forecast files)
+        for level, stats in [('hourly', hourly_stats), ('daily', daily_stats), ('monthly', monthly_stats)]:
+            stats_file = f"{site_name}_{self.metric}_{level}_forecast.csv"
+            stats[columns[level]].to_csv(output_path / stats_file, index=False, float_format='%.3f')
+            self.written_files.append(output_path / stats_file)
+            print(f"💾 Saved: {self.base_output_path.name}/{site_name}/{self.output_folder}/{stats_file}")
+
+        # Timeseries with years as columns
+        for suffix, ts in timeseries.items():
+            ts_file = f"{site_name}_{self.metric}_{suffix}.csv"
+            self.save_timeseries(ts, output_path / ts_file)
+            print(f"💾 Saved: {self.base_output_path.name}/{site_name}/{self.output_folder}/{ts_file}")
+            self.save_columnar(ts, output_path / ts_file, decimals=self.timeseries_decimals)
+
+        # Precomputed bands and profiles the dashboard renders from
+        aggregates = build_aggregates({view: timeseries.get(f'{view}_timeseries') for view in VIEWS},
+                                      decimals=self.timeseries_decimals)
+        aggregates_file = aggregates_file_name(site_name, self.metric)
+        aggregates.to_csv(output_path / aggregates_file, index=False, float_format='%.4f')
+        self.written_files.append(output_path / aggregates_file)
+        print(f"💾 Saved: {self.base_output_path.name}/{site_name}/{self.output_folder}/{aggregates_file}")
+
+        # This metric's planes of the site's memory-mapped hourly cube
+        cube_timeseries = self.cube_timeseries or {self.metric: 'hourly_timeseries'}
+        cube_frames = {cube_metric: timeseries[key] for cube_metric, key in cube_timeseries.items()
+                       if timeseries.get(key) is not None}
+        if cube_frames:
+            cube_path, header_path = write_site_cube(self.base_output_path / site_name, cube_frames,
+                                                     decimals=self.timeseries_decimals)
+            self.written_files.extend([cube_path, header_path])
+            print(f"💾 Saved: {self.base_output_path.name}/{site_name}/{cube_path.name}")
+
+    def save_timeseries(self, ts, ts_path):
+        """
+        Write a timeseries CSV with fixed-decimal year columns and blanks for missing years
+        """
+        ts_save = ts.copy()
+        year_cols = [col for col in ts_save.columns if isinstance(col, int)]
+        fmt = f'{{:.{self.timeseries_decimals}f}}'
+        for col in year_cols:
+            ts_save[col] = ts_save[col].apply(lambda x: '' if pd.isna(x) else fmt.format(x))
+        ts_save.to_csv(ts_path, index=False)
+        self.written_files.append(ts_path)
+
+    def save_columnar(self, df, csv_path, decimals):
+        """
+        Save the typed columnar copy of a timeseries next to its CSV export
+        """
+        if not self.save_columnar_outputs:
+            return
+        output_path = write_columnar(df, csv_path, decimals=decimals)
+        if output_path:
+            self.written_files.append(output_path)
+            print(f"💾 Saved: {output_path}")
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def simulation_parameters(self, start_month, end_month):
+        """
+        Everything besides the input data and code that changes the outputs
+        """
+        months_in_range = self.get_months_in_range(start_month, end_month)
+        parameters = {
+            'start_month': start_month,
+            'end_month': end_month,
+            # The forecast 'year' column depends on the current date
+            'forecast_years': {str(month): self.get_forecast_year(month) for month in months_in_range},
+            'timeseries_decimals': self.timeseries_decimals,
+            'save_columnar_outputs': self.save_columnar_outputs,
+        }
+        for attr in self.parameter_attributes:
+            parameters[attr] = getattr(self, attr)
+        return parameters
+
+    def record_build(self, site_name, start_month, end_month, input_hash=None):
+        """
+        Record the input hash, parameters and outputs of a successful run in the site manifest
+        """
+        file_path = combined_file_path(site_name, self.data_path, self.site_file_map)
+        if input_hash is None:
+            input_hash = file_hash(file_path)
+        manifest = SiteManifest(self.base_output_path, site_name)
+        manifest.record(self.metric, file_path, input_hash,
+                        self.simulation_parameters(start_month, end_month), self.written_files)
+
+    def is_up_to_date(self, site_name, start_month, end_month, input_hash):
+        """True when the site's outputs were built from this input with the same parameters"""
+        manifest = SiteManifest(self.base_output_path, site_name)
+        return manifest.is_current(self.metric, input_hash,
+                                   self.simulation_parameters(start_month, end_month))
+
+    def incremental_state_path(self, site_name):
+        return self.base_output_path / site_name / f"{self.metric}_incremental_state.npz"
+
+    def save_incremental_state(self, site_name, df):
+        """
+        Fold the complete months of a fully loaded site into a fresh incremental state
+        """
+        file_path = combined_file_path(site_name, self.data_path, self.site_file_map)
+        state = IncrementalState.from_frame(df, file_path, self.incremental_values)
+        if state is None:
+            print(f"   ⚠️  {file_path.name} is not in time order, incremental updates disabled")
+            return
+        state.save(self.incremental_state_path(site_name))
+
+    def load_site_data(self, site_name, columns=None):
+        """Load the combined hourly frame of a site (default: the metric's input_columns)"""
+        file_path = combined_file_path(site_name, self.data_path, self.site_file_map)
+        print(f"\n📁 Loading data from: {file_path.name}")
+        return load_combined_frame(file_path, self.input_columns if columns is None else columns)
+
+    def process_single_site(self, site_name, start_month, end_month, df=None, input_hash=None):
+        """
+        Process a single site with given month range.
+        df is the site's already loaded combined frame (read from disk if None),
+        input_hash the content hash of its combined file (computed if None).
+        """
+        self.written_files = []
+
+        # Create month order mapping
+        month_order_map = self.create_month_order_map(start_month, end_month)
+
+        print(f"\n{'='*60}")
+        print(f"Processing: {site_name}")
+
+        months_in_range = self.get_months_in_range(start_month, end_month)
+        num_months = len(months_in_range)
+
+        if start_month <= end_month:
+            print(f"Month range: {self.month_names[start_month]} to {self.month_names[end_month]} ({num_months} months)")
+        else:
+            print(f"Month range: {self.month_names[start_month]} to {self.month_names[end_month]} (year-wrapping, {num_months} months)")
+
+        print(f"{'='*60}")
+
+        try:
+            if df is None:
+                df = self.load_site_data(site_name)
+
+            # Filter for selected months
+            df_filtered = self.filter_data_for_months(df, start_month, end_month)
+
+            # Get data summary
+            years_available = sorted(df_filtered['year'].unique())
+            print(f"\n📊 Data summary:")
+            print(f"   Years available: {years_available[0]} to {years_available[-1]} ({len(years_available)} years)")
+            print(f"   Total data points: {len(df_filtered):,}")
+            self.print_metric_summary(df_filtered, months_in_range)
+
+            # Updated note about year-wrapping
+            if start_month > end_month:
+                print(f"\n   ℹ️  Note: Year-wrapping range detected!")
+                print(f"   First year ({years_available[0]}) and last year ({years_available[-1]}) may have partial data")
+                print(f"   All available data will be included in the timeseries files")
+
+            # Calculate statistics at all three levels
+            print("\n" + "-"*40)
+            print(f"{self.section_label} DISTRIBUTION STATISTICS")
+            print("-"*40)
+
+            hourly_stats = self.calculate_hourly_statistics(df_filtered, month_order_map)
+            daily_stats = self.calculate_daily_statistics(df_filtered, month_order_map)
+            monthly_stats = self.calculate_monthly_statistics(df_filtered, month_order_map)
+
+            # Create timeseries
+            print("\n" + "-"*40)
+            print(f"{self.section_label} TIMESERIES GENERATION")
+            print("-"*40)
+
+            timeseries = self.create_timeseries(df_filtered, month_order_map)
+
+            self.finish_site(site_name, start_month, end_month,
+                             hourly_stats, daily_stats, monthly_stats, timeseries, input_hash)
+            if self.incremental:
+                self.save_incremental_state(site_name, df)
+
+            return True
+
+        except Exception as e:
+            print(f"\n❌ Error processing {site_name}: {str(e)}")
+            return False
+
+    def finish_site(self, site_name, start_month, end_month,
+                    hourly_stats, daily_stats, monthly_stats, timeseries, input_hash=None):
+        """Print samples, save every output and record the build"""
+        self.print_sample_results(hourly_stats, daily_stats, monthly_stats, timeseries)
+
+        print("\n" + "-"*40)
+        print("SAVING RESULTS")
+        print("-"*40)
+
+        self.save_all_results(hourly_stats, daily_stats, monthly_stats, timeseries, site_name)
+        self.record_build(site_name, start_month, end_month, input_hash)
+
+    def update_site_incremental(self, site_name, start_month, end_month, input_hash=None):
+        """
+        Fold the rows appended to the site's combined file since its last build
+        into the incremental state, then rewrite the outputs from that state.
+        Returns True / False for success, or None when there is no usable state
+        (no earlier build, or the file was changed other than by appending) and
+        a full build is needed.
+        """
+        state_path = self.incremental_state_path(site_name)
+        state = IncrementalState.load(state_path)
+        if state is None:
+            return None
+
+        file_path = combined_file_path(site_name, self.data_path, self.site_file_map)
+        appended = state.read_appended(file_path, lambda source: load_combined_frame(source, self.input_columns))
+        if appended is None:
+            print(f"\n⚠️  {file_path.name} changed beyond appended rows, full rebuild needed")
+            return None
+
+        self.written_files = []
+        month_order_map = self.create_month_order_map(start_month, end_month)
+        months_in_range = self.get_months_in_range(start_month, end_month)
+
+        print(f"\n{'='*60}")
+        print(f"Updating: {site_name} (incremental)")
+        print(f"{'='*60}")
+
+        try:
+            df_new, state.offset, state.prefix_sha256, df_partial = appended
+            print(f"\n📊 Folding {len(df_new):,} new hourly rows into the running statistics")
+            if len(df_new):
+                state.fold(self.incremental_values(df_new))
+
+            # The trailing partial month goes into the outputs but not the saved
+            # state, so the outputs match a full build of the whole file
+            output_state = state
+            if len(df_partial):
+                print(f"   Including {len(df_partial):,} hours of the partial last month")
+                output_state = copy.deepcopy(state)
+                output_state.fold(self.incremental_values(df_partial))
+
+            hourly_stats, daily_stats, monthly_stats = self.statistics_from_state(
+                output_state, months_in_range, month_order_map)
+            timeseries = self.timeseries_from_state(output_state, months_in_range, month_order_map)
+
+            self.finish_site(site_name, start_month, end_month,
+                             hourly_stats, daily_stats, monthly_stats, timeseries, input_hash)
+            state.save(state_path)
+            return True
+
+        except Exception as e:
+            print(f"\n❌ Error updating {site_name}: {str(e)}")
+            return False
+
+    def run_simulation(self):
+        """
+        Main function to run the simulation interactively
+        """
+        for line in self.run_banner:
+            print(line)
+        print("="*60)
+
+        # Get site selection
+        site_selection = self.get_site_selection()
+        if not site_selection:
+            return
+
+        # Get automatic month range
+        start_month, end_month = self.get_automatic_month_range()
+
+        # Process based on selection
+        if site_selection == 'ALL_SITES':
+            print("\n" + "="*60)
+            print("🚀 PROCESSING ALL SITES")
+            print("="*60)
+
+            successful = 0
+            failed = 0
+
+            for i, site_name in enumerate(self.available_sites, 1):
+                print(f"\n[{i}/{len(self.available_sites)}] Processing {site_name}...")
+
+                if self.process_single_site(site_name, start_month, end_month):
+                    successful += 1
+                else:
+                    failed += 1
+
+            # Summary
+            print("\n" + "="*60)
+            print("✨ ALL SITES PROCESSING COMPLETE!")
+            print("="*60)
+            print(f"\n📊 Summary:")
+            print(f"   ✅ Successfully processed: {successful} sites")
+            if failed > 0:
+                print(f"   ❌ Failed: {failed} sites")
+
+            print(f"\n12-month period: {self.month_names[start_month]} to {self.month_names[end_month]}")
+            print(f"\n📁 Files saved in: {self.base_output_path.name}/[site_name]/{self.output_folder}/")
+
+        else:
+            # Process single site
+            if self.process_single_site(site_selection, start_month, end_month):
+                print("\n" + "="*60)
+                print(self.complete_banner)
+                print("="*60)
+                print(f"\nAnalysis created for {site_selection}")
+
+                print(f"12-month period: {self.month_names[start_month]} to {self.month_names[end_month]}")
+
+                print(f"\n📁 Files saved in:")
+                print(f"   {self.base_output_path.name}/{site_selection}/{self.output_folder}/")
+                for description in self.output_descriptions:
+                    print(f"     • {description}")
+                print(f"   {self.base_output_path.name}/{site_selection}/plots/")
+                print("     • (Ready for future visualizations)")
+
+                if self.key_features:
+                    print("\n💡 Key features:")
+                    for feature in self.key_features:
+                        print(f"   • {feature}")
+
+        # Ask if user wants to create another simulation
+        another = input(f"\n🔄 Create another {self.metric_label} simulation? (y/n): ").strip().lower()
+        if another == 'y':
+            self.run_simulation()
+
+    @property
+    def metric_label(self):
+        """Lower-case metric name for prompts, e.g. 'day-ahead price'"""
+        return self.section_label.lower()
+
+
+def run_site(site_name, start_month, end_month, metrics, data_path=DATA_PATH,
+             base_output_path=OUTPUT_PATH, force=False, incremental=False):
+    """
+    Run several metrics for one site on a single load of its combined file.
+    metrics are SimulationPipeline subclasses or instances. Metrics whose input
+    hash and parameters match the site manifest are skipped unless force is set.
+    With incremental, metrics that support it fold only the rows appended since
+    their last build; the file is loaded only for metrics that still need a
+    full build. Returns {metric: BUILT | SKIPPED | FAILED}.
+    """
+    simulations = [m if isinstance(m, SimulationPipeline) else m(data_path, base_output_path)
+                   for m in metrics]
+    if not simulations:
+        return {}
+
+    file_path = combined_file_path(site_name, simulations[0].data_path, simulations[0].site_file_map)
+    try:
+        input_hash = file_hash(file_path)
+    except OSError as e:
+        print(f"\n❌ Error loading {site_name}: {str(e)}")
+        return {sim.metric: FAILED for sim in simulations}
+
+    results = {}
+    pending = []
+    for sim in simulations:
+        if not force and sim.is_up_to_date(site_name, start_month, end_month, input_hash):
+            print(f"\n⏭️  {site_name} {sim.metric}: input and parameters unchanged, skipping")
+            results[sim.metric] = SKIPPED
+            continue
+        if incremental and sim.incremental:
+            ok = sim.update_site_incremental(site_name, start_month, end_month, input_hash)
+            if ok is not None:
+                results[sim.metric] = BUILT if ok else FAILED
+                continue
+        results[sim.metric] = None
+        pending.append(sim)
+
+    if not pending:
+        return results
+
+    # One load with the value columns of every pending metric
+    if any(sim.input_columns is None for sim in pending):
+        columns = None
+    else:
+        columns = list(dict.fromkeys(col for sim in pending for col in sim.input_columns))
+    try:
+        df = pending[0].load_site_data(site_name, columns)
+    except Exception as e:
+        print(f"\n❌ Error loading {site_name}: {str(e)}")
+        return {metric: status or FAILED for metric, status in results.items()}
+
+    for sim in pending:
+        ok = sim.process_single_site(site_name, start_month, end_month, df=df, input_hash=input_hash)
+        results[sim.metric] = BUILT if ok else FAILED
+    return results
@@ -0,0 +1,322 @@
+"""
+Portfolio totals across sites.
+
+PortfolioStack lines up the monthly, daily or hourly timeseries of every site
+on one float32 array, sites x rows x years, with the rows keyed by month,
+day_of_year or hour_of_year in forecast-window order and the years being
+the union of every site's year columns (NaN where a site has no value).
+Portfolio totals, their bands across years and per-site contributions are
+reductions over that array, so adding sites adds rows to one array rather
+than another pass over the files.
+
+    stack = load_portfolio('Renewable Portfolio LLC', 'generation', 'monthly')
+    bands = aggregate_view(stack.total_frame(), 'monthly')
+    table = stack.contributions()
+    risk = stack.risk()
+
+Portfolio P-values are taken from the year-by-year sum of the sites, so a
+dry or low-price year hits every site at once, as it did historically; the
+sum of each site's own P5 would assume every site has its bad year together
+and overstate the portfolio's risk. risk() also bootstraps the years
+(resampling whole years, which keeps the sites' joint behaviour) to show how
+far the P-values can be trusted with a dozen or so years of history.
+
+Totals only make sense for additive metrics (generation and revenue), not
+prices.
+
+A site whose timeseries cannot be read or lacks the key columns of the view
+(e.g. a git-lfs pointer in a clone without `git lfs pull`) is left out of the
+stack and listed with the reason in stack.skipped.
+"""
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from simulation.columnar import COLUMNAR_AVAILABLE, columnar_path, is_year_column, read_columnar
+from simulation.time_keys import (
+    DAY_KEY,
+    HOUR_KEY,
+    KEY_DTYPE,
+    MONTH_NAMES_FULL,
+    calendar_of_day,
+    day_of_year,
+    hour_of_year,
+)
+
+PORTFOLIO_METRICS = ('generation', 'revenue')
+PORTFOLIO_VIEWS = ('monthly', 'daily', 'hourly')
+CONTRIBUTION_COLUMNS = ['site', 'mean', 'p5', 'p95', 'share', 'years']
+
+RISK_PERCENTILES = (5, 10, 50, 90, 95)
+RISK_COLUMNS = ['percentile', 'portfolio', 'sum_of_sites', 'diversification',
+                'bootstrap_mean', 'ci_low', 'ci_high']
+BOOTSTRAP_RESAMPLES = 5000
+# Bootstrap interval reported around every P-value
+CONFIDENCE_PERCENTILES = (2.5, 97.5)
+
+
+def timeseries_file(site_folder, metric, view):
+    """A site's {metric} {view} timeseries (the columnar copy when readable), or None"""
+    metric_folder = Path(site_folder) / metric.capitalize()
+    matches = sorted(metric_folder.glob(f'*_{metric}_{view}_timeseries.csv'))
+    if not matches:
+        return None
+    parquet_file = columnar_path(matches[0])
+    if COLUMNAR_AVAILABLE and parquet_file.exists():
+        return parquet_file
+    return matches[0]
+
+
+def read_timeseries(file_path):
+    file_path = Path(file_path)
+    if file_path.suffix == '.parquet':
+        return read_columnar(file_path)
+    return pd.read_csv(file_path)
+
+
+def missing_key_columns(df, view):
+    """Key columns row_keys needs for the view that the frame lacks"""
+    if view == 'monthly':
+        needed = ['month']
+    elif view == 'daily':
+        needed = [] if DAY_KEY in df.columns else ['month', 'day']
+    elif view == 'hourly':
+        needed = [] if HOUR_KEY in df.columns else ['month', 'day', 'hour']
+    else:
+        raise ValueError(f"Unknown portfolio view: {view}")
+    return [col for col in needed if col not in df.columns]
+
+
+def row_keys(df, view):
+    """month, day_of_year or hour_of_year of every row of a timeseries frame"""
+    if view == 'monthly':
+        return df['month'].to_numpy(dtype=np.int64)
+    if view == 'daily':
+        if DAY_KEY in df.columns:
+            return df[DAY_KEY].to_numpy(dtype=np.int64)
+        return day_of_year(df['month'], df['day']).astype(np.int64)
+    if view == 'hourly':
+        if HOUR_KEY in df.columns:
+            return df[HOUR_KEY].to_numpy(dtype=np.int64)
+        return hour_of_year(df['month'], df['day'], df['hour']).astype(np.int64)
+    raise ValueError(f"Unknown portfolio view: {view}")
+
+
+def key_months(keys, view):
+    """Calendar month of every row key"""
+    keys = np.asarray(keys, dtype=np.int64)
+    if view == 'monthly':
+        return keys
+    if view == 'daily':
+        return calendar_of_day(keys)[0]
+    return calendar_of_day(keys // 24 + 1)[0]
+
+
+class PortfolioStack:
+    """
+    One metric and view of every site stacked as a sites x rows x years array
+    """
+
+    def __init__(self, metric, view, sites, keys, years, values, skipped=None):
+        self.metric = metric
+        self.view = view
+        self.sites = list(sites)
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self.years = list(years)
+        self.values = values
+        # Site -> reason it was left out
+        self.skipped = dict(skipped or {})
+
+    @classmethod
+    def from_frames(cls, frames, metric, view, skipped=None):
+        """
+        Stack {site name: timeseries frame}. Rows are the union of the sites'
+        keys, ordered from the first site's first month, and years the union
+        of their year columns. Frames without the view's key columns are
+        skipped and added to skipped (site -> reason).
+        """
+        skipped = dict(skipped or {})
+        for site, df in frames.items():
+            missing = missing_key_columns(df, view)
+            if missing:
+                skipped[site] = f"missing column(s) {', '.join(missing)}"
+        frames = {site: df for site, df in frames.items() if site not in skipped}
+        sites = list(frames)
+        site_keys = [row_keys(frames[site], view) for site in sites]
+        year_columns = [{str(col): col for col in frames[site].columns if is_year_column(col)}
+                        for site in sites]
+        years = sorted(set().union(*year_columns), key=int) if sites else []
+
+        if sites and len(site_keys[0]):
+            keys = np.unique(np.concatenate(site_keys))
+            start_month = key_months(site_keys[0][:1], view)[0]
+            # Forecast-window order: months from the window start, keys ascending within a month
+            keys = keys[np.lexsort((keys, (key_months(keys, view) - start_month) % 12))]
+        else:
+            keys = np.empty(0, dtype=np.int64)
+
+        values = np.full((len(sites), len(keys), len(years)), np.nan, dtype=np.float32)
+        key_order = np.argsort(keys)
+        sorted_keys = keys[key_order]
+        year_position = {year: i for i, year in enumerate(years)}
+        for i, site in enumerate(sites):
+            rows = key_order[np.searchsorted(sorted_keys, site_keys[i])]
+            columns = [year_position[year] for year in year_columns[i]]
+            matrix = frames[site][list(year_columns[i].values())]
+            try:
+                matrix = matrix.to_numpy(dtype=np.float32)
+            except (TypeError, ValueError):
+                # Blank or malformed cells in a CSV read as text
+                matrix = matrix.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float32)
+            values[i][np.ix_(rows, columns)] = matrix
+
+        return cls(metric, view, sites, keys, years, values, skipped)
+
+    def total(self):
+        """
+        Portfolio total of every row and year (rows x years, float64).
+        NaN where any site has no value, so a total never mixes in a partial portfolio.
+        """
+        return self.values.sum(axis=0, dtype=np.float64)
+
+    def total_frame(self):
+        """
+        The portfolio total as a timeseries frame (key columns and one column per
+        year), ready for aggregate_view
+        """
+        frame = {}
+        if self.view == 'monthly':
+            frame['month_name'] = [MONTH_NAMES_FULL[month] for month in self.keys]
+            frame['month'] = self.keys
+        elif self.view == 'daily':
+            months, days = calendar_of_day(self.keys)
+            frame[DAY_KEY] = self.keys.astype(KEY_DTYPE)
+            frame['month'] = months
+            frame['day'] = days
+        else:
+            months, days = calendar_of_day(self.keys // 24 + 1)
+            frame[HOUR_KEY] = self.keys.astype(KEY_DTYPE)
+            frame['month'] = months
+            frame['day'] = days
+            frame['hour'] = self.keys % 24
+
+        totals = self.total()
+        for i, year in enumerate(self.years):
+            frame[year] = totals[:, i]
+        return pd.DataFrame(frame)
+
+    def window_totals(self):
+        """
+        Total over the forecast window of every site and year (sites x years).
+        NaN for years a site does not cover completely, so on the monthly view
+        only full twelve-month years count.
+        """
+        complete = ~np.isnan(self.values).any(axis=1)
+        totals = self.values.sum(axis=1, dtype=np.float64)
+        totals[~complete] = np.nan
+        return totals
+
+    def contributions(self):
+        """
+        Mean, P5 and P95 across complete years of every site's window total and
+        its share of the summed site means, followed by a 'Portfolio' row for
+        the total over the years every site covers
+        """
+        if not self.sites:
+            return pd.DataFrame(columns=CONTRIBUTION_COLUMNS)
+
+        site_totals = self.window_totals()
+        totals = np.vstack([site_totals, site_totals.sum(axis=0)])
+
+        with warnings.catch_warnings():
+            # Sites without a complete year give NaN statistics
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nanmean(totals, axis=1)
+            p5, p95 = np.nanpercentile(totals, [5, 95], axis=1)
+
+        site_sum = np.nansum(mean[:-1])
+        share = mean / site_sum if site_sum else np.full(len(mean), np.nan)
+        share[-1] = 1.0
+        return pd.DataFrame({
+            'site': self.sites + ['Portfolio'],
+            'mean': mean,
+            'p5': p5,
+            'p95': p95,
+            'share': share,
+            'years': (~np.isnan(totals)).sum(axis=1),
+        }, columns=CONTRIBUTION_COLUMNS)
+
+    def risk(self, percentiles=RISK_PERCENTILES, n_resamples=BOOTSTRAP_RESAMPLES, seed=None):
+        """
+        Portfolio P-values of the forecast-window total over the years every
+        site covers in full:
+
+            portfolio        percentile of the year-by-year sum of the sites
+            sum_of_sites     sum of every site's own percentile
+            diversification  portfolio - sum_of_sites
+            bootstrap_mean   mean of the percentile over resampled years
+            ci_low, ci_high  CONFIDENCE_PERCENTILES of the resampled percentile
+
+        Empty when no year is complete for every site.
+        """
+        site_totals = self.window_totals()
+        common = ~np.isnan(site_totals).any(axis=0) if self.sites else np.zeros(0, dtype=bool)
+        if not common.any():
+            return pd.DataFrame(columns=RISK_COLUMNS)
+
+        site_totals = site_totals[:, common]
+        portfolio_totals = site_totals.sum(axis=0)
+        portfolio = np.percentile(portfolio_totals, percentiles)
+        sum_of_sites = np.percentile(site_totals, percentiles, axis=1).sum(axis=1)
+
+        resampled = bootstrap_percentiles(portfolio_totals, percentiles, n_resamples, seed)
+        ci_low, ci_high = np.percentile(resampled, CONFIDENCE_PERCENTILES, axis=-1)
+
+        return pd.DataFrame({
+            'percentile': list(percentiles),
+            'portfolio': portfolio,
+            'sum_of_sites': sum_of_sites,
+            'diversification': portfolio - sum_of_sites,
+            'bootstrap_mean': resampled.mean(axis=-1),
+            'ci_low': ci_low,
+            'ci_high': ci_high,
+        }, columns=RISK_COLUMNS)
+
+
+def bootstrap_percentiles(values, percentiles, n_resamples=BOOTSTRAP_RESAMPLES, seed=None):
+    """
+    Percentiles across years of n_resamples bootstrap samples of the years.
+    values is (..., years) and every sample draws the same year indices for
+    all leading rows, so rows from one year (sites, months) stay together.
+    Returns (len(percentiles), ..., n_resamples).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    n_years = values.shape[-1]
+    samples = rng.integers(0, n_years, size=(n_resamples, n_years))
+    # (..., n_resamples, years) in one gather
+    return np.percentile(values[..., samples], percentiles, axis=-1)
+
+
+def load_portfolio(portfolio_path, metric, view, sites=None):
+    """
+    Stack of one metric and view across the sites of a portfolio folder
+    (every site folder with the timeseries, unless sites are given). Sites
+    whose timeseries cannot be read are listed in stack.skipped.
+    """
+    portfolio_path = Path(portfolio_path)
+    if sites is None:
+        sites = sorted(folder.name for folder in portfolio_path.iterdir() if folder.is_dir())
+
+    frames, skipped = {}, {}
+    for site in sites:
+        file_path = timeseries_file(portfolio_path / site, metric, view)
+        if file_path is None:
+            continue
+        try:
+            frames[site] = read_timeseries(file_path)
+        except (OSError, ValueError) as e:
+            skipped[site] = f"cannot read {Path(file_path).name}: {e}"
+    return PortfolioStack.from_frames(frames, metric, view, skipped)
@@ -0,0 +1,190 @@
+"""
+Synthetic years by block-bootstrapping chronological weeks of history.
+
+The P-bands of the simulations rest on the dozen or so historical years of a
+site's combined hourly file. ScenarioGenerator builds as many synthetic years
+as needed from the same history: the year is cut into 53 chronological weeks
+on the leap-year hour_of_year calendar (see time_keys; the last week holds
+Dec-30 and Dec-31), and every week of every scenario is copied whole from a
+randomly drawn historical year, at the same week of the year or one of its
+neighbours (shift_weeks). Generation, RT price, DA price and revenue of a
+week always come from the same historical hours, so the joint
+generation-price behaviour within a week (solar peaks against evening price
+spikes, a windy week with low prices) is kept as it happened.
+
+    generator = ScenarioGenerator.from_file(combined_file_path('Misae_Solar'))
+    cubes = generator.generate(10_000, seed=0)     # {metric: scenarios x 8784 float32}
+    bands = hourly_percentiles(cubes['price'], [1, 50, 99])
+
+Only the block choices (scenarios x weeks) are drawn up front; the cubes are
+gathered chunk_size scenarios at a time, straight into the output arrays,
+which may be preallocated (e.g. memory-mapped) to bound memory further. One
+float32 cube of 10,000 scenarios is 10,000 x 8,784 x 4 bytes = 351 MB.
+"""
+import numpy as np
+
+from simulation.time_keys import HOUR_KEY, hour_of_year
+
+# Scenario metric -> column of the combined hourly file
+SCENARIO_COLUMNS = {
+    'generation': 'generation_mw',
+    'price': 'price',
+    'price_da': 'price_da',
+    'revenue': 'revenue',
+}
+
+DAYS_PER_YEAR = 366
+HOURS_PER_DAY = 24
+HOURS_PER_YEAR = DAYS_PER_YEAR * HOURS_PER_DAY
+BLOCK_DAYS = 7
+N_BLOCKS = -(-DAYS_PER_YEAR // BLOCK_DAYS)
+# Day index (0-based day_of_year) of Feb-29
+FEB_29 = 59
+
+DEFAULT_SCENARIOS = 10_000
+DEFAULT_SHIFT_WEEKS = 1
+CHUNK_SCENARIOS = 500
+
+_DAY_BLOCK = np.arange(DAYS_PER_YEAR) // BLOCK_DAYS
+_BLOCK_LENGTHS = np.bincount(_DAY_BLOCK, minlength=N_BLOCKS)
+
+
+def history_matrices(df, metrics):
+    """
+    {metric: years x 366 x 24 float32} of a combined hourly frame on the
+    hour_of_year calendar, and the list of years. Non-leap years repeat
+    Feb-28 as Feb-29, and a single missing hour (a DST gap) takes the
+    previous hour's values; any other missing hour stays NaN.
+    """
+    years = np.sort(df['year'].unique()).astype(int)
+    year_rows = np.searchsorted(years, df['year'].to_numpy())
+    if HOUR_KEY in df.columns:
+        hours = df[HOUR_KEY].to_numpy(dtype=np.int64)
+    else:
+        hours = hour_of_year(df['month'], df['day'], df['hour']).astype(np.int64)
+
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    history = {}
+    for metric in metrics:
+        matrix = np.full((len(years), HOURS_PER_YEAR), np.nan, dtype=np.float32)
+        matrix[year_rows, hours] = df[SCENARIO_COLUMNS[metric]].to_numpy(dtype=np.float32)
+
+        # Isolated gaps only: the hours before and after must be present
+        present = ~np.isnan(matrix)
+        gap = ~present[:, 1:-1] & present[:, :-2] & present[:, 2:]
+        matrix[:, 1:-1][gap] = matrix[:, :-2][gap]
+
+        matrix = matrix.reshape(len(years), DAYS_PER_YEAR, HOURS_PER_DAY)
+        matrix[~leap, FEB_29] = matrix[~leap, FEB_29 - 1]
+        history[metric] = matrix
+
+    return history, list(years)
+
+
+class ScenarioGenerator:
+    """
+    Block bootstrap of chronological weeks from years x 366 x 24 history matrices
+    """
+
+    def __init__(self, history, years, shift_weeks=DEFAULT_SHIFT_WEEKS):
+        self.history = history
+        self.metrics = list(history)
+        self.years = list(years)
+        self.shift_weeks = shift_weeks
+
+        # A historical week can be drawn when every metric has all of its hours
+        complete = np.ones((len(self.years), DAYS_PER_YEAR), dtype=bool)
+        for matrix in history.values():
+            complete &= ~np.isnan(matrix).any(axis=2)
+        block_complete = np.logical_and.reduceat(complete, np.arange(0, DAYS_PER_YEAR, BLOCK_DAYS), axis=1)
+
+        # Candidate (year, source week) pairs of every week, padded to the largest count
+        candidates = []
+        for block in range(N_BLOCKS):
+            sources = [source for source in range(block - shift_weeks, block + shift_weeks + 1)
+                       if 0 <= source < N_BLOCKS and _BLOCK_LENGTHS[source] == _BLOCK_LENGTHS[block]]
+            year_index, source_index = np.nonzero(block_complete[:, sources])
+            if not len(year_index):
+                raise ValueError(f"No complete historical week to draw week {block + 1} of the year from")
+            candidates.append((year_index, np.asarray(sources)[source_index]))
+
+        width = max(len(year_index) for year_index, _ in candidates)
+        self.candidate_counts = np.array([len(year_index) for year_index, _ in candidates])
+        self.candidate_years = np.zeros((N_BLOCKS, width), dtype=np.int64)
+        self.candidate_blocks = np.zeros((N_BLOCKS, width), dtype=np.int64)
+        for block, (year_index, sources) in enumerate(candidates):
+            self.candidate_years[block, :len(year_index)] = year_index
+            self.candidate_blocks[block, :len(year_index)] = sources
+
+    @classmethod
+    def from_frame(cls, df, metrics=None, shift_weeks=DEFAULT_SHIFT_WEEKS):
+        """Generator over the metrics of a combined hourly frame (default: every column present)"""
+        if metrics is None:
+            metrics = [metric for metric, col in SCENARIO_COLUMNS.items() if col in df.columns]
+        history, years = history_matrices(df, metrics)
+        return cls(history, years, shift_weeks)
+
+    @classmethod
+    def from_file(cls, file_path, metrics=None, shift_weeks=DEFAULT_SHIFT_WEEKS):
+        """Generator over a site's combined hourly file"""
+        from simulation.pipeline import load_combined_frame
+
+        columns = None if metrics is None else [SCENARIO_COLUMNS[metric] for metric in metrics]
+        return cls.from_frame(load_combined_frame(file_path, columns), metrics, shift_weeks)
+
+    def draw_blocks(self, n_scenarios, seed=None):
+        """
+        Historical year index and source week of every week of every scenario,
+        two (n_scenarios, N_BLOCKS) arrays
+        """
+        rng = np.random.default_rng(seed)
+        picks = (rng.random((n_scenarios, N_BLOCKS)) * self.candidate_counts).astype(np.int64)
+        blocks = np.arange(N_BLOCKS)
+        return self.candidate_years[blocks, picks], self.candidate_blocks[blocks, picks]
+
+    def iter_chunks(self, n_scenarios=DEFAULT_SCENARIOS, seed=None, metrics=None,
+                    chunk_size=CHUNK_SCENARIOS):
+        """
+        Yield (scenario slice, {metric: chunk x 8784 float32}) in chunks of at
+        most chunk_size scenarios. The scenarios do not depend on chunk_size.
+        """
+        metrics = self.metrics if metrics is None else list(metrics)
+        year_index, source_blocks = self.draw_blocks(n_scenarios, seed)
+
+        for start in range(0, n_scenarios, chunk_size):
+            rows = slice(start, min(start + chunk_size, n_scenarios))
+            # Historical year and day behind every day of the chunk's scenarios
+            source_years = year_index[rows][:, _DAY_BLOCK]
+            source_days = np.arange(DAYS_PER_YEAR) + BLOCK_DAYS * (source_blocks[rows][:, _DAY_BLOCK] - _DAY_BLOCK)
+            yield rows, {metric: self.history[metric][source_years, source_days].reshape(-1, HOURS_PER_YEAR)
+                         for metric in metrics}
+
+    def generate(self, n_scenarios=DEFAULT_SCENARIOS, seed=None, metrics=None,
+                 chunk_size=CHUNK_SCENARIOS, out=None):
+        """
+        {metric: n_scenarios x 8784 float32} scenario cubes, columns keyed by
+        hour_of_year. out may map metrics to preallocated arrays of that shape.
+        """
+        metrics = self.metrics if metrics is None else list(metrics)
+        cubes = dict(out or {})
+        for metric in metrics:
+            if metric not in cubes:
+                cubes[metric] = np.empty((n_scenarios, HOURS_PER_YEAR), dtype=np.float32)
+
+        for rows, chunk in self.iter_chunks(n_scenarios, seed, metrics, chunk_size):
+            for metric, values in chunk.items():
+                cubes[metric][rows] = values
+
+        return {metric: cubes[metric] for metric in metrics}
+
+
+def hourly_percentiles(cube, percentiles, chunk_hours=732):
+    """
+    Percentiles across scenarios of every hour of a scenario cube,
+    (len(percentiles), hours), computed chunk_hours columns at a time
+    """
+    result = np.empty((len(percentiles), cube.shape[1]))
+    for start in range(0, cube.shape[1], chunk_hours):
+        columns = slice(start, start + chunk_hours)
+        result[:, columns] = np.percentile(cube[:, columns], percentiles, axis=0)
+    return result
@@ -0,0 +1,192 @@
+"""
+Memory-mapped hourly cube of a site.
+
+Every metric's hourly timeseries is a years x hours matrix. The simulations
+write them all into one float32 array per site, metric x year x hour_of_year
+(8784 hours on the leap-year calendar, NaN where a year has no value),
+saved as {site}_hourly_cube.npy with a small JSON header for the axes:
+
+    {site}_hourly_cube.json
+        metrics   cube metric of every plane, e.g. 'price', 'price_compressed'
+        years     year of every row
+        windows   per metric, the months of its forecast window in order
+        decimals  per metric, the decimals the timeseries files are written with
+
+SiteCube.open maps the .npy read-only, so opening a site costs a page fault
+rather than a CSV parse, matrix() slices a metric without copying and
+processes reading the same site share the OS page cache. Each metric rewrites
+only its own planes; the file is replaced atomically, so readers holding the
+previous mapping keep a consistent view.
+
+    cube = SiteCube.open(portfolio_path / site_name)
+    prices = cube.matrix('price')                # years x 8784 view
+    frame = cube.timeseries_frame('price')       # like the hourly timeseries file
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from simulation.columnar import is_year_column
+from simulation.time_keys import (
+    DAYS_IN_MONTH,
+    HOUR_KEY,
+    KEY_DTYPE,
+    MONTH_OFFSETS,
+    calendar_of_day,
+)
+
+CUBE_SUFFIX = '_hourly_cube.npy'
+HEADER_SUFFIX = '_hourly_cube.json'
+CUBE_FORMAT = 1
+HOURS_PER_YEAR = 366 * 24
+
+
+def cube_file_names(site_name):
+    """(cube, header) file names of a site"""
+    return f"{site_name}{CUBE_SUFFIX}", f"{site_name}{HEADER_SUFFIX}"
+
+
+def cube_paths(site_folder):
+    """(cube, header) paths inside a site folder, named after the folder"""
+    site_folder = Path(site_folder)
+    cube_name, header_name = cube_file_names(site_folder.name)
+    return site_folder / cube_name, site_folder / header_name
+
+
+def month_hours(month):
+    """hour_of_year keys of a calendar month, ascending"""
+    return np.arange(MONTH_OFFSETS[month] * 24, (MONTH_OFFSETS[month] + DAYS_IN_MONTH[month]) * 24)
+
+
+class SiteCube:
+    """
+    metric x year x hour_of_year float32 values of one site, with their axes
+    """
+
+    def __init__(self, values, metrics, years, windows, decimals):
+        self.values = values
+        self.metrics = list(metrics)
+        self.years = [int(year) for year in years]
+        self.windows = {metric: [int(month) for month in months] for metric, months in windows.items()}
+        self.decimals = dict(decimals)
+
+    @classmethod
+    def open(cls, site_folder, mmap_mode='r'):
+        """
+        Map a site's cube, or None when the site has none or the cube and
+        header do not match
+        """
+        cube_path, header_path = cube_paths(site_folder)
+        if not cube_path.exists() or not header_path.exists():
+            return None
+        with open(header_path) as f:
+            header = json.load(f)
+        values = np.load(cube_path, mmap_mode=mmap_mode)
+        if header.get('format') != CUBE_FORMAT or list(values.shape) != header['shape']:
+            return None
+        return cls(values, header['metrics'], header['years'], header['windows'], header['decimals'])
+
+    def __contains__(self, metric):
+        return metric in self.metrics
+
+    def matrix(self, metric):
+        """years x 8784 values of a metric, a view of the mapped file"""
+        return self.values[self.metrics.index(metric)]
+
+    def window_keys(self, metric):
+        """
+        hour_of_year keys of the metric's forecast window in window order,
+        the hours with a value in at least one year
+        """
+        keys = np.concatenate([month_hours(month) for month in self.windows[metric]])
+        has_value = ~np.isnan(self.matrix(metric)[:, keys]).all(axis=0)
+        return keys[has_value]
+
+    def timeseries_frame(self, metric):
+        """
+        The metric's hourly timeseries as the simulations write it: hour_of_year,
+        month, day and hour columns and one float column per year
+        """
+        keys = self.window_keys(metric)
+        months, days = calendar_of_day(keys // 24 + 1)
+        frame = {
+            HOUR_KEY: keys.astype(KEY_DTYPE),
+            'month': months,
+            'day': days,
+            'hour': keys % 24,
+        }
+        values = self.matrix(metric)[:, keys]
+        for i, year in enumerate(self.years):
+            frame[year] = values[i]
+        return pd.DataFrame(frame)
+
+
+def frame_matrix(df, decimals=None):
+    """
+    (years, years x 8784 float32 matrix) of an hourly timeseries frame, rounded
+    like the saved timeseries
+    """
+    year_cols = [col for col in df.columns if is_year_column(col)]
+    values = df[year_cols].to_numpy(dtype=float)
+    if decimals is not None:
+        values = values.round(decimals)
+
+    matrix = np.full((len(year_cols), HOURS_PER_YEAR), np.nan, dtype=np.float32)
+    matrix[:, df[HOUR_KEY].to_numpy(dtype=np.int64)] = values.T
+    return [int(col) for col in year_cols], matrix
+
+
+def write_site_cube(site_folder, timeseries, decimals=None):
+    """
+    Write hourly timeseries frames ({cube metric: frame}, rows in forecast-window
+    order) into the site's cube, keeping the planes of every other metric.
+    Returns the (cube, header) paths.
+    """
+    cube_path, header_path = cube_paths(site_folder)
+    existing = SiteCube.open(site_folder)
+
+    # Planes keep their position, so the metric order only grows at the end
+    planes, windows, metric_decimals = {}, {}, {}
+    if existing is not None:
+        for metric in existing.metrics:
+            planes[metric] = (existing.years, np.array(existing.matrix(metric)))
+            windows[metric] = existing.windows[metric]
+            metric_decimals[metric] = existing.decimals[metric]
+    for metric, df in timeseries.items():
+        planes[metric] = frame_matrix(df, decimals)
+        windows[metric] = [int(month) for month in pd.unique(df['month'])]
+        metric_decimals[metric] = decimals
+
+    metrics = list(planes)
+    years = sorted(set().union(*(plane_years for plane_years, _ in planes.values())))
+    year_position = {year: i for i, year in enumerate(years)}
+    values = np.full((len(metrics), len(years), HOURS_PER_YEAR), np.nan, dtype=np.float32)
+    for i, metric in enumerate(metrics):
+        plane_years, matrix = planes[metric]
+        values[i, [year_position[year] for year in plane_years]] = matrix
+
+    header = {
+        'format': CUBE_FORMAT,
+        'dtype': 'float32',
+        'shape': list(values.shape),
+        'axes': ['metric', 'year', HOUR_KEY],
+        'metrics': metrics,
+        'years': years,
+        'windows': windows,
+        'decimals': metric_decimals,
+    }
+
+    # Replace both files whole, so a reader never maps a half-written cube
+    temp_cube = cube_path.with_name(cube_path.name + '.tmp')
+    with open(temp_cube, 'wb') as f:
+        np.save(f, values)
+    os.replace(temp_cube, cube_path)
+    temp_header = header_path.with_name(header_path.name + '.tmp')
+    with open(temp_header, 'w') as f:
+        json.dump(header, f, indent=2)
+    os.replace(temp_header, header_path)
+
+    return cube_path, header_path
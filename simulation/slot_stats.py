@@ -0,0 +1,193 @@
+"""
+Vectorized per-slot statistics for the simulations.
+
+A slot is one group of rows, e.g. the same month/day/hour across all years.
+Rows are ordered by slot once (keeping their original order inside each slot)
+and slots of equal size are stacked into a slot x year matrix, so every
+statistic costs one numpy call per distinct slot size. Results are identical
+to computing them slot by slot.
+"""
+import numpy as np
+import pandas as pd
+
+
+class SlotLayout:
+    """
+    Rows grouped into slots, with equal-size slots stacked into matrices
+    """
+
+    def __init__(self, slot_ids):
+        self.slot_ids = np.asarray(slot_ids)
+        self.n_slots = int(self.slot_ids.max()) + 1 if len(self.slot_ids) else 0
+        self.order = np.argsort(self.slot_ids, kind='stable')
+        self.counts = np.bincount(self.slot_ids, minlength=self.n_slots)
+        self.starts = np.concatenate(([0], np.cumsum(self.counts)[:-1])).astype(int)
+
+    @classmethod
+    def from_frame(cls, df, keys):
+        """Slots of df grouped by the key columns"""
+        return cls(slot_ids_for(df, keys))
+
+    def first_rows(self):
+        """Position of the first row of every slot"""
+        return self.order[self.starts]
+
+    def buckets(self, min_count=1):
+        """
+        Yield (slots, rows) for each distinct slot size, where rows is a
+        (len(slots), size) matrix of row positions, one slot per row
+        """
+        for size in np.unique(self.counts[self.counts >= max(min_count, 1)]):
+            slots = np.flatnonzero(self.counts == size)
+            yield slots, self.order[self.starts[slots][:, None] + np.arange(size)]
+
+
+def slot_ids_for(df, keys):
+    """Integer slot id for every row of df, grouped by the key columns"""
+    return df.groupby(keys, sort=False).ngroup().to_numpy()
+
+
+def slot_percentiles(values, slot_ids, percentiles):
+    """
+    Percentiles of values within each slot.
+    Returns an array of shape (n_slots, len(percentiles)).
+    """
+    values = np.asarray(values, dtype=float)
+    layout = SlotLayout(slot_ids)
+
+    result = np.full((layout.n_slots, len(percentiles)), np.nan)
+    for slots, rows in layout.buckets():
+        result[slots] = np.percentile(values[rows], percentiles, axis=1).T
+
+    return result
+
+
+def compress_matrix(matrix, lower_pct, upper_pct, return_info=False):
+    """
+    Log-compress every row of a slot matrix outside its own [P_lower, P_upper] band.
+
+    return_info=True also returns the compression info of every row as arrays:
+    P_lower, P_upper, n_compressed_lower, n_compressed_upper, original_min,
+    original_max, compressed_min and compressed_max.
+    """
+    bounds = np.percentile(matrix, [lower_pct, upper_pct], axis=1, keepdims=True)
+    P_lower = np.broadcast_to(bounds[0], matrix.shape)
+    P_upper = np.broadcast_to(bounds[1], matrix.shape)
+
+    compressed = matrix.copy()
+    lower_mask = matrix < P_lower
+    compressed[lower_mask] = P_lower[lower_mask] - np.log1p(P_lower[lower_mask] - matrix[lower_mask])
+    upper_mask = matrix > P_upper
+    compressed[upper_mask] = P_upper[upper_mask] + np.log1p(matrix[upper_mask] - P_upper[upper_mask])
+
+    if not return_info:
+        return compressed
+
+    compression_info = {
+        'P_lower': bounds[0, :, 0],
+        'P_upper': bounds[1, :, 0],
+        'n_compressed_lower': lower_mask.sum(axis=1),
+        'n_compressed_upper': upper_mask.sum(axis=1),
+        'original_min': matrix.min(axis=1),
+        'original_max': matrix.max(axis=1),
+        'compressed_min': compressed.min(axis=1),
+        'compressed_max': compressed.max(axis=1),
+    }
+    return compressed, compression_info
+
+
+def compress_slot_values(df, value_col, keys, lower_pct, upper_pct, min_count=5):
+    """
+    Log-compress every value outside its slot's [P_lower, P_upper] band.
+    Slots with fewer than min_count rows are left uncompressed.
+    """
+    slot_ids = slot_ids_for(df, keys)
+    values = df[value_col].to_numpy(dtype=float)
+
+    bounds = slot_percentiles(values, slot_ids, [lower_pct, upper_pct])
+    counts = np.bincount(slot_ids, minlength=len(bounds))
+    bounds[counts < min_count] = np.nan
+
+    # Broadcast the slot thresholds back to the rows (NaN never compares true)
+    P_lower = bounds[slot_ids, 0]
+    P_upper = bounds[slot_ids, 1]
+
+    compressed = values.copy()
+    lower_mask = values < P_lower
+    compressed[lower_mask] = P_lower[lower_mask] - np.log1p(P_lower[lower_mask] - values[lower_mask])
+    upper_mask = values > P_upper
+    compressed[upper_mask] = P_upper[upper_mask] + np.log1p(values[upper_mask] - P_upper[upper_mask])
+
+    return compressed
+
+
+def _describe_matrix(matrix, percentiles, ddof, skipna):
+    """mean / std / min / max / percentiles of every row of a slot matrix"""
+    if skipna and np.isnan(matrix).any():
+        return (np.nanmean(matrix, axis=1), np.nanstd(matrix, axis=1, ddof=ddof),
+                np.nanmin(matrix, axis=1), np.nanmax(matrix, axis=1),
+                np.nanpercentile(matrix, percentiles, axis=1) if percentiles else None)
+    return (np.mean(matrix, axis=1), np.std(matrix, axis=1, ddof=ddof),
+            np.min(matrix, axis=1), np.max(matrix, axis=1),
+            np.percentile(matrix, percentiles, axis=1) if percentiles else None)
+
+
+def slot_statistics(df, keys, value_col, percentiles, min_count=5, ddof=0, skipna=False,
+                    compress=None, actual_percentiles=(), mean_cols=None):
+    """
+    Per-slot statistics of value_col in a single pass over the data.
+
+    Returns one row per slot with at least min_count rows, holding the key
+    columns, count, mean, std_dev, min, max and p{p} for every percentile.
+
+    compress=(lower_pct, upper_pct) first log-compresses each slot outside its
+    own percentile band: the statistics above then describe the compressed
+    values, and actual_mean / actual_min / actual_max / actual_p{p} (for
+    actual_percentiles) describe the raw ones. mean_cols maps output columns
+    to other columns whose per-slot mean is added, e.g.
+    {'avg_generation': 'generation_mw'}. skipna ignores NaN like pandas does.
+    """
+    percentiles = list(percentiles)
+    actual_percentiles = list(actual_percentiles)
+    mean_cols = mean_cols or {}
+
+    layout = SlotLayout.from_frame(df, keys)
+    values = df[value_col].to_numpy(dtype=float)
+    extra_values = {name: df[col].to_numpy(dtype=float) for name, col in mean_cols.items()}
+
+    columns = ['mean', 'std_dev', 'min', 'max'] + [f'p{p}' for p in percentiles]
+    if compress is not None:
+        columns += ['actual_mean', 'actual_min', 'actual_max'] + [f'actual_p{p}' for p in actual_percentiles]
+    stats = {col: np.full(layout.n_slots, np.nan) for col in columns + list(mean_cols)}
+
+    for slots, rows in layout.buckets(min_count):
+        raw = values[rows]
+        matrix = compress_matrix(raw, *compress) if compress is not None else raw
+
+        mean, std, vmin, vmax, pct = _describe_matrix(matrix, percentiles, ddof, skipna)
+        stats['mean'][slots] = mean
+        stats['std_dev'][slots] = std
+        stats['min'][slots] = vmin
+        stats['max'][slots] = vmax
+        for i, p in enumerate(percentiles):
+            stats[f'p{p}'][slots] = pct[i]
+
+        if compress is not None:
+            mean, _, vmin, vmax, pct = _describe_matrix(raw, actual_percentiles, ddof, skipna)
+            stats['actual_mean'][slots] = mean
+            stats['actual_min'][slots] = vmin
+            stats['actual_max'][slots] = vmax
+            for i, p in enumerate(actual_percentiles):
+                stats[f'actual_p{p}'][slots] = pct[i]
+
+        for name, extra in extra_values.items():
+            stats[name][slots] = np.mean(extra[rows], axis=1)
+
+    keep = layout.counts >= min_count
+    first_rows = layout.first_rows()[keep]
+    result = {key: df[key].to_numpy()[first_rows] for key in keys}
+    result['count'] = layout.counts[keep]
+    for col, arr in stats.items():
+        result[col] = arr[keep]
+
+    return pd.DataFrame(result)
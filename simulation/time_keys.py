@@ -0,0 +1,80 @@
+"""
+Compact integer time keys for the simulation outputs.
+
+Hourly rows are keyed by hour_of_year and daily rows by day_of_year, both
+int16 on a leap-year calendar so that Feb 29 always has its own slot and a
+key means the same calendar position in every year:
+
+    day_of_year   1 (Jan-01) .. 366 (Dec-31)
+    hour_of_year  (day_of_year - 1) * 24 + hour, 0 .. 8783
+
+The files store only these keys; labels such as 'Jan-05 13:00' are formatted
+from them when a chart or printout needs them.
+"""
+import numpy as np
+
+# Month names for labeling
+MONTH_NAMES = ['', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+MONTH_NAMES_FULL = ['', 'January', 'February', 'March', 'April', 'May', 'June',
+                    'July', 'August', 'September', 'October', 'November', 'December']
+
+HOUR_KEY = 'hour_of_year'
+DAY_KEY = 'day_of_year'
+KEY_DTYPE = np.int16
+
+DAYS_IN_MONTH = np.array([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+# Day of year before the first day of every month (index = month)
+MONTH_OFFSETS = np.cumsum(DAYS_IN_MONTH) - DAYS_IN_MONTH
+
+_DAY_MONTHS = np.repeat(np.arange(1, 13), DAYS_IN_MONTH[1:])
+_DAY_DAYS = np.concatenate([np.arange(1, n + 1) for n in DAYS_IN_MONTH[1:]])
+# Index 0 is unused so day_of_year indexes directly
+_DATE_LABELS = np.array([''] + [f"{MONTH_NAMES[m]}-{d:02d}" for m, d in zip(_DAY_MONTHS, _DAY_DAYS)],
+                        dtype=object)
+_HOUR_LABELS = np.array([f"{h:02d}:00" for h in range(24)], dtype=object)
+
+
+def day_of_year(month, day):
+    """day_of_year key of month/day arrays"""
+    month = np.asarray(month, dtype=np.int64)
+    return (MONTH_OFFSETS[month] + np.asarray(day, dtype=np.int64)).astype(KEY_DTYPE)
+
+
+def hour_of_year(month, day, hour):
+    """hour_of_year key of month/day/hour arrays"""
+    days = day_of_year(month, day).astype(np.int64) - 1
+    return (days * 24 + np.asarray(hour, dtype=np.int64)).astype(KEY_DTYPE)
+
+
+def calendar_of_day(day_key):
+    """(month, day) arrays of day_of_year keys"""
+    index = np.asarray(day_key, dtype=np.int64) - 1
+    return _DAY_MONTHS[index], _DAY_DAYS[index]
+
+
+def date_labels(day_key):
+    """'Mon-DD' label of every day_of_year key"""
+    return _DATE_LABELS[np.asarray(day_key, dtype=np.int64)]
+
+
+def datetime_labels(hour_key):
+    """'Mon-DD HH:00' label of every hour_of_year key"""
+    hour_key = np.asarray(hour_key, dtype=np.int64)
+    return _DATE_LABELS[hour_key // 24 + 1] + ' ' + _HOUR_LABELS[hour_key % 24]
+
+
+def frame_labels(df):
+    """
+    Display labels of a timeseries or statistics frame: its hour_of_year or
+    day_of_year key formatted, or the label column of files written before the
+    keys existed. None when the frame has neither.
+    """
+    if HOUR_KEY in df.columns:
+        return datetime_labels(df[HOUR_KEY].to_numpy())
+    if DAY_KEY in df.columns:
+        return date_labels(df[DAY_KEY].to_numpy())
+    for col in ('datetime_label', 'date_label'):
+        if col in df.columns:
+            return df[col].to_numpy()
+    return None
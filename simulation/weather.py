@@ -0,0 +1,87 @@
+"""
+Weather / generation join for the correlation plots.
+
+The hourly generation timeseries is wide (one column per year), the weather
+file is long (one row per date and hour-ending). Both sides are reduced to a
+single int64 (year, month, day, hour) key: the generation matrix is melted
+once into long arrays and joined to the weather frame in one keyed merge,
+instead of filtering and merging the weather frame once per year column.
+"""
+import numpy as np
+import pandas as pd
+
+from simulation.columnar import is_year_column
+
+WEATHER_COLUMNS = ['DATE', 'HOUR', 'shortwave_radiation', 'temperature_2m']
+JOINED_COLUMNS = ['year', 'month', 'day', 'hour', 'generation_mw', 'ghi', 'temperature']
+
+
+def hour_key(year, month, day, hour):
+    """Integer key YYYYMMDDHH of an hour"""
+    year = np.asarray(year, dtype=np.int64)
+    return ((year * 100 + np.asarray(month)) * 100 + np.asarray(day)) * 100 + np.asarray(hour)
+
+
+def load_weather(file_path):
+    """
+    Hourly weather file with hour-beginning calendar columns and the join key.
+    HOUR is hour-ending; hour 0 after the shift would need the previous day's
+    data, so those rows are dropped like before.
+    """
+    weather_df = pd.read_csv(file_path, usecols=lambda col: col in WEATHER_COLUMNS)
+    weather_df['HOUR'] = weather_df['HOUR'] - 1
+    weather_df = weather_df[weather_df['HOUR'] >= 0].reset_index(drop=True)
+
+    date = pd.to_datetime(weather_df['DATE'])
+    weather_df['year'] = date.dt.year.astype(np.int64)
+    weather_df['month'] = date.dt.month.astype(np.int64)
+    weather_df['day'] = date.dt.day.astype(np.int64)
+    weather_df['hour'] = weather_df['HOUR'].astype(np.int64)
+    weather_df['key'] = hour_key(weather_df['year'], weather_df['month'],
+                                 weather_df['day'], weather_df['hour'])
+    return weather_df
+
+
+def melt_generation(gen_df):
+    """
+    Long (key, year, month, day, hour, generation_mw) frame of a wide hourly
+    generation timeseries, year by year in column order
+    """
+    year_cols = [col for col in gen_df.columns if is_year_column(col)]
+    n_rows = len(gen_df)
+
+    values = gen_df[year_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    years = np.repeat(np.array([int(col) for col in year_cols], dtype=np.int64), n_rows)
+    month = np.tile(gen_df['month'].to_numpy(dtype=np.int64), len(year_cols))
+    day = np.tile(gen_df['day'].to_numpy(dtype=np.int64), len(year_cols))
+    hour = np.tile(gen_df['hour'].to_numpy(dtype=np.int64), len(year_cols))
+
+    return pd.DataFrame({
+        'key': hour_key(years, month, day, hour),
+        'year': years,
+        'month': month,
+        'day': day,
+        'hour': hour,
+        'generation_mw': values.ravel(order='F'),
+    })
+
+
+def join_weather_generation(gen_df, weather_df):
+    """
+    Valid (generation >= 0, GHI >= 0, nothing missing) hours of every year
+    with their GHI and temperature, ordered by year then timeseries row
+    """
+    generation = melt_generation(gen_df)
+    weather = weather_df[['key', 'shortwave_radiation', 'temperature_2m']].rename(
+        columns={'shortwave_radiation': 'ghi', 'temperature_2m': 'temperature'}
+    )
+
+    merged = generation.merge(weather, on='key', how='inner')
+    valid = (
+        (merged['generation_mw'] >= 0) &
+        (merged['ghi'] >= 0) &
+        merged['generation_mw'].notna() &
+        merged['ghi'].notna() &
+        merged['temperature'].notna()
+    )
+    return merged.loc[valid, JOINED_COLUMNS].reset_index(drop=True)
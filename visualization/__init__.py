@@ -0,0 +1,10 @@
+"""
+Static plot export for the portfolio (the PNGs under each site's plots folder).
+"""
+from visualization.export import (
+    PlotManifest,
+    PlotSpec,
+    plot_specs,
+    render_plot,
+)
+from visualization.stats_plots import StatsBasedVisualization, export_site
@@ -0,0 +1,34 @@
+"""
+Export every site's plots without the notebook.
+
+    python -m visualization                 # one worker per available core
+    python -m visualization --workers 1     # render in this process
+    python -m visualization --force         # re-render unchanged plots too
+"""
+import argparse
+import warnings
+
+from simulation.cli import available_cores
+from visualization.stats_plots import StatsBasedVisualization
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m visualization',
+        description="Render the forecast plots into each site's plots folder."
+    )
+    parser.add_argument('--base-path', default='.',
+                        help="folder holding 'Renewable Portfolio LLC' (default: current directory)")
+    parser.add_argument('--workers', type=int, default=available_cores(),
+                        help='worker processes (default: available cores)')
+    parser.add_argument('--force', action='store_true',
+                        help='re-render plots whose inputs and parameters are unchanged')
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore')
+    visualizer = StatsBasedVisualization(args.base_path)
+    visualizer.run_all_visualizations(workers=args.workers, force=args.force)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Cached plot export.
+
+Every site's plots folder gets a plot_manifest.json recording, per plot, a
+hash of the CSV files it reads, the plotting parameters, a hash of the
+plotting code and the PNG files it wrote. A plot whose entry still matches
+and whose PNGs all still exist is not rendered again, so re-exporting the
+portfolio after one site changes only renders that site's plots.
+"""
+import hashlib
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+
+from simulation.manifest import JsonManifest, file_hash
+
+PLOT_MANIFEST_NAME = 'plot_manifest.json'
+FORECAST_METRICS = ['generation', 'price', 'revenue']
+
+RENDERED = 'rendered'
+SKIPPED = 'skipped'
+MISSING = 'missing'
+
+
+def use_non_interactive_backend():
+    """Worker initializer: render straight to files, never to a window"""
+    plt.switch_backend('Agg')
+
+
+def folder_hash(folder):
+    """
+    Hash of the names and contents of every CSV in a folder
+    ('' when the folder does not exist)
+    """
+    folder = Path(folder)
+    if not folder.exists():
+        return ''
+    digest = hashlib.sha256()
+    for csv_file in sorted(folder.glob('*.csv')):
+        digest.update(csv_file.name.encode())
+        digest.update(file_hash(csv_file).encode())
+    return digest.hexdigest()
+
+
+class PlotSpec:
+    """
+    One plot of a site: the StatsBasedVisualization method that renders it,
+    the metric folders it reads and the PNGs it writes (globs relative to the
+    plots folder)
+    """
+
+    def __init__(self, key, method, metric, label, outputs, input_folders, created_name,
+                 day_ahead_note=False):
+        self.key = key
+        self.method = method
+        self.metric = metric
+        self.label = label
+        self.outputs = outputs
+        self.input_folders = input_folders
+        self.created_name = created_name
+        self.day_ahead_note = day_ahead_note
+
+    def arguments(self, site_name):
+        return (site_name,) if self.metric is None else (site_name, self.metric)
+
+    def input_hash(self, project_folder, folder_hashes):
+        """Combined hash of the input folders; folder_hashes memoizes per folder"""
+        digest = hashlib.sha256()
+        for folder in self.input_folders:
+            if folder not in folder_hashes:
+                folder_hashes[folder] = folder_hash(Path(project_folder) / folder)
+            digest.update(folder.encode())
+            digest.update(folder_hashes[folder].encode())
+        return digest.hexdigest()
+
+
+def plot_specs():
+    """Every plot of a site, in export order"""
+    specs = []
+    for metric in FORECAST_METRICS:
+        name = metric.capitalize()
+        folders = [name, 'Price_da'] if metric == 'price' else [name]
+        day_ahead = metric == 'price'
+
+        specs.append(PlotSpec(f'{metric}_monthly_forecast', 'plot_monthly_forecast', metric,
+                              f'{name} monthly forecast', [f'{metric}_monthly_forecast.png'],
+                              folders, f'{metric}_monthly_forecast.png', day_ahead))
+        specs.append(PlotSpec(f'{metric}_daily_forecast', 'plot_daily_forecast', metric,
+                              f'{name} daily forecast (7-day avg)', [f'{metric}_daily_forecast.png'],
+                              folders, f'{metric}_daily_forecast.png', day_ahead))
+        specs.append(PlotSpec(f'{metric}_hourly_profile', 'plot_hourly_forecast', metric,
+                              f'{name} hourly profile', [f'{metric}_hourly_profile.png'],
+                              folders, f'{metric}_hourly_profile.png', day_ahead))
+
+        if metric == 'price':
+            specs.append(PlotSpec(f'{metric}_duration_curves', 'plot_monthly_duration_curves', metric,
+                                  f'{name} monthly duration curves (12 plots)',
+                                  [f'duration_curves/{metric}_duration_*.png'],
+                                  [name], 'duration_curves/ (12 monthly files)'))
+        else:
+            specs.append(PlotSpec(f'{metric}_distribution_curves', 'plot_monthly_distribution_curves', metric,
+                                  f'{name} monthly distribution curves (12 plots)',
+                                  [f'distribution_curves/{metric}_distribution_*.png'],
+                                  [name], 'distribution_curves/ (12 monthly files)'))
+
+    specs.append(PlotSpec('combined_monthly_forecast', 'create_combined_forecast', None,
+                          'Combined monthly forecast', ['combined_monthly_forecast.png'],
+                          ['Generation', 'Price', 'Price_da', 'Revenue'], 'combined_monthly_forecast.png'))
+    return specs
+
+
+class PlotManifest(JsonManifest):
+    """
+    Manifest of the plots exported for one site. Code changes to the
+    visualization package re-render the plots.
+    """
+
+    file_name = PLOT_MANIFEST_NAME
+    section = 'plots'
+    package_dir = Path(__file__).parent
+    timestamp_field = 'rendered_at'
+    # A plot that wrote no PNG is rendered again
+    allow_no_outputs = False
+
+    def __init__(self, plots_folder):
+        super().__init__(plots_folder)
+        self.plots_folder = self.folder
+
+    def record(self, key, input_hash, parameters, outputs):
+        """Record a rendered plot and save the manifest"""
+        self.record_entry(key, input_hash, parameters, outputs)
+
+
+def render_plot(visualizer, spec, site_name, manifest, folder_hashes, force=False):
+    """
+    Render one plot unless it is unchanged since the last export.
+    Returns RENDERED, SKIPPED, or MISSING when the plot could not be drawn.
+    """
+    project_folder = visualizer.portfolio_path / site_name
+    input_hash = spec.input_hash(project_folder, folder_hashes)
+    parameters = dict(visualizer.plot_parameters(), plot=spec.key)
+
+    if not force and manifest.is_current(spec.key, input_hash, parameters):
+        return SKIPPED
+    if not getattr(visualizer, spec.method)(*spec.arguments(site_name)):
+        return MISSING
+
+    outputs = [path for pattern in spec.outputs for path in manifest.plots_folder.glob(pattern)]
+    manifest.record(spec.key, input_hash, parameters, outputs)
+    return RENDERED
@@ -0,0 +1,1482 @@
+"""
+Static forecast plots for every site of the portfolio.
+
+StatsBasedVisualization renders the PNGs under each site's plots folder from
+the simulation outputs. run_all_visualizations can fan sites out over worker
+processes and skips plots whose inputs and parameters are unchanged since the
+last export (see visualization/export.py).
+"""
+import contextlib
+import io
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from simulation.columnar import is_year_column
+from simulation.site_cube import SiteCube, cube_paths
+from simulation.time_keys import frame_labels
+from visualization.export import (
+    RENDERED,
+    SKIPPED,
+    PlotManifest,
+    plot_specs,
+    render_plot,
+    use_non_interactive_backend,
+)
+
+
+class StatsBasedVisualization:
+    """
+    Create clean forecast visualizations using compressed statistics files
+    Adapted for local execution
+    """
+    
+    def __init__(self, base_path='.'):
+        # Local paths - working in current directory by default
+        self.base_path = Path(base_path)
+        self.portfolio_path = self.base_path / 'Renewable Portfolio LLC'
+        
+        # Check if path exists
+        if self.portfolio_path.exists():
+            print(f"✅ Found portfolio at: {self.portfolio_path}")
+        else:
+            print(f"⚠️  Portfolio path not found at: {self.portfolio_path}")
+            print("   Please verify the path structure in your current directory")
+        
+        # Modern color palette
+        self.colors = {
+            'generation': '#70AD47',  # Green
+            'price': '#4472C4',       # Blue for real-time
+            'price_da': '#ED7D31',    # Orange for day-ahead
+            'revenue': '#ED7D31',     # Orange
+        }
+        
+        # Month names
+        self.month_names = ['January', 'February', 'March', 'April', 'May', 'June',
+                           'July', 'August', 'September', 'October', 'November', 'December']
+        
+        # Resolution of every saved PNG
+        self.dpi = 300
+    
+    def plot_parameters(self):
+        """Settings that change how plots look; a change re-renders every plot"""
+        return {'colors': self.colors, 'month_names': self.month_names, 'dpi': self.dpi}
+    
+    def get_project_folders(self):
+        """Get all project folders (excluding notebooks and other files)"""
+        project_folders = []
+        if not self.portfolio_path.exists():
+            return project_folders
+            
+        for item in self.portfolio_path.iterdir():
+            if item.is_dir():
+                # Check if it has the expected subfolders (including Price_da)
+                if ((item / 'Generation').exists() or (item / 'Price').exists() or 
+                    (item / 'Price_da').exists() or (item / 'Revenue').exists()):
+                    project_folders.append(item)
+        return project_folders
+    
+    def clean_site_name(self, site_name):
+        """Clean up site name for display"""
+        # Remove LLC suffixes and underscores for cleaner display
+        clean_name = site_name.replace('_LLC', '').replace('_Power', '')
+        clean_name = clean_name.replace('_', ' ').title()
+        return clean_name
+    
+    def get_all_sites(self):
+        """Get all unique site names from the project folders"""
+        return [folder.name for folder in self.get_project_folders()]
+    
+    def format_y_axis(self, ax, metric_type, temporal):
+        """Format y-axis based on metric type and temporal resolution"""
+        if metric_type == 'generation':
+            if temporal in ['daily', 'monthly']:
+                ax.set_ylabel('Generation (MWh)', fontsize=11)
+            else:
+                ax.set_ylabel('Generation (MW)', fontsize=11)
+            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f}'))
+        
+        elif metric_type == 'price' or metric_type == 'price_da':
+            ax.set_ylabel('Price ($/MWh)', fontsize=11)
+            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+        
+        elif metric_type == 'revenue':
+            if temporal == 'monthly':
+                ax.set_ylabel('Revenue ($1000s)', fontsize=11)
+                ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1000:,.0f}'))
+            else:
+                ax.set_ylabel('Revenue ($)', fontsize=11)
+                ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f}'))
+    
+    def find_stats_file(self, project_folder, metric_type, temporal):
+        """Find the appropriate stats file in the project folder"""
+        metric_folder = project_folder / metric_type.capitalize()
+        
+        if not metric_folder.exists():
+            return None
+        
+        # Look for stats files with various naming patterns
+        patterns = [
+            f'*_{metric_type}_{temporal}_stats.csv',
+            f'*_{temporal}_stats.csv',
+            f'*{temporal}stats.csv'
+        ]
+        
+        for pattern in patterns:
+            files = list(metric_folder.glob(pattern))
+            if files:
+                return files[0]
+        
+        return None
+    
+    def find_timeseries_file(self, project_folder, metric_type, temporal):
+        """Find the appropriate timeseries file in the project folder"""
+        metric_folder = project_folder / metric_type.capitalize()
+        
+        if not metric_folder.exists():
+            return None
+        
+        # Look for timeseries files with various naming patterns
+        patterns = [
+            f'*_{metric_type}_{temporal}_timeseries.csv',
+            f'*_{temporal}_timeseries.csv',
+            f'*{temporal}timeseries.csv',
+            f'*_{metric_type}_{temporal}_timeseries_compressed.csv'
+        ]
+        
+        for pattern in patterns:
+            files = list(metric_folder.glob(pattern))
+            if files:
+                return files[0]
+        
+        return None
+    
+    def read_hourly_timeseries(self, project_folder, cube_metric, timeseries_file):
+        """
+        An hourly timeseries sliced from the site cube when the cube holds it and
+        is at least as new as the CSV, otherwise read from the CSV (None when
+        neither exists)
+        """
+        cube_path, _ = cube_paths(project_folder)
+        timeseries_exists = timeseries_file is not None and timeseries_file.exists()
+        if cube_path.exists() and (not timeseries_exists or
+                                   cube_path.stat().st_mtime_ns >= timeseries_file.stat().st_mtime_ns):
+            cube = SiteCube.open(project_folder)
+            if cube is not None and cube_metric in cube:
+                df = cube.timeseries_frame(cube_metric)
+                # The float32 values rounded back to the decimals the CSV holds
+                year_cols = [col for col in df.columns if is_year_column(col)]
+                decimals = cube.decimals.get(cube_metric)
+                df[year_cols] = df[year_cols].astype(float)
+                if decimals is not None:
+                    df[year_cols] = df[year_cols].round(decimals)
+                return df
+        
+        return pd.read_csv(timeseries_file) if timeseries_exists else None
+    
+    def plot_monthly_duration_curves(self, site_name, metric_type):
+        """Create monthly duration curves - ONLY FOR PRICE"""
+        if metric_type != 'price':
+            return False
+        
+        # Get project folder
+        project_folder = self.portfolio_path / site_name
+        if not project_folder.exists():
+            return False
+            
+        # Construct the fixed filename for compressed hourly timeseries
+        price_folder = project_folder / 'Price'
+        if not price_folder.exists():
+            return False
+            
+        # Fixed filename format: {site_name}_price_hourly_timeseries_compressed.csv
+        timeseries_file = price_folder / f"{site_name}_price_hourly_timeseries_compressed.csv"
+        
+        # Read the hourly data (from the site cube when it is current)
+        df = self.read_hourly_timeseries(project_folder, 'price_compressed', timeseries_file)
+        if df is None:
+            print(f"      Warning: Compressed file not found: {timeseries_file.name}")
+            return False
+        
+        try:
+            
+            # Create duration_curves subfolder inside site's plots folder
+            plots_folder = project_folder / 'plots'
+            duration_folder = plots_folder / 'duration_curves'
+            duration_folder.mkdir(parents=True, exist_ok=True)
+            
+            # Extract all year columns (numeric columns)
+            year_cols = [col for col in df.columns if str(col).isdigit()]
+            
+            if not year_cols:
+                return False
+            
+            # Process each month separately
+            created_count = 0
+            
+            for month_idx in range(1, 13):
+                # Filter data for this month
+                month_data = df[df['month'] == month_idx].copy()
+                
+                if len(month_data) == 0:
+                    continue
+                
+                # Collect all hourly values for this month across all years
+                month_values = []
+                for year in year_cols:
+                    year_values = pd.to_numeric(month_data[year], errors='coerce').dropna()
+                    month_values.extend(year_values.tolist())
+                
+                if not month_values:
+                    continue
+                
+                # Sort values in descending order for duration curve
+                sorted_values = np.sort(month_values)[::-1]
+                
+                # Calculate duration percentages
+                n_values = len(sorted_values)
+                duration_pct = np.linspace(0, 100, n_values)
+                
+                # Calculate key percentiles
+                percentiles_to_mark = [1, 5, 25, 50, 75, 95, 99]
+                percentile_values = {}
+                percentile_indices = {}
+                
+                for p in percentiles_to_mark:
+                    idx = int((100 - p) / 100 * n_values)
+                    idx = min(idx, n_values - 1)
+                    percentile_values[p] = sorted_values[idx]
+                    percentile_indices[p] = idx
+                
+                # Calculate mean
+                mean_value = np.mean(month_values)
+                
+                # Create the plot
+                fig, ax = plt.subplots(figsize=(10, 6))
+                ax.set_facecolor('white')
+                fig.patch.set_facecolor('white')
+                
+                # Plot the duration curve
+                ax.plot(duration_pct, sorted_values, 
+                       color='red', linewidth=2, zorder=5)
+                
+                # Add mean line
+                ax.axhline(y=mean_value, color='black', linestyle='--', 
+                          linewidth=1.2, alpha=0.8)
+                
+                # Position mean label
+                y_range = max(sorted_values) - min(sorted_values)
+                mean_label_y = mean_value + y_range * 0.02
+                
+                if mean_label_y > max(sorted_values) * 0.95:
+                    mean_label_y = mean_value - y_range * 0.02
+                
+                mean_label = f'Mean: ${mean_value:.2f}'
+                
+                ax.text(50, mean_label_y, mean_label, 
+                       ha='center', va='bottom' if mean_label_y > mean_value else 'top', 
+                       fontsize=10, fontweight='bold')
+                
+                # Mark percentiles
+                percentile_colors = {
+                    99: 'green', 95: 'green', 75: 'green',
+                    50: 'blue', 25: 'orange', 5: 'red', 1: 'red'
+                }
+                
+                for p in percentiles_to_mark:
+                    idx = percentile_indices[p]
+                    value = percentile_values[p]
+                    duration = duration_pct[idx]
+                    
+                    # Add marker
+                    ax.plot(duration, value, 'o', 
+                           color=percentile_colors.get(p, 'gray'),
+                           markersize=6, zorder=10)
+                    
+                    # Add label
+                    label = f'P{p}'
+                    value_text = f'${value:.1f}'
+                    
+                    # Position text
+                    y_range = max(sorted_values) - min(sorted_values)
+                    if p >= 50:
+                        va = 'bottom'
+                        y_offset = value + y_range * 0.015
+                    else:
+                        va = 'top'
+                        y_offset = value - y_range * 0.015
+                    
+                    # Add percentile label
+                    ax.text(duration, y_offset, label, 
+                           ha='center', va=va, fontsize=8, 
+                           color=percentile_colors.get(p, 'gray'),
+                           fontweight='bold')
+                    
+                    # Add value box
+                    bbox_props = dict(boxstyle="round,pad=0.2", 
+                                    facecolor='white', 
+                                    edgecolor='black',
+                                    linewidth=0.8)
+                    ax.text(duration, value, value_text,
+                           ha='center', va='center', fontsize=8,
+                           bbox=bbox_props, zorder=11)
+                
+                # Title and labels
+                clean_name = self.clean_site_name(site_name)
+                month_name = self.month_names[month_idx - 1]
+                
+                title = f'Price Duration Curve - {month_name} - {clean_name}'
+                if min(sorted_values) < 0:
+                    title += '\n(includes negative prices)'
+                
+                ax.set_title(title, fontsize=12, fontweight='normal', pad=10)
+                ax.set_xlabel('Duration (% of time)', fontsize=11)
+                ax.set_ylabel('Price ($ per MWh)', fontsize=11)
+                
+                # Set x-axis
+                ax.set_xlim(0, 100)
+                ax.set_xticks(range(0, 101, 20))
+                
+                # Y-axis formatting
+                y_min = min(sorted_values) * 1.1 if min(sorted_values) < 0 else 0
+                y_max = max(sorted_values) * 1.1
+                ax.set_ylim(y_min, y_max)
+                ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+                
+                # Add zero line if there are negative prices
+                if min(sorted_values) < 0:
+                    ax.axhline(y=0, color='gray', linestyle='-', linewidth=1, alpha=0.5, zorder=3)
+                
+                # Grid
+                ax.grid(True, axis='both', alpha=0.3, linestyle='-', linewidth=0.5)
+                
+                # Spines
+                ax.spines['top'].set_visible(False)
+                ax.spines['right'].set_visible(False)
+                ax.spines['left'].set_color('lightgray')
+                ax.spines['bottom'].set_color('lightgray')
+                
+                plt.tight_layout()
+                
+                # Save
+                month_name_lower = month_name.lower()
+                output_path = duration_folder / f'{metric_type}_duration_{month_name_lower}.png'
+                plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight', facecolor='white')
+                plt.close()
+                
+                created_count += 1
+            
+            return created_count > 0
+            
+        except Exception as e:
+            print(f"Error in monthly duration curves for {site_name} {metric_type}: {str(e)}")
+            return False
+    
+    def plot_monthly_distribution_curves(self, site_name, metric_type):
+        """Create monthly distribution curves - FOR GENERATION AND REVENUE"""
+        if metric_type not in ['generation', 'revenue']:
+            return False
+        
+        # Get project folder
+        project_folder = self.portfolio_path / site_name
+        if not project_folder.exists():
+            return False
+            
+        # Find monthly timeseries file
+        timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'monthly')
+        
+        if not timeseries_file:
+            return False
+        
+        try:
+            # Read the monthly timeseries data
+            df = pd.read_csv(timeseries_file)
+            
+            # Create distribution_curves subfolder inside site's plots folder
+            plots_folder = project_folder / 'plots'
+            dist_folder = plots_folder / 'distribution_curves'
+            dist_folder.mkdir(parents=True, exist_ok=True)
+            
+            # Extract all year columns
+            year_cols = [col for col in df.columns if str(col).isdigit()]
+            
+            if not year_cols:
+                return False
+            
+            # Process each month separately
+            created_count = 0
+            
+            for month_idx in range(1, 13):
+                # Filter data for this month
+                month_data = df[df['month'] == month_idx].copy()
+                
+                if len(month_data) == 0:
+                    continue
+                
+                # Collect all monthly values
+                month_values = []
+                for year in year_cols:
+                    year_value = pd.to_numeric(month_data[year].iloc[0], errors='coerce')
+                    if not pd.isna(year_value):
+                        month_values.append(year_value)
+                
+                if len(month_values) < 3:
+                    continue
+                
+                # Convert to numpy array
+                month_values = np.array(month_values)
+                
+                # Calculate statistics
+                mean_val = np.mean(month_values)
+                median_val = np.median(month_values)
+                std_val = np.std(month_values)
+                p5_val = np.percentile(month_values, 5)
+                p95_val = np.percentile(month_values, 95)
+                
+                # Create the plot
+                fig, ax = plt.subplots(figsize=(10, 7))
+                ax.set_facecolor('white')
+                fig.patch.set_facecolor('white')
+                
+                # Create x range for plotting
+                x_min = min(month_values) - 0.2 * (max(month_values) - min(month_values))
+                x_max = max(month_values) + 0.2 * (max(month_values) - min(month_values))
+                x_smooth = np.linspace(x_min, x_max, 300)
+                
+                # Calculate KDE
+                from scipy.stats import gaussian_kde
+                kde = gaussian_kde(month_values, bw_method='scott')
+                kde_values = kde(x_smooth)
+                
+                # Plot the KDE curve
+                ax.plot(x_smooth, kde_values, 
+                       color=self.colors[metric_type],
+                       linewidth=3,
+                       label='KDE Distribution',
+                       zorder=5)
+                
+                # Fill under the KDE curve
+                ax.fill_between(x_smooth, 0, kde_values,
+                              alpha=0.3,
+                              color=self.colors[metric_type],
+                              edgecolor='none')
+                
+                # Plot normal distribution for comparison
+                normal_dist = stats.norm.pdf(x_smooth, mean_val, std_val)
+                ax.plot(x_smooth, normal_dist, 'k--', linewidth=2, 
+                       label=f'Normal fit (μ={mean_val:,.0f}, σ={std_val:,.0f})')
+                
+                # Add scatter points for actual data
+                y_jitter = np.random.uniform(0, max(kde_values) * 0.05, size=len(month_values))
+                ax.scatter(month_values, y_jitter, 
+                          color=self.colors[metric_type],
+                          alpha=0.6,
+                          s=50,
+                          edgecolors='black',
+                          linewidth=1,
+                          label=f'Actual values (n={len(month_values)})',
+                          zorder=10)
+                
+                # Add vertical lines for key statistics
+                ax.axvline(x=mean_val, color='red', linestyle='--', linewidth=2, 
+                          label=f'Mean: {mean_val:,.0f}')
+                ax.axvline(x=median_val, color='blue', linestyle='--', linewidth=2, 
+                          label=f'Median: {median_val:,.0f}')
+                ax.axvline(x=p5_val, color='green', linestyle=':', linewidth=1.5, 
+                          label=f'P5: {p5_val:,.0f}')
+                ax.axvline(x=p95_val, color='green', linestyle=':', linewidth=1.5, 
+                          label=f'P95: {p95_val:,.0f}')
+                
+                # Title and labels
+                clean_name = self.clean_site_name(site_name)
+                month_name = self.month_names[month_idx - 1]
+                
+                if metric_type == 'generation':
+                    title = f'Monthly Generation Distribution - {month_name} - {clean_name}'
+                    ax.set_xlabel('Monthly Generation (MWh)', fontsize=11)
+                    ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f}'))
+                else:  # revenue
+                    title = f'Monthly Revenue Distribution - {month_name} - {clean_name}'
+                    ax.set_xlabel('Monthly Revenue ($)', fontsize=11)
+                    ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+                
+                title += f'\n(Distribution across {len(month_values)} simulation years)'
+                ax.set_title(title, fontsize=12, fontweight='normal', pad=10)
+                ax.set_ylabel('Probability Density', fontsize=11)
+                
+                # Set y-axis to start at 0
+                ax.set_ylim(bottom=0)
+                
+                # Grid
+                ax.grid(True, axis='both', alpha=0.3, linestyle='-', linewidth=0.5)
+                
+                # Spines
+                ax.spines['top'].set_visible(False)
+                ax.spines['right'].set_visible(False)
+                ax.spines['left'].set_color('lightgray')
+                ax.spines['bottom'].set_color('lightgray')
+                
+                # Legend
+                ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15),
+                         ncol=3, frameon=False, fontsize=9)
+                
+                # Add text box with statistics
+                cv = (std_val / mean_val) * 100 if mean_val != 0 else 0
+                textstr = f'Years: {len(month_values)}\nStd Dev: {std_val:,.0f}\nCV: {cv:.1f}%\nMin: {min(month_values):,.0f}\nMax: {max(month_values):,.0f}'
+                
+                props = dict(boxstyle='round', facecolor='wheat', alpha=0.5)
+                ax.text(0.02, 0.95, textstr, transform=ax.transAxes, fontsize=9,
+                       verticalalignment='top', bbox=props)
+                
+                plt.tight_layout()
+                plt.subplots_adjust(bottom=0.15)
+                
+                # Save
+                month_name_lower = month_name.lower()
+                output_path = dist_folder / f'{metric_type}_distribution_{month_name_lower}.png'
+                plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight', facecolor='white')
+                plt.close()
+                
+                created_count += 1
+            
+            return created_count > 0
+            
+        except Exception as e:
+            print(f"Error in monthly distribution curves for {site_name} {metric_type}: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    def plot_monthly_forecast(self, site_name, metric_type):
+        """Create monthly forecast plot using timeseries data"""
+        # Get project folder
+        project_folder = self.portfolio_path / site_name
+        if not project_folder.exists():
+            return False
+            
+        # Find monthly timeseries file
+        timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'monthly')
+        
+        if not timeseries_file:
+            # Try to find stats file as fallback
+            stats_file = self.find_stats_file(project_folder, metric_type, 'monthly')
+            if stats_file:
+                return self.plot_monthly_forecast_from_stats(site_name, metric_type, stats_file)
+            return False
+        
+        try:
+            # Read the timeseries data
+            df = pd.read_csv(timeseries_file)
+            
+            # Get year columns
+            year_cols = [col for col in df.columns if str(col).isdigit()]
+            
+            if not year_cols:
+                return False
+            
+            # Calculate statistics
+            df['mean'] = df[year_cols].mean(axis=1)
+            df['p5'] = df[year_cols].quantile(0.05, axis=1)
+            df['p95'] = df[year_cols].quantile(0.95, axis=1)
+            
+            # Create the plot
+            fig, ax = plt.subplots(figsize=(12, 7))
+            ax.set_facecolor('white')
+            fig.patch.set_facecolor('white')
+            
+            # X positions
+            x = range(len(df))
+            
+            # Check if this is price
+            if metric_type == 'price':
+                # Plot real-time price mean
+                ax.plot(x, df['mean'], 
+                       color=self.colors['price'],
+                       linewidth=3,
+                       label='Real-Time Price',
+                       zorder=5,
+                       marker='o',
+                       markersize=6)
+                
+                # Try to load day-ahead price data from Price_da folder
+                price_da_folder = project_folder / 'Price_da'
+                if price_da_folder.exists():
+                    # Look for monthly timeseries in Price_da
+                    dt_patterns = [
+                        '*_monthly_timeseries.csv',
+                        '*monthly_timeseries.csv',
+                        '*_price_da_monthly_timeseries.csv'
+                    ]
+                    
+                    dt_file = None
+                    for pattern in dt_patterns:
+                        files = list(price_da_folder.glob(pattern))
+                        if files:
+                            dt_file = files[0]
+                            break
+                    
+                    if dt_file:
+                        try:
+                            df_dt = pd.read_csv(dt_file)
+                            year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
+                            
+                            if year_cols_dt:
+                                df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
+                                
+                                # Plot day-ahead price
+                                ax.plot(x, df_dt['mean'], 
+                                       color=self.colors['price_da'],
+                                       linewidth=3,
+                                       label='Day-Ahead Price',
+                                       zorder=5,
+                                       marker='s',
+                                       markersize=6,
+                                       linestyle='--')
+                        except Exception as e:
+                            print(f"      Note: Could not load day-ahead price data: {e}")
+                
+            else:
+                # For generation and revenue, plot with confidence band
+                ax.fill_between(x, df['p5'], df['p95'],
+                              alpha=0.3,
+                              color=self.colors[metric_type],
+                              label='P5-P95 Confidence Band',
+                              edgecolor='none')
+                
+                ax.plot(x, df['mean'], 
+                       color=self.colors[metric_type],
+                       linewidth=3,
+                       label='Mean',
+                       zorder=5,
+                       marker='o',
+                       markersize=6)
+            
+            # Title
+            clean_name = self.clean_site_name(site_name)
+            title = f'Monthly {metric_type.capitalize()} Forecast - {clean_name}'
+            ax.set_title(title, fontsize=14, fontweight='normal', pad=15)
+            
+            # X-axis
+            ax.set_xticks(x)
+            if 'month_name' in df.columns:
+                ax.set_xticklabels(df['month_name'], rotation=45, ha='right')
+            else:
+                ax.set_xticklabels([self.month_names[i] for i in range(12)], rotation=45, ha='right')
+            ax.set_xlabel('')
+            
+            # Y-axis
+            self.format_y_axis(ax, metric_type, 'monthly')
+            
+            # Grid
+            ax.grid(True, axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
+            ax.grid(False, axis='x')
+            
+            # Spines
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['left'].set_color('lightgray')
+            ax.spines['bottom'].set_color('lightgray')
+            
+            # Legend
+            ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15),
+                     ncol=2, frameon=False, fontsize=10)
+            
+            plt.tight_layout()
+            plt.subplots_adjust(bottom=0.15)
+            
+            # Save
+            plots_folder = project_folder / 'plots'
+            plots_folder.mkdir(exist_ok=True)
+            output_path = plots_folder / f'{metric_type}_monthly_forecast.png'
+            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight', facecolor='white')
+            plt.close()
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error in monthly {metric_type} for {site_name}: {str(e)}")
+            return False
+    
+    def plot_monthly_forecast_from_stats(self, site_name, metric_type, stats_file):
+        """Create monthly forecast plot using stats file (fallback)"""
+        try:
+            # Read the stats
+            df = pd.read_csv(stats_file)
+            
+            # Create the plot (similar to plot_monthly_forecast but with stats data)
+            fig, ax = plt.subplots(figsize=(12, 7))
+            ax.set_facecolor('white')
+            fig.patch.set_facecolor('white')
+            
+            # X positions
+            x = range(len(df))
+            
+            # Check if this is price
+            if metric_type == 'price':
+                ax.plot(x, df['mean'], 
+                       color=self.colors['price'],
+                       linewidth=3,
+                       label='Real-Time Price',
+                       zorder=5,
+                       marker='o',
+                       markersize=6)
+                
+                # Try to load day-ahead price data from Price_da folder
+                project_folder = self.portfolio_path / site_name
+                price_da_folder = project_folder / 'Price_da'
+                if price_da_folder.exists():
+                    # Look for monthly stats in Price_da
+                    dt_patterns = [
+                        '*_monthly_stats.csv',
+                        '*monthly_stats.csv',
+                        '*_price_da_monthly_stats.csv'
+                    ]
+                    
+                    dt_file = None
+                    for pattern in dt_patterns:
+                        files = list(price_da_folder.glob(pattern))
+                        if files:
+                            dt_file = files[0]
+                            break
+                    
+                    if dt_file:
+                        try:
+                            df_dt = pd.read_csv(dt_file)
+                            if 'mean' in df_dt.columns:
+                                ax.plot(x, df_dt['mean'], 
+                                       color=self.colors['price_da'],
+                                       linewidth=3,
+                                       label='Day-Ahead Price',
+                                       zorder=5,
+                                       marker='s',
+                                       markersize=6,
+                                       linestyle='--')
+                        except Exception as e:
+                            print(f"      Note: Could not load day-ahead price stats: {e}")
+            else:
+                # Plot with confidence band if p5/p95 available
+                if 'p5' in df.columns and 'p95' in df.columns:
+                    ax.fill_between(x, df['p5'], df['p95'],
+                                  alpha=0.3,
+                                  color=self.colors[metric_type],
+                                  label='P5-P95 Confidence Band',
+                                  edgecolor='none')
+                
+                ax.plot(x, df['mean'], 
+                       color=self.colors[metric_type],
+                       linewidth=3,
+                       label='Mean',
+                       zorder=5,
+                       marker='o',
+                       markersize=6)
+            
+            # Title
+            clean_name = self.clean_site_name(site_name)
+            title = f'Monthly {metric_type.capitalize()} Forecast - {clean_name}'
+            ax.set_title(title, fontsize=14, fontweight='normal', pad=15)
+            
+            # X-axis
+            ax.set_xticks(x)
+            if 'month_name' in df.columns:
+                ax.set_xticklabels(df['month_name'], rotation=45, ha='right')
+            else:
+                ax.set_xticklabels([self.month_names[i] for i in range(12)], rotation=45, ha='right')
+            ax.set_xlabel('')
+            
+            # Y-axis
+            self.format_y_axis(ax, metric_type, 'monthly')
+            
+            # Grid
+            ax.grid(True, axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
+            ax.grid(False, axis='x')
+            
+            # Spines
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['left'].set_color('lightgray')
+            ax.spines['bottom'].set_color('lightgray')
+            
+            # Legend
+            ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15),
+                     ncol=2, frameon=False, fontsize=10)
+            
+            plt.tight_layout()
+            plt.subplots_adjust(bottom=0.15)
+            
+            # Save
+            project_folder = self.portfolio_path / site_name
+            plots_folder = project_folder / 'plots'
+            plots_folder.mkdir(exist_ok=True)
+            output_path = plots_folder / f'{metric_type}_monthly_forecast.png'
+            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight', facecolor='white')
+            plt.close()
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error in monthly {metric_type} from stats for {site_name}: {str(e)}")
+            return False
+    
+    def plot_daily_forecast(self, site_name, metric_type):
+        """Create daily forecast plot with 7-day rolling average"""
+        # Get project folder
+        project_folder = self.portfolio_path / site_name
+        if not project_folder.exists():
+            return False
+            
+        # Find daily timeseries or stats file
+        timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'daily')
+        stats_file = self.find_stats_file(project_folder, metric_type, 'daily')
+        
+        if not timeseries_file and not stats_file:
+            return False
+        
+        try:
+            # Prefer timeseries file, fall back to stats
+            if timeseries_file:
+                df = pd.read_csv(timeseries_file)
+                
+                # Get year columns
+                year_cols = [col for col in df.columns if str(col).isdigit()]
+                
+                if year_cols:
+                    # Calculate statistics
+                    df['mean'] = df[year_cols].mean(axis=1)
+                    df['p25'] = df[year_cols].quantile(0.25, axis=1)
+                    df['p75'] = df[year_cols].quantile(0.75, axis=1)
+            else:
+                df = pd.read_csv(stats_file)
+            
+            # Apply 7-day rolling average
+            df['mean_smooth'] = df['mean'].rolling(window=7, center=True, min_periods=4).mean()
+            if 'p25' in df.columns and 'p75' in df.columns:
+                df['p25_smooth'] = df['p25'].rolling(window=7, center=True, min_periods=4).mean()
+                df['p75_smooth'] = df['p75'].rolling(window=7, center=True, min_periods=4).mean()
+            
+            # Drop NaN values
+            df_smooth = df.dropna(subset=['mean_smooth'])
+            
+            # Create the plot
+            fig, ax = plt.subplots(figsize=(16, 8))
+            ax.set_facecolor('white')
+            fig.patch.set_facecolor('white')
+            
+            # X positions
+            x = range(len(df_smooth))
+            
+            # Check if this is price
+            if metric_type == 'price':
+                ax.plot(x, df_smooth['mean_smooth'], 
+                       color=self.colors['price'],
+                       linewidth=2.5,
+                       label='Real-Time Price (7-day avg)',
+                       zorder=5)
+                
+                # Try to load day-ahead price data from Price_da folder
+                price_da_folder = project_folder / 'Price_da'
+                if price_da_folder.exists():
+                    # Look for daily timeseries in Price_da
+                    dt_patterns = [
+                        '*_daily_timeseries.csv',
+                        '*daily_timeseries.csv',
+                        '*_price_da_daily_timeseries.csv'
+                    ]
+                    
+                    dt_file = None
+                    for pattern in dt_patterns:
+                        files = list(price_da_folder.glob(pattern))
+                        if files:
+                            dt_file = files[0]
+                            break
+                    
+                    if dt_file:
+                        try:
+                            df_dt = pd.read_csv(dt_file)
+                            year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
+                            
+                            if year_cols_dt:
+                                df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
+                                df_dt['mean_smooth'] = df_dt['mean'].rolling(window=7, center=True, min_periods=4).mean()
+                                df_dt_smooth = df_dt.dropna(subset=['mean_smooth'])
+                                
+                                # Align the data if necessary
+                                if len(df_dt_smooth) == len(df_smooth):
+                                    ax.plot(x, df_dt_smooth['mean_smooth'], 
+                                           color=self.colors['price_da'],
+                                           linewidth=2.5,
+                                           label='Day-Ahead Price (7-day avg)',
+                                           zorder=5,
+                                           linestyle='--')
+                        except Exception as e:
+                            print(f"      Note: Could not load day-ahead price data: {e}")
+                
+            else:
+                # Plot with confidence band if available
+                if 'p25_smooth' in df_smooth.columns and 'p75_smooth' in df_smooth.columns:
+                    ax.fill_between(x, 
+                                  df_smooth['p25_smooth'], 
+                                  df_smooth['p75_smooth'],
+                                  alpha=0.3,
+                                  color=self.colors[metric_type],
+                                  label='P25-P75 Confidence Band (7-day avg)',
+                                  edgecolor='none')
+                
+                ax.plot(x, df_smooth['mean_smooth'], 
+                       color=self.colors[metric_type],
+                       linewidth=2.5,
+                       label='Mean (7-day avg)',
+                       zorder=5)
+            
+            # Title
+            clean_name = self.clean_site_name(site_name)
+            title = f'Daily {metric_type.capitalize()} Forecast (7-day Rolling Average) - {clean_name}'
+            ax.set_title(title, fontsize=14, fontweight='normal', pad=15)
+            
+            # X-axis - show every 30th day
+            tick_positions = list(range(0, len(df_smooth), 30))
+            date_labels = frame_labels(df_smooth)
+            if date_labels is not None:
+                tick_labels = [date_labels[i] for i in tick_positions]
+            else:
+                # Create month-day labels
+                tick_labels = []
+                for i in tick_positions:
+                    month = int(df_smooth.iloc[i]['month'])
+                    day = int(df_smooth.iloc[i]['day'])
+                    tick_labels.append(f"{self.month_names[month-1][:3]} {day}")
+            
+            ax.set_xticks(tick_positions)
+            ax.set_xticklabels(tick_labels, rotation=45, ha='right')
+            ax.set_xlabel('')
+            
+            # Y-axis
+            self.format_y_axis(ax, metric_type, 'daily')
+            
+            # Grid
+            ax.grid(True, axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
+            ax.grid(True, axis='x', alpha=0.2, linestyle=':', linewidth=0.5)
+            
+            # Spines
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['left'].set_color('lightgray')
+            ax.spines['bottom'].set_color('lightgray')
+            
+            # Legend
+            ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.12),
+                     ncol=2, frameon=False, fontsize=10)
+            
+            plt.tight_layout()
+            plt.subplots_adjust(bottom=0.12)
+            
+            # Save
+            plots_folder = project_folder / 'plots'
+            plots_folder.mkdir(exist_ok=True)
+            output_path = plots_folder / f'{metric_type}_daily_forecast.png'
+            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight', facecolor='white')
+            plt.close()
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error in daily {metric_type} for {site_name}: {str(e)}")
+            return False
+    
+    def plot_hourly_forecast(self, site_name, metric_type):
+        """Create hourly average profile"""
+        # Skip hourly profile for revenue
+        if metric_type == 'revenue':
+            return False
+        
+        # Get project folder
+        project_folder = self.portfolio_path / site_name
+        if not project_folder.exists():
+            return False
+            
+        # Find hourly timeseries (sliced from the site cube when it is current) or stats file
+        timeseries_file = self.find_timeseries_file(project_folder, metric_type, 'hourly')
+        stats_file = self.find_stats_file(project_folder, metric_type, 'hourly')
+        df = self.read_hourly_timeseries(project_folder, metric_type, timeseries_file)
+        
+        if df is None and not stats_file:
+            return False
+        
+        try:
+            # Prefer timeseries
+            if df is not None:
+                
+                # Get year columns
+                year_cols = [col for col in df.columns if str(col).isdigit()]
+                
+                if year_cols:
+                    # Calculate statistics
+                    df['mean'] = df[year_cols].mean(axis=1)
+                    df['p5'] = df[year_cols].quantile(0.05, axis=1)
+                    df['p95'] = df[year_cols].quantile(0.95, axis=1)
+                
+                # Extract hour if needed
+                if 'hour' not in df.columns:
+                    if 'datetime' in df.columns or 'timestamp' in df.columns:
+                        time_col = 'datetime' if 'datetime' in df.columns else 'timestamp'
+                        df[time_col] = pd.to_datetime(df[time_col])
+                        df['hour'] = df[time_col].dt.hour
+                    else:
+                        df['hour'] = df.index % 24
+                
+                # Group by hour
+                hourly_profile = df.groupby('hour').agg({
+                    'mean': 'mean',
+                    'p5': 'mean',
+                    'p95': 'mean'
+                }).reset_index()
+            else:
+                df = pd.read_csv(stats_file)
+                if 'hour' in df.columns:
+                    hourly_profile = df.groupby('hour').agg({
+                        'mean': 'mean',
+                        'p5': 'mean',
+                        'p95': 'mean'
+                    }).reset_index()
+                else:
+                    return False
+            
+            # Create the plot
+            fig, ax = plt.subplots(figsize=(10, 6))
+            ax.set_facecolor('white')
+            fig.patch.set_facecolor('white')
+            
+            # Check if this is price
+            if metric_type == 'price':
+                # Plot with confidence band for real-time price
+                if 'p5' in hourly_profile.columns and 'p95' in hourly_profile.columns:
+                    ax.fill_between(hourly_profile['hour'], 
+                                  hourly_profile['p5'], 
+                                  hourly_profile['p95'],
+                                  alpha=0.3,
+                                  color=self.colors['price'],
+                                  label='P5-P95 RT Price',
+                                  edgecolor='none')
+                
+                ax.plot(hourly_profile['hour'], hourly_profile['mean'], 
+                       color=self.colors['price'],
+                       linewidth=3,
+                       marker='o',
+                       markersize=6,
+                       label='Real-Time Price Mean',
+                       zorder=5)
+                
+                # Try to load day-ahead price data from Price_da folder
+                price_da_folder = project_folder / 'Price_da'
+                if price_da_folder.exists():
+                    # Look for hourly timeseries in Price_da
+                    dt_patterns = [
+                        '*_hourly_timeseries.csv',
+                        '*hourly_timeseries.csv',
+                        '*_hourly_stats.csv',
+                        '*hourly_stats.csv'
+                    ]
+                    
+                    dt_file = None
+                    for pattern in dt_patterns:
+                        files = list(price_da_folder.glob(pattern))
+                        if files:
+                            dt_file = files[0]
+                            break
+                    
+                    if dt_file:
+                        try:
+                            if 'timeseries' in dt_file.name:
+                                df_dt = self.read_hourly_timeseries(project_folder, 'price_da', dt_file)
+                            else:
+                                df_dt = pd.read_csv(dt_file)
+                            
+                            # Process based on file type
+                            if 'timeseries' in dt_file.name:
+                                year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
+                                if year_cols_dt:
+                                    df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
+                                    
+                                    if 'hour' not in df_dt.columns:
+                                        df_dt['hour'] = df_dt.index % 24
+                                    
+                                    hourly_profile_dt = df_dt.groupby('hour')['mean'].mean().reset_index()
+                            else:
+                                # Stats file
+                                if 'hour' in df_dt.columns:
+                                    hourly_profile_dt = df_dt.groupby('hour')['mean'].mean().reset_index()
+                                else:
+                                    hourly_profile_dt = None
+                            
+                            if hourly_profile_dt is not None:
+                                ax.plot(hourly_profile_dt['hour'], hourly_profile_dt['mean'], 
+                                       color=self.colors['price_da'],
+                                       linewidth=3,
+                                       marker='s',
+                                       markersize=6,
+                                       label='Day-Ahead Price Mean',
+                                       zorder=5,
+                                       linestyle='--')
+                        except Exception as e:
+                            print(f"      Note: Could not load day-ahead hourly price data: {e}")
+            else:
+                # For generation, plot with confidence band
+                if 'p5' in hourly_profile.columns and 'p95' in hourly_profile.columns:
+                    ax.fill_between(hourly_profile['hour'], 
+                                  hourly_profile['p5'], 
+                                  hourly_profile['p95'],
+                                  alpha=0.3,
+                                  color=self.colors[metric_type],
+                                  label='P5-P95 Confidence Band',
+                                  edgecolor='none')
+                
+                ax.plot(hourly_profile['hour'], hourly_profile['mean'], 
+                       color=self.colors[metric_type],
+                       linewidth=3,
+                       marker='o',
+                       markersize=6,
+                       label='Mean',
+                       zorder=5)
+            
+            # Title
+            clean_name = self.clean_site_name(site_name)
+            title = f'Average Hourly {metric_type.capitalize()} Profile - {clean_name}'
+            ax.set_title(title, fontsize=14, fontweight='normal', pad=15)
+            
+            # X-axis
+            ax.set_xlabel('Hour of Day', fontsize=11)
+            ax.set_xticks(range(0, 24, 2))
+            ax.set_xlim(-0.5, 23.5)
+            
+            # Y-axis
+            self.format_y_axis(ax, metric_type, 'hourly')
+            
+            # Grid
+            ax.grid(True, axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
+            ax.grid(True, axis='x', alpha=0.2, linestyle=':', linewidth=0.5)
+            
+            # Spines
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['left'].set_color('lightgray')
+            ax.spines['bottom'].set_color('lightgray')
+            
+            # Legend
+            ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15),
+                     ncol=2, frameon=False, fontsize=10)
+            
+            plt.tight_layout()
+            plt.subplots_adjust(bottom=0.15)
+            
+            # Save
+            plots_folder = project_folder / 'plots'
+            plots_folder.mkdir(exist_ok=True)
+            output_path = plots_folder / f'{metric_type}_hourly_profile.png'
+            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight', facecolor='white')
+            plt.close()
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error in hourly {metric_type} for {site_name}: {str(e)}")
+            return False
+    
+    def create_combined_forecast(self, site_name):
+        """Create a combined plot showing all three metrics for a site"""
+        # Get project folder
+        project_folder = self.portfolio_path / site_name
+        if not project_folder.exists():
+            return False
+        
+        # Check which metrics are available
+        metrics_available = []
+        for metric in ['generation', 'price', 'revenue']:
+            metric_folder = project_folder / metric.capitalize()
+            if metric_folder.exists():
+                # Check if any monthly files exist
+                monthly_files = list(metric_folder.glob('*monthly*.csv'))
+                if monthly_files:
+                    metrics_available.append(metric)
+        
+        if len(metrics_available) < 2:  # Need at least 2 metrics
+            return False
+        
+        try:
+            # Create figure with subplots
+            fig, axes = plt.subplots(len(metrics_available), 1, 
+                                   figsize=(12, 4*len(metrics_available)), 
+                                   sharex=True)
+            fig.patch.set_facecolor('white')
+            
+            if len(metrics_available) == 1:
+                axes = [axes]
+            
+            for idx, metric in enumerate(metrics_available):
+                ax = axes[idx]
+                ax.set_facecolor('white')
+                
+                # Find monthly data
+                timeseries_file = self.find_timeseries_file(project_folder, metric, 'monthly')
+                
+                if not timeseries_file:
+                    continue
+                
+                # Read data
+                df = pd.read_csv(timeseries_file)
+                
+                # Get year columns
+                year_cols = [col for col in df.columns if str(col).isdigit()]
+                
+                if year_cols:
+                    # Calculate statistics
+                    df['mean'] = df[year_cols].mean(axis=1)
+                    df['p5'] = df[year_cols].quantile(0.05, axis=1)
+                    df['p95'] = df[year_cols].quantile(0.95, axis=1)
+                
+                # X positions
+                x = range(len(df))
+                
+                # Plot based on metric type
+                if metric == 'price':
+                    ax.plot(x, df['mean'], 
+                           color=self.colors['price'],
+                           linewidth=3,
+                           label='Real-Time Price',
+                           marker='o',
+                           markersize=5)
+                    
+                    # Try to add day-ahead price
+                    price_da_folder = project_folder / 'Price_da'
+                    if price_da_folder.exists():
+                        dt_patterns = [
+                            '*_monthly_timeseries.csv',
+                            '*monthly_timeseries.csv',
+                            '*_price_da_monthly_timeseries.csv'
+                        ]
+                        
+                        dt_file = None
+                        for pattern in dt_patterns:
+                            files = list(price_da_folder.glob(pattern))
+                            if files:
+                                dt_file = files[0]
+                                break
+                        
+                        if dt_file:
+                            try:
+                                df_dt = pd.read_csv(dt_file)
+                                year_cols_dt = [col for col in df_dt.columns if str(col).isdigit()]
+                                
+                                if year_cols_dt:
+                                    df_dt['mean'] = df_dt[year_cols_dt].mean(axis=1)
+                                    ax.plot(x, df_dt['mean'], 
+                                           color=self.colors['price_da'],
+                                           linewidth=3,
+                                           label='Day-Ahead Price',
+                                           marker='s',
+                                           markersize=5,
+                                           linestyle='--')
+                            except:
+                                pass
+                else:
+                    # Plot with confidence band
+                    if 'p5' in df.columns and 'p95' in df.columns:
+                        ax.fill_between(x, df['p5'], df['p95'],
+                                      alpha=0.3,
+                                      color=self.colors[metric],
+                                      label='P5-P95')
+                    
+                    ax.plot(x, df['mean'], 
+                           color=self.colors[metric],
+                           linewidth=3,
+                           label='Mean',
+                           marker='o',
+                           markersize=5)
+                
+                # Subplot title
+                subplot_titles = {
+                    'generation': 'Monthly Generation (MWh)',
+                    'price': 'Monthly Price ($/MWh)',
+                    'revenue': 'Monthly Revenue ($)'
+                }
+                ax.set_title(subplot_titles[metric], fontsize=12, pad=10)
+                
+                # Y-axis
+                self.format_y_axis(ax, metric, 'monthly')
+                
+                # Grid
+                ax.grid(True, axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
+                ax.grid(False, axis='x')
+                
+                # Spines
+                ax.spines['top'].set_visible(False)
+                ax.spines['right'].set_visible(False)
+                ax.spines['left'].set_color('lightgray')
+                ax.spines['bottom'].set_color('lightgray')
+                
+                # Legend
+                ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.25),
+                         ncol=2, frameon=False, fontsize=9)
+                
+                # X-axis labels only on bottom plot
+                if idx == len(metrics_available) - 1:
+                    ax.set_xticks(x)
+                    if 'month_name' in df.columns:
+                        ax.set_xticklabels(df['month_name'], rotation=45, ha='right')
+                    else:
+                        ax.set_xticklabels([self.month_names[i] for i in range(12)], rotation=45, ha='right')
+            
+            # Main title
+            clean_name = self.clean_site_name(site_name)
+            fig.suptitle(f'Combined Monthly Forecasts - {clean_name}', 
+                        fontsize=16, fontweight='normal', y=0.995)
+            
+            plt.tight_layout()
+            plt.subplots_adjust(hspace=0.5, top=0.96)
+            
+            # Save
+            plots_folder = project_folder / 'plots'
+            plots_folder.mkdir(exist_ok=True)
+            output_path = plots_folder / 'combined_monthly_forecast.png'
+            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight', facecolor='white')
+            plt.close()
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error in combined forecast for {site_name}: {str(e)}")
+            return False
+    
+    def render_site(self, site_name, force=False):
+        """
+        Create every visualization type for one site, skipping plots whose
+        inputs and parameters are unchanged since the last export.
+        Returns (created plots, number of unchanged plots skipped).
+        """
+        # Create plots folder inside the site folder
+        project_folder = self.portfolio_path / site_name
+        plots_folder = project_folder / 'plots'
+        plots_folder.mkdir(exist_ok=True)
+        manifest = PlotManifest(plots_folder)
+        folder_hashes = {}
+        has_day_ahead = (project_folder / 'Price_da').exists()
+        
+        # Track what was created
+        created_plots = []
+        skipped = 0
+        
+        for spec in plot_specs():
+            status = render_plot(self, spec, site_name, manifest, folder_hashes, force)
+            if status == RENDERED:
+                created_plots.append(spec.created_name)
+                print(f"   ✅ {spec.label}")
+                if spec.day_ahead_note and has_day_ahead:
+                    print(f"      (includes day-ahead price data)")
+            elif status == SKIPPED:
+                skipped += 1
+                print(f"   ⏭️  {spec.label} (unchanged)")
+            elif spec.key == 'revenue_hourly_profile':
+                print(f"   ⏭️  {spec.label} (skipped)")
+        
+        note = f" ({skipped} unchanged, skipped)" if skipped else ''
+        print(f"\n   📁 Created {len(created_plots)} visualizations in: {site_name}/plots/{note}")
+        return created_plots, skipped
+    
+    def run_all_visualizations(self, workers=1, force=False):
+        """
+        Process all sites and create all visualization types.
+        With workers > 1 sites are rendered in that many worker processes
+        using the non-interactive Agg backend. Plots whose input CSVs and
+        parameters are unchanged since the last export are skipped unless
+        force is set.
+        """
+        print("\n🌟 STATISTICS-BASED VISUALIZATION SYSTEM")
+        print("="*60)
+        print(f"📁 Portfolio folder: {self.portfolio_path}")
+        print("📁 Plots will be saved in each site's 'plots' subfolder")
+        print("="*60)
+        
+        # Check if portfolio path exists
+        if not self.portfolio_path.exists():
+            print(f"❌ Error: Portfolio path '{self.portfolio_path}' not found!")
+            print("\n   Please check:")
+            print("   1. You are in the correct directory")
+            print("   2. The 'Renewable Portfolio LLC' folder exists")
+            return
+        
+        # Get all sites
+        sites = self.get_all_sites()
+        
+        if not sites:
+            print("❌ No project folders found!")
+            print("\n   Expected folder structure:")
+            print("   Renewable Portfolio LLC/")
+            print("     ├── Project_Name/")
+            print("     │   ├── Generation/")
+            print("     │   ├── Price/")
+            print("     │   ├── Price_da/  (optional)")
+            print("     │   └── Revenue/")
+            return
+        
+        print(f"\n📊 Found {len(sites)} sites to process:")
+        for site in sites:
+            print(f"   - {self.clean_site_name(site)}")
+        
+        workers = max(1, min(workers, len(sites)))
+        if workers > 1:
+            print(f"\n⚙️  Rendering in {workers} worker processes")
+        
+        # Process each site
+        start = time.perf_counter()
+        if workers == 1:
+            for site_idx, site_name in enumerate(sites, 1):
+                print(f"\n[{site_idx}/{len(sites)}] Processing: {self.clean_site_name(site_name)}")
+                print("-"*40)
+                self.render_site(site_name, force)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=use_non_interactive_backend) as pool:
+                futures = [pool.submit(export_site, self, site_name, force) for site_name in sites]
+                for site_idx, future in enumerate(as_completed(futures), 1):
+                    site_name, log, elapsed = future.result()
+                    print(f"\n[{site_idx}/{len(sites)}] Processed: {self.clean_site_name(site_name)} ({elapsed:.1f}s)")
+                    print("-"*40)
+                    print(log, end='')
+        
+        print("\n" + "="*60)
+        print(f"✨ VISUALIZATION COMPLETE! ({time.perf_counter() - start:.1f}s)")
+        print(f"📁 All plots saved in each site's 'plots' subfolder")
+        print("\nFolder structure created:")
+        for site in sites[:3]:  # Show first 3 as example
+            print(f"   📁 Renewable Portfolio LLC/{site}/")
+            print(f"      📁 Generation/")
+            print(f"      📁 Price/")
+            print(f"      📁 Price_da/  (if available)")
+            print(f"      📁 Revenue/")
+            print(f"      📁 plots/  ← All visualizations here")
+            print(f"         📊 generation_monthly_forecast.png")
+            print(f"         📊 price_monthly_forecast.png (with day-ahead if available)")
+            print(f"         📊 revenue_monthly_forecast.png")
+            print(f"         📊 combined_monthly_forecast.png")
+            print(f"         📁 duration_curves/ (price only)")
+            print(f"         📁 distribution_curves/ (generation & revenue)")
+        if len(sites) > 3:
+            print(f"   ... and {len(sites)-3} more sites")
+        print("\n📌 Note: Price charts include both real-time and day-ahead data when Price_da folder exists")
+        print("="*60)
+
+
+def export_site(visualizer, site_name, force=False):
+    """
+    Worker: render one site's plots.
+    Returns (site_name, captured log, wall seconds).
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    with warnings.catch_warnings(), contextlib.redirect_stdout(log):
+        warnings.simplefilter('ignore')
+        visualizer.render_site(site_name, force)
+    return site_name, log.getvalue(), time.perf_counter() - start